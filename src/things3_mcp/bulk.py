@@ -0,0 +1,230 @@
+"""Complete or reschedule many todos in one script run.
+
+The todos are chosen either by ID or by a ``TodoQuery``. For a query, the
+set is selected with a single ``whose`` clause, and completion and
+deadlines are set on the whole set in one Apple Event. Things3 has no
+property for the ``when`` date, so scheduling still runs its ``schedule``
+command once per todo, but inside the same script run.
+
+Scripts are generated like query scripts: every value goes through
+``argv``, so each combination of filters and changes is compiled once.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+
+from .query import ScriptArgs, TodoQuery, parse_date
+
+# ``when`` values that move todos to a list instead of scheduling them
+WHEN_LISTS = {"anytime": "Anytime", "someday": "Someday"}
+
+# Most todos a bulk change may touch unless the caller raises the limit
+DEFAULT_MAX_COUNT = 500
+
+
+@dataclass
+class BulkChange:
+    """What to do to every selected todo."""
+
+    complete: bool = False
+    when: Optional[date] = None
+    when_list: Optional[str] = None
+    deadline: Optional[date] = None
+
+    @classmethod
+    def reschedule(
+        cls,
+        when: Optional[str] = None,
+        deadline: Optional[str] = None,
+        today: Optional[date] = None
+    ) -> "BulkChange":
+        """Build a rescheduling change from tool arguments.
+
+        Args:
+            when: ``anytime``, ``someday`` or a date accepted by ``parse_date``
+            deadline: Date accepted by ``parse_date``
+            today: Reference date for relative values
+
+        Returns:
+            The change
+
+        Raises:
+            ValueError: If neither is given or a date is invalid
+        """
+        if not when and not deadline:
+            raise ValueError("Either 'when' or 'deadline' is required")
+        change = cls()
+        if when:
+            if when.strip().lower() in WHEN_LISTS:
+                change.when_list = WHEN_LISTS[when.strip().lower()]
+            else:
+                change.when = parse_date(when, today)
+        if deadline:
+            change.deadline = parse_date(deadline, today)
+        return change
+
+    def describe(self) -> str:
+        """Human-readable summary used in tool responses and logs."""
+        if self.complete:
+            return "completed"
+        parts = []
+        if self.when is not None:
+            parts.append(f"scheduled for {self.when.isoformat()}")
+        if self.when_list is not None:
+            parts.append(f"moved to {self.when_list}")
+        if self.deadline is not None:
+            parts.append(f"due {self.deadline.isoformat()}")
+        return " and ".join(parts)
+
+
+def _check_query(query: TodoQuery) -> None:
+    """Reject filters that cannot be evaluated exactly inside Things3.
+
+    ``query-todos`` rechecks container names case-sensitively after
+    fetching; a change cannot be undone afterwards, so only one container
+    may be used.
+    """
+    containers = [name for name in ("list", "project", "area") if getattr(query, name) is not None]
+    if len(containers) > 1:
+        raise ValueError(f"Filter by only one of list, project and area (got {', '.join(containers)})")
+    if query.status != "open":
+        raise ValueError("Only open todos can be completed or rescheduled")
+
+
+def bulk_script(
+    change: BulkChange,
+    query: Optional[TodoQuery] = None,
+    ids: Optional[List[str]] = None,
+    max_count: int = DEFAULT_MAX_COUNT,
+    dry_run: bool = False
+) -> Tuple[str, List[str]]:
+    """Generate the script applying a change to todos chosen by query or ID.
+
+    The script expects the ``jsonEscape`` and ``isoDate`` handlers from
+    ``utils.applescript`` to be part of the same script. It prints a JSON
+    object with the affected ``ids``, the ``skipped`` IDs that do not exist
+    or are not open, the ``matched`` count and whether it was ``aborted``
+    because more than ``max_count`` todos matched; nothing is changed when
+    it aborts or on a dry run.
+
+    Args:
+        change: Change to apply
+        query: Filters selecting the todos
+        ids: Things IDs of the todos, instead of a query
+        max_count: Most todos to change
+        dry_run: Only report which todos would change
+
+    Returns:
+        Tuple of the script source and the argv values to run it with
+
+    Raises:
+        ValueError: If both or neither of query and ids are given, or the
+            query cannot be applied exactly
+    """
+    if (query is None) == (ids is None):
+        raise ValueError("Select todos either by IDs or by filter")
+
+    script = ScriptArgs()
+    max_arg = script.bind(str(max_count))
+    dry_run_arg = script.bind("true" if dry_run else "false")
+    when_arg = script.bind(change.when.isoformat(), as_date=True) if change.when is not None else None
+    when_list_arg = script.bind(change.when_list) if change.when_list is not None else None
+    deadline_arg = script.bind(change.deadline.isoformat(), as_date=True) if change.deadline is not None else None
+
+    # Changes made to every todo of a whose reference in one event
+    set_lines: List[str] = []
+    # Changes made to each todo in turn, as "t"
+    each_lines: List[str] = []
+    if query is not None:
+        _check_query(query)
+        container, predicates = query.whose_clause(script)
+        select = [
+            f"set matches to a reference to ({container} whose {predicates})",
+            "try",
+            "    set matchIds to id of matches",
+            "on error",
+            "    set matchIds to {}",
+            "end try",
+        ]
+        # Set on the reference before anything that could change what it selects
+        if deadline_arg is not None:
+            set_lines.append(f"set due date of matches to {deadline_arg}")
+        if change.complete:
+            set_lines.append("set status of matches to completed")
+    else:
+        first = len(script.values) + 1
+        script.values.extend(ids or [])
+        select = [
+            "set matchIds to {}",
+            f"repeat with i from {first} to count of argv",
+            "    set todoId to item i of argv",
+            "    try",
+            "        set t to to do id todoId",
+            "        if status of t is open then",
+            "            set end of matchIds to todoId",
+            "        else",
+            "            set end of skippedIds to todoId",
+            "        end if",
+            "    on error",
+            "        set end of skippedIds to todoId",
+            "    end try",
+            "end repeat",
+        ]
+        if deadline_arg is not None:
+            each_lines.append(f"set due date of t to {deadline_arg}")
+        if change.complete:
+            each_lines.append("set status of t to completed")
+    if when_arg is not None:
+        each_lines.insert(0, f"schedule t for {when_arg}")
+    if when_list_arg is not None:
+        each_lines.insert(0, f"move t to list {when_list_arg}")
+
+    actions = list(set_lines)
+    if each_lines:
+        actions.append("repeat with todoId in matchIds")
+        actions.append("    set t to to do id (contents of todoId)")
+        actions.extend(f"    {line}" for line in each_lines)
+        actions.append("end repeat")
+
+    source = _BULK_TEMPLATE.format(
+        assignments=script.assignments(),
+        max_count=max_arg,
+        dry_run=dry_run_arg,
+        select="\n".join(f"        {line}" for line in select),
+        actions="\n".join(f"            {line}" for line in actions),
+    )
+    return source, script.values
+
+
+_BULK_TEMPLATE = """
+on jsonList(theItems)
+    set parts to {{}}
+    repeat with x in theItems
+        set end of parts to "\\"" & my jsonEscape(x as string) & "\\""
+    end repeat
+    set AppleScript's text item delimiters to ","
+    set theText to "[" & (parts as string) & "]"
+    set AppleScript's text item delimiters to ""
+    return theText
+end jsonList
+
+on run argv
+{assignments}
+    set maxCount to {max_count} as integer
+    set skippedIds to {{}}
+    set aborted to "false"
+    tell application "Things3"
+{select}
+        set matchCount to count of matchIds
+        if matchCount > maxCount then
+            set aborted to "true"
+        else if {dry_run} is not "true" and matchCount > 0 then
+{actions}
+        end if
+    end tell
+    if aborted is "true" then set matchIds to {{}}
+    return "{{\\"ids\\": " & my jsonList(matchIds) & ", \\"skipped\\": " & my jsonList(skippedIds) & ¬
+        ", \\"matched\\": " & matchCount & ", \\"aborted\\": " & aborted & "}}"
+end run
+"""
@@ -0,0 +1,240 @@
+"""In-memory caches and indexes over Things3 data."""
+
+import bisect
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set
+
+from .models import Task
+
+
+class NameIndex:
+    """Cached mapping of todo names to Things IDs.
+
+    The index is fed incrementally from every view result that carries IDs and
+    rebuilt in full from a bulk fetch when a lookup misses or the index is
+    older than ``ttl`` seconds. Mutations resolve names through it so that the
+    scripts they run can address a todo by ID instead of scanning the library.
+    """
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        """Initialize the name index.
+
+        Args:
+            ttl: Seconds after a full rebuild before the index is considered stale
+        """
+        self.ttl = ttl
+        self._ids_by_name: Dict[str, Set[str]] = {}
+        self._name_by_id: Dict[str, str] = {}
+        self._built_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the index needs a full rebuild before it can be trusted."""
+        return self._built_at is None or time.monotonic() - self._built_at > self.ttl
+
+    def __len__(self) -> int:
+        return len(self._name_by_id)
+
+    def update(self, items: Iterable[Task]) -> None:
+        """Add or refresh entries for the given tasks.
+
+        Args:
+            items: Tasks, e.g. from a list view
+        """
+        with self._lock:
+            for item in items:
+                if item.id:
+                    self._set(item.id, item.title)
+
+    def replace(self, items: Iterable[Task]) -> None:
+        """Rebuild the index from a complete set of items.
+
+        Args:
+            items: Tasks covering every open todo
+        """
+        with self._lock:
+            self._ids_by_name.clear()
+            self._name_by_id.clear()
+            for item in items:
+                if item.id:
+                    self._set(item.id, item.title)
+            self._built_at = time.monotonic()
+
+    def lookup(self, name: str) -> List[str]:
+        """Return the IDs of all todos with the given name.
+
+        Args:
+            name: Exact todo name
+
+        Returns:
+            Sorted list of matching IDs (empty if the name is unknown)
+        """
+        with self._lock:
+            return sorted(self._ids_by_name.get(name, ()))
+
+    def rename(self, task_id: str, new_name: str) -> None:
+        """Record that a todo was renamed.
+
+        Args:
+            task_id: ID of the renamed todo
+            new_name: Its new name
+        """
+        with self._lock:
+            self._set(task_id, new_name)
+
+    def discard(self, task_id: str) -> None:
+        """Remove a todo from the index.
+
+        Args:
+            task_id: ID of the todo to remove
+        """
+        with self._lock:
+            self._remove(task_id)
+
+    def _set(self, task_id: str, name: str) -> None:
+        self._remove(task_id)
+        self._name_by_id[task_id] = name
+        self._ids_by_name.setdefault(name, set()).add(task_id)
+
+    def _remove(self, task_id: str) -> None:
+        old_name = self._name_by_id.pop(task_id, None)
+        if old_name is not None:
+            ids = self._ids_by_name.get(old_name)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self._ids_by_name[old_name]
+
+
+class DateIndex:
+    """Open todos sorted by due date and by scheduled (``when``) date.
+
+    Range queries such as "due before X", "overdue" or "scheduled this week"
+    are answered with two binary searches over a sorted list instead of a
+    scan. Like ``NameIndex``, it is rebuilt from a bulk fetch once older than
+    ``ttl`` seconds and kept current in between by the views that return
+    dated todos.
+    """
+
+    FIELDS = ("due_date", "when")
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        """Initialize the date index.
+
+        Args:
+            ttl: Seconds after a full rebuild before the index is considered stale
+        """
+        self.ttl = ttl
+        self._tasks: Dict[str, Task] = {}
+        self._dates: Dict[str, List[date]] = {field: [] for field in self.FIELDS}
+        self._ids: Dict[str, List[str]] = {field: [] for field in self.FIELDS}
+        self._built_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the index needs a full rebuild before it can be trusted."""
+        return self._built_at is None or time.monotonic() - self._built_at > self.ttl
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def replace(self, tasks: Iterable[Task]) -> None:
+        """Rebuild the index from every open todo that has a date.
+
+        Args:
+            tasks: Dated open todos
+        """
+        with self._lock:
+            self._tasks = {task.id: task for task in tasks if task.id}
+            for field in self.FIELDS:
+                entries = sorted(
+                    (value, task.id)
+                    for task in self._tasks.values()
+                    if isinstance(value := getattr(task, field), date)
+                )
+                self._dates[field] = [value for value, _ in entries]
+                self._ids[field] = [task_id for _, task_id in entries]
+            self._built_at = time.monotonic()
+
+    def update(self, tasks: Iterable[Task]) -> None:
+        """Add or re-position open todos whose dates may have changed.
+
+        Args:
+            tasks: Open todos, e.g. from a list view
+        """
+        with self._lock:
+            for task in tasks:
+                if not task.id:
+                    continue
+                self._remove(task.id)
+                if any(isinstance(getattr(task, field), date) for field in self.FIELDS):
+                    self._insert(task)
+
+    def discard(self, task_id: str) -> None:
+        """Remove a todo, e.g. after it was completed.
+
+        Args:
+            task_id: ID of the todo to remove
+        """
+        with self._lock:
+            self._remove(task_id)
+
+    def invalidate(self) -> None:
+        """Force a full rebuild before the next range query, e.g. after todos were rescheduled."""
+        with self._lock:
+            self._built_at = None
+
+    def between(self, field: str, start: Optional[date] = None, end: Optional[date] = None) -> List[Task]:
+        """Return todos whose date falls in an inclusive range.
+
+        Args:
+            field: ``due_date`` or ``when``
+            start: First date to include (unbounded if None)
+            end: Last date to include (unbounded if None)
+
+        Returns:
+            Matching todos, ordered by date
+        """
+        with self._lock:
+            dates = self._dates[field]
+            low = 0 if start is None else bisect.bisect_left(dates, start)
+            high = len(dates) if end is None else bisect.bisect_right(dates, end)
+            return [self._tasks[task_id] for task_id in self._ids[field][low:high]]
+
+    def overdue(self, today: Optional[date] = None) -> List[Task]:
+        """Return todos due before today, oldest first."""
+        if today is None:
+            today = date.today()
+        with self._lock:
+            high = bisect.bisect_left(self._dates["due_date"], today)
+            return [self._tasks[task_id] for task_id in self._ids["due_date"][:high]]
+
+    def _insert(self, task: Task) -> None:
+        self._tasks[task.id] = task
+        for field in self.FIELDS:
+            value = getattr(task, field)
+            if isinstance(value, date):
+                position = bisect.bisect_right(self._dates[field], value)
+                self._dates[field].insert(position, value)
+                self._ids[field].insert(position, task.id)
+
+    def _remove(self, task_id: str) -> None:
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return
+        for field in self.FIELDS:
+            value = getattr(task, field)
+            if not isinstance(value, date):
+                continue
+            dates, ids = self._dates[field], self._ids[field]
+            position = bisect.bisect_left(dates, value)
+            while position < len(dates) and dates[position] == value:
+                if ids[position] == task_id:
+                    del dates[position]
+                    del ids[position]
+                    break
+                position += 1
@@ -0,0 +1,120 @@
+"""Runtime configuration for Things3 MCP, read from environment variables."""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Mapping, Optional
+
+
+def _env_bool(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    """Read a boolean flag such as ``1``/``true``/``yes`` from the environment."""
+    value = environ.get(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _default_state_dir() -> Path:
+    return Path.home() / ".things3-mcp"
+
+
+@dataclass
+class Settings:
+    """Server settings.
+
+    Every field can be set through a ``THINGS3_MCP_*`` environment variable;
+    see ``from_env`` for the names.
+    """
+
+    write_behind: bool = False
+    journal_path: Path = field(default_factory=lambda: _default_state_dir() / "journal.sqlite3")
+    write_max_attempts: int = 5
+    # Seconds to gather inline writes into one batch; 0 applies each on its own
+    coalesce_window: float = 0.05
+    http_host: str = "127.0.0.1"
+    http_port: int = 8765
+    max_concurrency: int = 8
+    socket_path: Path = field(default_factory=lambda: _default_state_dir() / "daemon.sock")
+    use_daemon: bool = False
+    database_path: Optional[Path] = None
+    resource_poll_interval: float = 5.0
+    selection_poll_interval: float = 0.25
+    breaker_threshold: int = 3
+    breaker_reset: float = 30.0
+    warmup_tools: List[str] = field(default_factory=lambda: ["view-today", "view-projects"])
+    prefetch_ttl: float = 10.0
+    backend: str = "things3"
+    simulated_latency: float = 0.05
+    recording_path: Optional[Path] = None
+    replay_latency: bool = False
+    templates_path: Path = field(default_factory=lambda: _default_state_dir() / "templates")
+    auth_token: Optional[str] = None
+    url_batch_size: int = 10
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        """Build settings from environment variables.
+
+        Args:
+            environ: Mapping to read from (defaults to ``os.environ``)
+
+        Returns:
+            Settings with defaults for unset variables
+        """
+        if environ is None:
+            environ = os.environ
+
+        defaults = cls()
+        return cls(
+            write_behind=_env_bool(environ, "THINGS3_MCP_WRITE_BEHIND", defaults.write_behind),
+            journal_path=Path(environ["THINGS3_MCP_JOURNAL"]).expanduser()
+            if environ.get("THINGS3_MCP_JOURNAL")
+            else defaults.journal_path,
+            write_max_attempts=int(
+                environ.get("THINGS3_MCP_WRITE_MAX_ATTEMPTS", defaults.write_max_attempts)
+            ),
+            coalesce_window=float(
+                environ.get("THINGS3_MCP_COALESCE_WINDOW_MS", defaults.coalesce_window * 1000)
+            ) / 1000,
+            http_host=environ.get("THINGS3_MCP_HTTP_HOST") or defaults.http_host,
+            http_port=int(environ.get("THINGS3_MCP_HTTP_PORT", defaults.http_port)),
+            max_concurrency=int(
+                environ.get("THINGS3_MCP_MAX_CONCURRENCY", defaults.max_concurrency)
+            ),
+            socket_path=Path(environ["THINGS3_MCP_SOCKET"]).expanduser()
+            if environ.get("THINGS3_MCP_SOCKET")
+            else defaults.socket_path,
+            use_daemon=_env_bool(environ, "THINGS3_MCP_USE_DAEMON", defaults.use_daemon),
+            database_path=Path(environ["THINGS3_MCP_DATABASE"]).expanduser()
+            if environ.get("THINGS3_MCP_DATABASE")
+            else defaults.database_path,
+            resource_poll_interval=float(
+                environ.get("THINGS3_MCP_RESOURCE_POLL_INTERVAL", defaults.resource_poll_interval)
+            ),
+            selection_poll_interval=float(
+                environ.get("THINGS3_MCP_SELECTION_POLL_INTERVAL", defaults.selection_poll_interval)
+            ),
+            breaker_threshold=int(
+                environ.get("THINGS3_MCP_BREAKER_THRESHOLD", defaults.breaker_threshold)
+            ),
+            breaker_reset=float(
+                environ.get("THINGS3_MCP_BREAKER_RESET_SECONDS", defaults.breaker_reset)
+            ),
+            warmup_tools=[name.strip() for name in environ["THINGS3_MCP_WARMUP"].split(",") if name.strip()]
+            if "THINGS3_MCP_WARMUP" in environ
+            else defaults.warmup_tools,
+            prefetch_ttl=float(environ.get("THINGS3_MCP_PREFETCH_TTL", defaults.prefetch_ttl)),
+            backend=environ.get("THINGS3_MCP_BACKEND") or defaults.backend,
+            simulated_latency=float(
+                environ.get("THINGS3_MCP_SIMULATED_LATENCY_MS", defaults.simulated_latency * 1000)
+            ) / 1000,
+            recording_path=Path(environ["THINGS3_MCP_RECORDING"]).expanduser()
+            if environ.get("THINGS3_MCP_RECORDING")
+            else defaults.recording_path,
+            replay_latency=_env_bool(environ, "THINGS3_MCP_REPLAY_LATENCY", defaults.replay_latency),
+            templates_path=Path(environ["THINGS3_MCP_TEMPLATES"]).expanduser()
+            if environ.get("THINGS3_MCP_TEMPLATES")
+            else defaults.templates_path,
+            auth_token=environ.get("THINGS3_MCP_AUTH_TOKEN") or defaults.auth_token,
+            url_batch_size=int(environ.get("THINGS3_MCP_URL_BATCH_SIZE", defaults.url_batch_size)),
+        )
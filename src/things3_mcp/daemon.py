@@ -0,0 +1,214 @@
+"""Shared server daemon on a Unix domain socket, and the stdio shim for it.
+
+The daemon keeps one warm server (handlers, caches, write queue) running in
+the background. Each host still starts ``things3-mcp`` over stdio, but that
+process is only a shim: it connects to the daemon's socket, starting the
+daemon first if needed, and copies newline-framed JSON-RPC messages between
+its stdin/stdout and the socket.
+"""
+
+import fcntl
+import os
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Tuple, Union
+
+import anyio
+import anyio.abc
+import anyio.lowlevel
+import mcp.types as types
+from anyio.streams.buffered import BufferedByteReceiveStream
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from loguru import logger
+from mcp.shared.message import SessionMessage
+
+if TYPE_CHECKING:
+    from .server import Things3Server
+
+# Largest single message accepted from a client
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+@asynccontextmanager
+async def socket_transport(stream: anyio.abc.ByteStream) -> AsyncIterator[Tuple[Any, Any]]:
+    """Expose a byte stream as MCP read/write streams.
+
+    Messages are framed the same way as over stdio: one JSON-RPC message per
+    line.
+
+    Args:
+        stream: Connected client stream
+
+    Yields:
+        The read and write streams expected by ``Server.run``
+    """
+    read_stream_writer: MemoryObjectSendStream[Union[SessionMessage, Exception]]
+    read_stream: MemoryObjectReceiveStream[Union[SessionMessage, Exception]]
+    write_stream: MemoryObjectSendStream[SessionMessage]
+    write_stream_reader: MemoryObjectReceiveStream[SessionMessage]
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+    buffered = BufferedByteReceiveStream(stream)
+
+    async def socket_reader() -> None:
+        try:
+            async with read_stream_writer:
+                while True:
+                    try:
+                        line = await buffered.receive_until(b"\n", MAX_MESSAGE_BYTES)
+                    except (anyio.IncompleteRead, anyio.EndOfStream):
+                        return
+                    if not line.strip():
+                        continue
+                    try:
+                        message = types.JSONRPCMessage.model_validate_json(line)
+                    except Exception as exc:
+                        await read_stream_writer.send(exc)
+                        continue
+                    await read_stream_writer.send(SessionMessage(message))
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            await anyio.lowlevel.checkpoint()
+
+    async def socket_writer() -> None:
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    data = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                    await stream.send(data.encode("utf-8") + b"\n")
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            await anyio.lowlevel.checkpoint()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(socket_reader)
+        tg.start_soon(socket_writer)
+        yield read_stream, write_stream
+        # The session is over; stop waiting on the peer
+        tg.cancel_scope.cancel()
+
+
+async def serve_daemon(server: "Things3Server", path: Path) -> None:
+    """Serve MCP sessions on a Unix domain socket until cancelled.
+
+    Only one daemon may own a socket path. A lock file next to the socket
+    guards it, so that two shims racing to start a daemon end up with one.
+
+    Args:
+        server: Server whose handlers serve every session
+        path: Socket path to listen on
+
+    Raises:
+        RuntimeError: If another daemon already owns the socket
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = open(path.with_name(path.name + ".lock"), "w")
+    try:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise RuntimeError(f"Another daemon is already serving {path}")
+
+        # Left behind by a daemon that did not shut down cleanly
+        if path.exists():
+            path.unlink()
+
+        listener = await anyio.create_unix_listener(path)
+        os.chmod(path, 0o600)
+        logger.info(f"Daemon listening on {path}")
+
+        async def handle_client(stream: anyio.abc.SocketStream) -> None:
+            logger.debug("Daemon session opened")
+            try:
+                async with stream, socket_transport(stream) as (read_stream, write_stream):
+                    await server.server.run(read_stream, write_stream, server.initialization_options())
+            except Exception as e:
+                logger.error(f"Daemon session failed: {e}")
+            logger.debug("Daemon session closed")
+
+        try:
+            async with listener:
+                await listener.serve(handle_client)
+        finally:
+            path.unlink(missing_ok=True)
+    finally:
+        lock_file.close()
+
+
+def spawn_daemon() -> None:
+    """Start a daemon process detached from the current session."""
+    subprocess.Popen(
+        [sys.executable, "-m", "things3_mcp.server", "daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+async def connect_daemon(path: Path, autostart: bool = True, timeout: float = 10.0) -> anyio.abc.SocketStream:
+    """Connect to the daemon, starting it if it is not running.
+
+    Args:
+        path: Socket path of the daemon
+        autostart: Whether to start a daemon when none is listening
+        timeout: Seconds to wait for a freshly started daemon
+
+    Returns:
+        Connected socket stream
+
+    Raises:
+        OSError: If no daemon could be reached
+    """
+    try:
+        return await anyio.connect_unix(path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        if not autostart:
+            raise
+
+    logger.info(f"No daemon on {path}, starting one")
+    spawn_daemon()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await anyio.connect_unix(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() > deadline:
+                raise
+            await anyio.sleep(0.05)
+
+
+async def run_shim(path: Path, autostart: bool = True) -> None:
+    """Forward MCP messages between stdin/stdout and the daemon.
+
+    The shim does not parse messages; it copies whole lines in both
+    directions until either side closes.
+
+    Args:
+        path: Socket path of the daemon
+        autostart: Whether to start a daemon when none is listening
+    """
+    stream = await connect_daemon(path, autostart)
+    stdin = anyio.wrap_file(sys.stdin.buffer)
+    stdout = anyio.wrap_file(sys.stdout.buffer)
+
+    async with stream, anyio.create_task_group() as tg:
+
+        async def forward_requests() -> None:
+            async for line in stdin:
+                await stream.send(line)
+            # Host closed stdin: let the daemon finish the session
+            await stream.send_eof()
+
+        async def forward_responses() -> None:
+            try:
+                async for chunk in stream:
+                    await stdout.write(chunk)
+                    await stdout.flush()
+            except anyio.BrokenResourceError:
+                pass
+            tg.cancel_scope.cancel()
+
+        tg.start_soon(forward_requests)
+        tg.start_soon(forward_responses)
@@ -0,0 +1,213 @@
+"""Decoding of script and database output into typed records.
+
+Uses msgspec or orjson when one of them is installed (``pip install
+things3-mcp[fast]``) and falls back to the standard library otherwise. All
+backends validate the shape of task payloads and produce identical ``Task``
+objects.
+"""
+
+import json
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Union
+
+from .models import Task, intern_tags, intern_text, parse_date, parse_datetime
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+
+class DecodeError(ValueError):
+    """Raised when script output is not valid JSON of the expected shape."""
+
+
+Payload = Union[str, bytes]
+
+# Tag strings and dates repeat across most todos, so each distinct value is
+# parsed once per process.
+_cached_tags = lru_cache(maxsize=4096)(intern_tags)
+_cached_date = lru_cache(maxsize=4096)(parse_date)
+
+
+def _task(
+    id: str,
+    title: str,
+    notes: str,
+    due_date: str,
+    when: str,
+    tags: str,
+    project: str,
+    area: str,
+    status: str,
+    completed_at: str
+) -> Task:
+    return Task(
+        id,
+        title,
+        notes,
+        _cached_date(due_date) if due_date else None,
+        _cached_date(when) if when else None,
+        _cached_tags(tags) if tags else (),
+        intern_text(project),
+        intern_text(area),
+        intern_text(status),
+        parse_datetime(completed_at) if completed_at else None,
+    )
+
+
+def _json_loads(payload: Payload) -> Any:
+    try:
+        return json.loads(payload)
+    except json.JSONDecodeError as e:
+        raise DecodeError(f"Invalid JSON: {e}")
+
+
+def _orjson_loads(payload: Payload) -> Any:
+    try:
+        return orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
+        raise DecodeError(f"Invalid JSON: {e}")
+
+
+def _msgspec_loads(payload: Payload) -> Any:
+    try:
+        return msgspec.json.decode(payload)
+    except msgspec.DecodeError as e:
+        raise DecodeError(f"Invalid JSON: {e}")
+
+
+def _tasks_from_items(items: Any) -> List[Task]:
+    """Validate decoded JSON and convert it to tasks."""
+    if not isinstance(items, list):
+        raise DecodeError(f"Expected a list of tasks, got {type(items).__name__}")
+
+    tasks = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise DecodeError(f"Expected a task object, got {type(item).__name__}")
+        get = item.get
+        tags = get("tags") or ""
+        if isinstance(tags, list):
+            tags = ",".join(tags)
+        values = (
+            get("id") or "",
+            get("title") or "",
+            get("notes") or "",
+            get("due_date") or "",
+            get("when") or "",
+            tags,
+            get("project") or "",
+            get("area") or "",
+            get("status") or "",
+            get("completed_at") or "",
+        )
+        for value in values:
+            if type(value) is not str:
+                raise DecodeError(f"Invalid task {get('id', '?')}: expected strings, got {value!r}")
+        tasks.append(_task(*values))
+    return tasks
+
+
+if msgspec is not None:
+
+    class _TaskRecord(msgspec.Struct, gc=False):
+        """Shape of one task in script output, validated by msgspec."""
+
+        id: str = ""
+        title: str = ""
+        notes: str = ""
+        due_date: str = ""
+        when: str = ""
+        tags: str = ""
+        project: str = ""
+        area: str = ""
+        status: str = ""
+        completed_at: str = ""
+
+    _task_list_decoder = msgspec.json.Decoder(List[_TaskRecord])
+
+
+def _decode_tasks_msgspec(payload: Payload) -> List[Task]:
+    try:
+        records = _task_list_decoder.decode(payload)
+    except msgspec.ValidationError:
+        # Valid JSON in a less common shape (e.g. tags as a list)
+        return _tasks_from_items(_msgspec_loads(payload))
+    except msgspec.DecodeError as e:
+        raise DecodeError(f"Invalid JSON: {e}")
+    # Same conversion as ``_task``, inlined: the per-record call dominated
+    # decoding once msgspec did the parsing.
+    intern = sys.intern
+    return [
+        Task(
+            r.id,
+            r.title,
+            r.notes,
+            _cached_date(r.due_date) if r.due_date else None,
+            _cached_date(r.when) if r.when else None,
+            _cached_tags(r.tags) if r.tags else (),
+            intern(r.project) if r.project else "",
+            intern(r.area) if r.area else "",
+            intern(r.status) if r.status else "",
+            parse_datetime(r.completed_at) if r.completed_at else None,
+        )
+        for r in records
+    ]
+
+
+_LOADERS: Dict[str, Callable[[Payload], Any]] = {"json": _json_loads}
+if orjson is not None:
+    _LOADERS["orjson"] = _orjson_loads
+if msgspec is not None:
+    _LOADERS["msgspec"] = _msgspec_loads
+
+# Fastest installed backend
+BACKEND = "msgspec" if msgspec is not None else "orjson" if orjson is not None else "json"
+
+
+def available_backends() -> List[str]:
+    """Return the installed decoding backends, fastest first."""
+    return [name for name in ("msgspec", "orjson", "json") if name in _LOADERS]
+
+
+def loads(payload: Payload, backend: str = BACKEND) -> Any:
+    """Decode a JSON payload.
+
+    Args:
+        payload: JSON text
+        backend: Backend to use (defaults to the fastest installed one)
+
+    Returns:
+        Decoded value
+
+    Raises:
+        DecodeError: If the payload is not valid JSON
+    """
+    return _LOADERS[backend](payload)
+
+
+def decode_tasks(payload: Payload, backend: str = BACKEND) -> List[Task]:
+    """Decode a JSON list of tasks straight into ``Task`` objects.
+
+    Args:
+        payload: JSON text as emitted by the task scripts
+        backend: Backend to use (defaults to the fastest installed one)
+
+    Returns:
+        List of tasks
+
+    Raises:
+        DecodeError: If the payload is not valid JSON or not a list of tasks
+    """
+    if not payload:
+        return []
+    if backend == "msgspec":
+        return _decode_tasks_msgspec(payload)
+    return _tasks_from_items(loads(payload, backend))
@@ -1,6 +1,17 @@
 """Handlers for MCP Things3 Enhanced."""
 
 from .applescript import AppleScriptHandler
+from .breaker import CircuitBreaker, CircuitOpenError, UnavailableError, unavailable_message
+from .database import DisabledDatabase, ThingsDatabase
 from .xcallback import XCallbackHandler
 
-__all__ = ["AppleScriptHandler", "XCallbackHandler"]
\ No newline at end of file
+__all__ = [
+    "AppleScriptHandler",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DisabledDatabase",
+    "ThingsDatabase",
+    "UnavailableError",
+    "XCallbackHandler",
+    "unavailable_message",
+]
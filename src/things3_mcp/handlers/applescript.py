@@ -1,34 +1,97 @@
 """AppleScript execution handler for Things3 integration."""
 
-import json
+import hashlib
+import os
+import random
+import re
+import shutil
 import subprocess
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 
+from ..bulk import DEFAULT_MAX_COUNT, BulkChange, bulk_script
+from ..cache import DateIndex, NameIndex
+from ..decode import DecodeError, decode_tasks, loads
+from ..hierarchy import build_hierarchy
+from ..models import Task
+from ..query import LogbookCursor, TodoQuery
+from .breaker import CircuitBreaker, UnavailableError
+
+# AppleScript errors meaning Things3 could not be reached: not running (-600),
+# connection invalid (-609), Apple Event timed out (-1712), not authorized
+# (-1743), launch failed (-10810)
+_UNAVAILABLE_ERROR = re.compile(r"\((-600|-609|-1712|-1743|-10810)\)")
+
+# Liveness check for the circuit breaker. Any ``tell`` launches Things3 when
+# it is not running, so the probe first asks whether it runs, which does not
+# launch it, and only then whether it responds.
+_RUNNING_SCRIPT = 'return application "Things3" is running'
+_PROBE_SCRIPT = 'tell application "Things3" to return version'
+
 
 class AppleScriptHandler:
-    """Handles AppleScript execution for Things3 data operations."""
+    """Handles AppleScript execution for Things3 data operations.
+    
+    Script files are constant: parameterized scripts take their values through
+    an ``on run argv`` handler instead of having them spliced into the source.
+    That keeps user input out of the script text and lets every script be
+    compiled once with ``osacompile`` and reused from an on-disk cache.
     
-    def __init__(self, scripts_path: Optional[Path] = None) -> None:
+    Every run goes through a circuit breaker, so that calls fail fast instead
+    of each waiting out the timeout while Things3 is not running or stuck on
+    a dialog. Read-only scripts (``get_*`` and generated queries) are retried
+    with exponential backoff and jitter when Things3 is briefly unreachable.
+    """
+    
+    def __init__(
+        self,
+        scripts_path: Optional[Path] = None,
+        compile_cache_path: Optional[Path] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        read_retries: int = 2,
+        retry_base_delay: float = 0.2
+    ) -> None:
         """Initialize the AppleScript handler.
         
         Args:
             scripts_path: Path to AppleScript files directory
+            compile_cache_path: Directory for precompiled scripts
+            breaker: Circuit breaker guarding script runs
+            read_retries: Retries for read-only scripts that could not reach Things3
+            retry_base_delay: Upper bound of the first retry delay, doubled per retry
         """
         if scripts_path is None:
             self.scripts_path = Path(__file__).parent.parent / "scripts"
         else:
             self.scripts_path = scripts_path
+        
+        if compile_cache_path is None:
+            self.compile_cache_path = Path.home() / "Library" / "Caches" / "things3-mcp"
+        else:
+            self.compile_cache_path = compile_cache_path
+        
+        self.breaker = breaker if breaker is not None else CircuitBreaker("Things3")
+        if self.breaker.probe is None:
+            self.breaker.probe = self.probe
+        self.read_retries = read_retries
+        self.retry_base_delay = retry_base_delay
+        
+        self.name_index = NameIndex()
+        self.date_index = DateIndex()
+        self._compiled_scripts: Dict[Path, Path] = {}
             
         logger.debug(f"AppleScript handler initialized with scripts path: {self.scripts_path}")
 
-    def run_script(self, script: str) -> str:
+    def run_script(self, script: str, args: Optional[List[str]] = None) -> str:
         """Execute an AppleScript and return its output.
         
         Args:
             script: AppleScript code to execute
+            args: Values passed to the script's ``on run argv`` handler
             
         Returns:
             Script output as string
@@ -36,29 +99,16 @@ class AppleScriptHandler:
         Raises:
             RuntimeError: If script execution fails
         """
-        try:
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                check=True,
-                capture_output=True,
-                timeout=30
-            )
-            output = result.stdout.decode('utf-8', errors='replace').strip()
-            logger.debug(f"AppleScript executed successfully, output length: {len(output)}")
-            return output
-        except subprocess.CalledProcessError as e:
-            stderr = e.stderr.decode('utf-8', errors='replace') if e.stderr else 'Unknown error'
-            logger.error(f"AppleScript execution failed: {stderr}")
-            raise RuntimeError(f"AppleScript execution failed: {stderr}")
-        except subprocess.TimeoutExpired:
-            logger.error("AppleScript execution timed out")
-            raise RuntimeError("AppleScript execution timed out")
+        return self._run_osascript(['osascript', '-e', script, *(args or [])])
 
-    def run_script_file(self, filename: str) -> str:
+    def run_script_file(self, filename: str, args: Optional[List[str]] = None) -> str:
         """Execute an AppleScript file and return its output.
         
+        The file is run from its precompiled form when available.
+        
         Args:
             filename: Name of the AppleScript file (with or without .applescript extension)
+            args: Values passed to the script's ``on run argv`` handler
             
         Returns:
             Script output as string
@@ -76,15 +126,199 @@ class AppleScriptHandler:
             raise FileNotFoundError(f"AppleScript file not found: {script_path}")
             
         try:
-            with open(script_path, 'r', encoding='utf-8') as f:
-                script = f.read()
-                
-            return self.run_script(script)
+            compiled_path = self._compiled_script(script_path)
         except IOError as e:
             logger.error(f"Failed to read script file {script_path}: {e}")
             raise RuntimeError(f"Failed to read script file: {e}")
+        
+        # Scripts named get_* only read
+        idempotent = filename.startswith('get_')
+        return self._run_osascript(['osascript', str(compiled_path), *(args or [])], idempotent)
+
+    def run_script_source(self, name: str, source: str, args: Optional[List[str]] = None) -> str:
+        """Execute generated AppleScript source and return its output.
+        
+        The source is written to the compile cache under a hash of its
+        contents and then compiled and run like a script file, so generated
+        scripts that repeat are only compiled once.
+        
+        Args:
+            name: Short name for the script, used in the cached file name
+            source: AppleScript source code
+            args: Values passed to the script's ``on run argv`` handler
+            
+        Returns:
+            Script output as string
+            
+        Raises:
+            RuntimeError: If the script cannot be written or execution fails
+        """
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        script_path = self.compile_cache_path / f"{name}-{digest}.applescript"
+        
+        try:
+            if not script_path.exists():
+                self.compile_cache_path.mkdir(parents=True, exist_ok=True)
+                partial_path = script_path.with_suffix(f".{os.getpid()}.tmp")
+                partial_path.write_text(source, encoding="utf-8")
+                os.replace(partial_path, script_path)
+            compiled_path = self._compiled_script(script_path)
+        except OSError as e:
+            logger.error(f"Failed to write generated script {script_path}: {e}")
+            raise RuntimeError(f"Failed to write generated script: {e}")
+        
+        # Generated scripts are queries
+        return self._run_osascript(['osascript', str(compiled_path), *(args or [])], idempotent=True)
 
-    def get_list_tasks(self, list_name: str) -> List[Dict[str, Any]]:
+    def _run_osascript(self, command: List[str], idempotent: bool = False) -> str:
+        """Run an osascript command line through the circuit breaker.
+        
+        Args:
+            command: Full command including the ``osascript`` executable
+            idempotent: Whether the script only reads and may be retried
+            
+        Returns:
+            Script output as string
+            
+        Raises:
+            CircuitOpenError: If Things3 is known to be unavailable
+            UnavailableError: If Things3 could not be reached
+            RuntimeError: If script execution fails
+        """
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                output = self._execute(command)
+            except subprocess.TimeoutExpired:
+                self.breaker.record_failure(timed_out=True)
+                logger.error("AppleScript execution timed out")
+                raise UnavailableError("AppleScript execution timed out")
+            except UnavailableError as e:
+                self.breaker.record_failure()
+                if not idempotent or attempt >= self.read_retries:
+                    raise
+                # Full jitter keeps concurrent retries from arriving together
+                delay = random.uniform(0, self.retry_base_delay * 2 ** attempt)
+                attempt += 1
+                logger.warning(f"Things3 unreachable, retrying in {delay:.2f}s: {e}")
+                time.sleep(delay)
+                continue
+            except RuntimeError:
+                # Things3 answered; the script itself failed
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return output
+
+    def _execute(self, command: List[str], timeout: float = 30) -> str:
+        """Run an osascript command line and return its output.
+        
+        Args:
+            command: Full command including the ``osascript`` executable
+            timeout: Seconds to wait for the script
+            
+        Returns:
+            Script output as string
+            
+        Raises:
+            subprocess.TimeoutExpired: If the script did not finish in time
+            UnavailableError: If Things3 could not be reached
+            RuntimeError: If script execution fails
+        """
+        try:
+            result = subprocess.run(
+                command,
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            output = result.stdout.strip()
+            logger.debug(f"AppleScript executed successfully, output length: {len(output)}")
+            return output
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr or 'Unknown error'
+            logger.error(f"AppleScript execution failed: {stderr}")
+            if _UNAVAILABLE_ERROR.search(stderr):
+                raise UnavailableError(f"Things3 is unavailable: {stderr}")
+            raise RuntimeError(f"AppleScript execution failed: {stderr}")
+
+    def probe(self) -> bool:
+        """Check that Things3 is running and responds, with a short timeout.
+        
+        Things3 is never launched by the probe; not running counts as down.
+        
+        Returns:
+            True if Things3 is running and answered
+        """
+        try:
+            if self._execute(['osascript', '-e', _RUNNING_SCRIPT], timeout=5) != "true":
+                return False
+            self._execute(['osascript', '-e', _PROBE_SCRIPT], timeout=5)
+            return True
+        except (RuntimeError, subprocess.TimeoutExpired):
+            return False
+
+    def ping(self) -> bool:
+        """Run a no-op script, which measures osascript itself without Things3.
+        
+        Returns:
+            True if the script ran
+        """
+        try:
+            self._execute(['osascript', '-e', 'return 0'], timeout=5)
+            return True
+        except (RuntimeError, subprocess.TimeoutExpired):
+            return False
+
+    def _compiled_script(self, script_path: Path) -> Path:
+        """Return the path to run for a script file, compiling it on first use.
+        
+        Compiled scripts are cached on disk under a hash of their source, so an
+        edited script is recompiled and other server processes reuse the same
+        compiled copy. Falls back to the source file when ``osacompile`` is
+        unavailable or fails.
+        
+        Args:
+            script_path: Path to the AppleScript source file
+            
+        Returns:
+            Path to the compiled script, or to the source file
+            
+        Raises:
+            IOError: If the script source cannot be read
+        """
+        cached = self._compiled_scripts.get(script_path)
+        if cached is not None:
+            return cached
+        
+        digest = hashlib.sha256(script_path.read_bytes()).hexdigest()[:16]
+        compiled_path = self.compile_cache_path / f"{script_path.stem}-{digest}.scpt"
+        
+        if not compiled_path.exists() and shutil.which('osacompile') is None:
+            compiled_path = script_path
+        elif not compiled_path.exists():
+            partial_path = compiled_path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                self.compile_cache_path.mkdir(parents=True, exist_ok=True)
+                subprocess.run(
+                    ['osacompile', '-o', str(partial_path), str(script_path)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    timeout=30
+                )
+                os.replace(partial_path, compiled_path)
+                logger.debug(f"Compiled {script_path.name} to {compiled_path}")
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.debug(f"Running {script_path.name} from source, compilation unavailable: {e}")
+                compiled_path = script_path
+        
+        self._compiled_scripts[script_path] = compiled_path
+        return compiled_path
+
+    def get_list_tasks(self, list_name: str) -> List[Task]:
         """Retrieve tasks from a specific Things3 list using the appropriate script.
         
         Args:
@@ -92,6 +326,9 @@ class AppleScriptHandler:
             
         Returns:
             List of task dictionaries
+        
+        Raises:
+            UnavailableError: If Things3 could not be reached
         """
         # Map list names to script files
         list_to_script = {
@@ -108,24 +345,149 @@ class AppleScriptHandler:
         
         try:
             result = self.run_script_file(script_name)
-            return json.loads(result) if result else []
-        except (json.JSONDecodeError, RuntimeError) as e:
+            tasks = decode_tasks(result)
+        except UnavailableError:
+            raise
+        except (DecodeError, RuntimeError) as e:
             logger.error(f"Failed to get tasks from list '{list_name}': {e}")
             return []
+        
+        self.name_index.update(tasks)
+        self.date_index.update(tasks)
+        return tasks
 
-    def get_inbox_tasks(self) -> List[Dict[str, Any]]:
+    def query_todos(self, query: TodoQuery) -> List[Task]:
+        """Retrieve the todos matching a query.
+        
+        Queries that only filter open todos by date are answered from the
+        date index. Everything else is evaluated by Things3 in a ``whose``
+        clause, so only matching todos are serialized.
+        
+        Args:
+            query: Filters to apply
+            
+        Returns:
+            List of tasks, including project, area and status
+        
+        Raises:
+            UnavailableError: If Things3 could not be reached
+        """
+        if query.date_only:
+            tasks = self.get_dated_tasks(query)
+            if tasks is not None:
+                return tasks
+        
+        handler, args = query.to_applescript()
+        utils = (self.scripts_path / "utils.applescript").read_text(encoding="utf-8")
+        
+        try:
+            result = self.run_script_source("query_todos", utils + "\n" + handler, args)
+            tasks = decode_tasks(result)
+        except UnavailableError:
+            raise
+        except (DecodeError, RuntimeError) as e:
+            logger.error(f"Failed to query todos: {e}")
+            return []
+        
+        tasks = [task for task in tasks if query.matches(task)][:query.limit]
+        self.name_index.update(tasks)
+        if query.status == "open":
+            self.date_index.update(tasks)
+        return tasks
+
+    def get_dated_tasks(self, query: TodoQuery) -> Optional[List[Task]]:
+        """Answer a date-only query from the date index.
+        
+        Args:
+            query: Query whose only filters are date ranges
+            
+        Returns:
+            Matching tasks ordered by date, or None if the index could not
+            be built
+        """
+        if self.date_index.is_stale and not self.refresh_date_index():
+            return None
+        
+        if query.due_from is not None or query.due_to is not None:
+            candidates = self.date_index.between("due_date", query.due_from, query.due_to)
+        else:
+            candidates = self.date_index.between("when", query.when_from, query.when_to)
+        
+        return [task for task in candidates if query.matches_dates(task)][:query.limit]
+
+    def refresh_date_index(self) -> bool:
+        """Rebuild the date index from all open todos that have a date.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            tasks = decode_tasks(self.run_script_file("get_dated_todos"))
+        except (DecodeError, RuntimeError) as e:
+            logger.error(f"Failed to refresh date index: {e}")
+            return False
+        
+        self.date_index.replace(tasks)
+        logger.debug(f"Date index rebuilt with {len(self.date_index)} todos")
+        return True
+
+    def get_logbook(self, since: Optional[LogbookCursor] = None, limit: int = 50) -> List[Task]:
+        """Retrieve completed todos from the Logbook, oldest first.
+        
+        Only the todos completed at or after the cursor are fetched, so
+        repeated calls with the cursor of the previous page stream the
+        Logbook incrementally instead of reading it in full.
+        
+        Args:
+            since: Position to resume from; without it, the most recent
+                ``limit`` todos are returned
+            limit: Maximum number of todos to return
+            
+        Returns:
+            Up to ``limit`` completed todos, oldest first
+        
+        Raises:
+            UnavailableError: If Things3 could not be reached
+        """
+        since_text = ""
+        since_at: Optional[datetime] = None
+        seen: Set[str] = set()
+        if since is not None:
+            since_at = since.completed_at
+            since_text = since_at.strftime("%Y-%m-%dT%H:%M:%S")
+            seen = set(since.seen)
+        
+        try:
+            # Items already seen at the cursor second come back again, so
+            # fetch enough extra to still fill the page
+            result = self.run_script_file("get_logbook", [since_text, str(limit + len(seen))])
+            tasks = decode_tasks(result)
+        except UnavailableError:
+            raise
+        except (DecodeError, RuntimeError) as e:
+            logger.error(f"Failed to get logbook: {e}")
+            return []
+        
+        if seen:
+            tasks = [
+                task for task in tasks
+                if not (task.id in seen and task.completed_at == since_at)
+            ]
+        return tasks[:limit]
+
+    def get_inbox_tasks(self) -> List[Task]:
         """Retrieve tasks from the Things3 inbox.
         
         Returns:
-            List of task dictionaries
+            List of tasks
         """
         return self.get_list_tasks("Inbox")
 
-    def get_today_tasks(self) -> List[Dict[str, Any]]:
+    def get_today_tasks(self) -> List[Task]:
         """Retrieve today's tasks from Things3.
         
         Returns:
-            List of task dictionaries
+            List of tasks
         """
         return self.get_list_tasks("Today")
 
@@ -134,11 +496,16 @@ class AppleScriptHandler:
         
         Returns:
             List of project dictionaries
+        
+        Raises:
+            UnavailableError: If Things3 could not be reached
         """
         try:
             result = self.run_script_file("get_projects")
-            return json.loads(result) if result else []
-        except (json.JSONDecodeError, RuntimeError) as e:
+            return loads(result) if result else []
+        except UnavailableError:
+            raise
+        except (DecodeError, RuntimeError) as e:
             logger.error(f"Failed to get projects: {e}")
             return []
 
@@ -147,109 +514,217 @@ class AppleScriptHandler:
         
         Returns:
             List of area dictionaries
+        
+        Raises:
+            UnavailableError: If Things3 could not be reached
         """
         try:
             result = self.run_script_file("get_areas")
-            return json.loads(result) if result else []
-        except (json.JSONDecodeError, RuntimeError) as e:
+            return loads(result) if result else []
+        except UnavailableError:
+            raise
+        except (DecodeError, RuntimeError) as e:
             logger.error(f"Failed to get areas: {e}")
             return []
 
-    def get_selected_todos(self) -> List[Dict[str, Any]]:
+    def get_hierarchy(self, include_todos: bool = False) -> List[Dict[str, Any]]:
+        """Retrieve areas, their projects and open-todo counts in one script run.
+        
+        Headings are not available to AppleScript, so todos are attached to
+        their project directly. ``ThingsDatabase.get_hierarchy`` returns the
+        full tree when the database is available.
+        
+        Args:
+            include_todos: Whether to include the todos, not only counts
+            
+        Returns:
+            Tree as built by ``build_hierarchy``
+        
+        Raises:
+            UnavailableError: If Things3 could not be reached
+        """
+        try:
+            result = self.run_script_file("get_hierarchy", ["1" if include_todos else "0"])
+            rows = loads(result) if result else []
+        except UnavailableError:
+            raise
+        except (DecodeError, RuntimeError) as e:
+            logger.error(f"Failed to get hierarchy: {e}")
+            return []
+        
+        if not isinstance(rows, list):
+            logger.error(f"Failed to get hierarchy: unexpected result {rows!r}")
+            return []
+        return build_hierarchy(rows, include_todos)
+
+    def get_selected_todos(self) -> List[Task]:
         """Retrieve currently selected todos from Things3.
         
         Returns:
-            List of selected todo dictionaries
+            List of selected todos
+        
+        Raises:
+            UnavailableError: If Things3 could not be reached
         """
         try:
             result = self.run_script_file("get_selected")
-            return json.loads(result) if result else []
-        except (json.JSONDecodeError, RuntimeError) as e:
+            todos = loads(result) if result else []
+        except UnavailableError:
+            raise
+        except (DecodeError, RuntimeError) as e:
             logger.error(f"Failed to get selected todos: {e}")
             return []
+        
+        if not isinstance(todos, list):
+            logger.error(f"Failed to get selected todos: {todos.get('error', todos)}")
+            return []
+        
+        tasks = [Task.from_dict(item) for item in todos]
+        self.name_index.update(tasks)
+        return tasks
+
+    def get_selected_ids(self) -> Optional[List[str]]:
+        """Retrieve only the IDs of the selected todos.
+        
+        Returns:
+            Selected todo IDs in selection order, or None if the script failed
+        """
+        try:
+            result = self.run_script_file("get_selection_ids")
+        except RuntimeError as e:
+            logger.error(f"Failed to get selection: {e}")
+            return None
+        return [task_id for task_id in result.split(",") if task_id]
 
-    def assign_project(self, task_name: str, project_name: str) -> bool:
+    def refresh_name_index(self) -> bool:
+        """Rebuild the name-to-ID index from all open todos.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            result = self.run_script_file("get_task_index")
+            items = decode_tasks(result)
+        except (DecodeError, RuntimeError) as e:
+            logger.error(f"Failed to refresh task name index: {e}")
+            return False
+        
+        self.name_index.replace(items)
+        logger.debug(f"Task name index rebuilt with {len(self.name_index)} todos")
+        return True
+
+    def resolve_task_ids(self, task_name: str) -> List[str]:
+        """Resolve a todo name to the IDs of all todos with that name.
+        
+        Uses the cached name index and rebuilds it only when the name is
+        unknown or the index is stale.
+        
+        Args:
+            task_name: Exact name of the todo
+            
+        Returns:
+            List of matching Things IDs (empty if none match)
+        """
+        if not self.name_index.is_stale:
+            task_ids = self.name_index.lookup(task_name)
+            if task_ids:
+                return task_ids
+        
+        self.refresh_name_index()
+        return self.name_index.lookup(task_name)
+
+    def assign_project(self, task_id: str, project_name: str) -> bool:
         """Assign a project to a task.
         
         Args:
-            task_name: Name of the task
+            task_id: Things ID of the task
             project_name: Name of the project
             
         Returns:
             True if successful, False otherwise
         """
-        script = f'''
-        tell application "Things3"
-            set foundTodos to to dos where name is "{task_name}"
-            repeat with t in foundTodos
-                set project of t to project "{project_name}"
-            end repeat
-        end tell
-        '''
-        
         try:
-            self.run_script(script)
-            logger.info(f"Assigned project '{project_name}' to task '{task_name}'")
+            self.run_script_file("assign_project", [task_id, project_name])
+            logger.info(f"Assigned project '{project_name}' to task {task_id}")
             return True
         except RuntimeError as e:
             logger.error(f"Failed to assign project: {e}")
             return False
 
-    def assign_area(self, task_name: str, area_name: str) -> bool:
+    def assign_area(self, task_id: str, area_name: str) -> bool:
         """Assign an area to a task.
         
         Args:
-            task_name: Name of the task
+            task_id: Things ID of the task
             area_name: Name of the area
             
         Returns:
             True if successful, False otherwise
         """
-        script = f'''
-        tell application "Things3"
-            set foundTodos to to dos where name is "{task_name}"
-            repeat with t in foundTodos
-                set area of t to area "{area_name}"
-            end repeat
-        end tell
-        '''
-        
         try:
-            self.run_script(script)
-            logger.info(f"Assigned area '{area_name}' to task '{task_name}'")
+            self.run_script_file("assign_area", [task_id, area_name])
+            logger.info(f"Assigned area '{area_name}' to task {task_id}")
             return True
         except RuntimeError as e:
             logger.error(f"Failed to assign area: {e}")
             return False
 
-    def set_tags(self, task_name: str, tags: List[str]) -> bool:
+    def set_tags(self, task_id: str, tags: List[str]) -> bool:
         """Set tags for a task.
         
         Args:
-            task_name: Name of the task
+            task_id: Things ID of the task
             tags: List of tag names
             
         Returns:
             True if successful, False otherwise
         """
-        tags_str = ', '.join(f'"{tag}"' for tag in tags)
-        script = f'''
-        tell application "Things3"
-            set foundTodos to to dos where name is "{task_name}"
-            repeat with t in foundTodos
-                set tag names of t to {{{tags_str}}}
-            end repeat
-        end tell
-        '''
-        
         try:
-            self.run_script(script)
-            logger.info(f"Set tags {tags} for task '{task_name}'")
+            self.run_script_file("set_tags", [task_id, ",".join(tags)])
+            logger.info(f"Set tags {tags} for task {task_id}")
             return True
         except RuntimeError as e:
             logger.error(f"Failed to set tags: {e}")
             return False
 
+    def apply_changes(self, changes: List[Tuple[str, str, str]]) -> List[bool]:
+        """Apply several property changes in a single script run.
+        
+        Args:
+            changes: (task ID, field, value) triples, where field is one of
+                ``project``, ``area``, ``tags`` (comma-separated), ``name``,
+                ``notes`` or ``completed`` (``true``/``false``)
+            
+        Returns:
+            Success flag for each change
+        """
+        if not changes:
+            return []
+        
+        args = [part for change in changes for part in change]
+        try:
+            result = self.run_script_file("apply_changes", args)
+            flags = [bool(flag) for flag in loads(result)]
+        except (DecodeError, RuntimeError) as e:
+            logger.error(f"Failed to apply {len(changes)} changes: {e}")
+            return [False] * len(changes)
+        
+        if len(flags) != len(changes):
+            logger.error(f"Expected {len(changes)} results from apply_changes, got {len(flags)}")
+            return [False] * len(changes)
+        
+        completed = set()
+        for (task_id, field, value), success in zip(changes, flags):
+            if success and field == "name":
+                self.name_index.rename(task_id, value)
+            elif success and field == "completed" and value == "true":
+                completed.add(task_id)
+        # Completed todos no longer resolve by name
+        for task_id in completed:
+            self.name_index.discard(task_id)
+        logger.info(f"Applied {flags.count(True)} of {len(changes)} changes in one batch")
+        return flags
+
     def complete_selected_todos(self) -> Dict[str, Any]:
         """Complete all currently selected todos in Things3.
         
@@ -258,7 +733,7 @@ class AppleScriptHandler:
         """
         try:
             result = self.run_script_file("complete_selected")
-            response = json.loads(result) if result else {"success": False, "message": "No response"}
+            response = loads(result) if result else {"success": False, "message": "No response"}
             
             if response.get("success"):
                 logger.info(f"Successfully completed selected todos: {response.get('message')}")
@@ -266,45 +741,74 @@ class AppleScriptHandler:
                 logger.warning(f"Failed to complete selected todos: {response.get('message')}")
                 
             return response
-        except (json.JSONDecodeError, RuntimeError) as e:
+        except (DecodeError, RuntimeError) as e:
             logger.error(f"Failed to complete selected todos: {e}")
             return {"success": False, "error": str(e)}
 
-    def rename_task(self, old_name: str, new_name: str) -> bool:
+    def bulk_change(
+        self,
+        change: BulkChange,
+        query: Optional[TodoQuery] = None,
+        ids: Optional[List[str]] = None,
+        max_count: int = DEFAULT_MAX_COUNT,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Complete or reschedule every todo matching a query, or given by ID.
+        
+        Args:
+            change: Change to apply
+            query: Filters selecting open todos
+            ids: Things IDs of the todos, instead of a query
+            max_count: Most todos to change; larger sets are left untouched
+            dry_run: Only report which todos would change
+            
+        Returns:
+            Dictionary with ``success`` and, on success, the affected ``ids``,
+            ``skipped`` IDs, ``matched`` count and ``aborted`` flag; on
+            failure, ``error``
+            
+        Raises:
+            ValueError: If the selection is invalid
+        """
+        script, args = bulk_script(change, query=query, ids=ids, max_count=max_count, dry_run=dry_run)
+        utils = (self.scripts_path / "utils.applescript").read_text(encoding="utf-8")
+        
+        try:
+            # Completing or rescheduling to a fixed date twice changes
+            # nothing, so the run may be retried like a query
+            result = loads(self.run_script_source("bulk_change", utils + "\n" + script, args))
+        except (DecodeError, RuntimeError) as e:
+            logger.error(f"Failed to apply bulk change: {e}")
+            return {"success": False, "error": str(e)}
+        
+        if not dry_run and not result["aborted"]:
+            if change.complete:
+                for task_id in result["ids"]:
+                    self.date_index.discard(task_id)
+                    self.name_index.discard(task_id)
+            elif result["ids"]:
+                self.date_index.invalidate()
+            logger.info(f"Bulk change applied to {len(result['ids'])} todos in one script run: {change.describe()}")
+        return {"success": True, **result}
+
+    def rename_task(self, task_id: str, new_name: str) -> bool:
         """Rename a task in Things3.
         
         Args:
-            old_name: Current name of the task
+            task_id: Things ID of the task
             new_name: New name for the task
             
         Returns:
             True if successful, False otherwise
         """
-        # Escape quotes in names to prevent AppleScript injection
-        old_name_escaped = old_name.replace('"', '\\"')
-        new_name_escaped = new_name.replace('"', '\\"')
-        
-        script = f'''
-        tell application "Things3"
-            set foundTodos to to dos where name is "{old_name_escaped}"
-            if length of foundTodos > 0 then
-                repeat with t in foundTodos
-                    set name of t to "{new_name_escaped}"
-                end repeat
-                return true
-            else
-                return false
-            end if
-        end tell
-        '''
-        
         try:
-            result = self.run_script(script)
+            result = self.run_script_file("rename_task", [task_id, new_name])
             success = result.strip().lower() == "true"
             if success:
-                logger.info(f"Successfully renamed task from '{old_name}' to '{new_name}'")
+                self.name_index.rename(task_id, new_name)
+                logger.info(f"Successfully renamed task {task_id} to '{new_name}'")
             else:
-                logger.warning(f"Task '{old_name}' not found for renaming")
+                logger.warning(f"Task {task_id} not found for renaming")
             return success
         except RuntimeError as e:
             logger.error(f"Failed to rename task: {e}")
@@ -0,0 +1,159 @@
+"""Circuit breaker for calls into Things3."""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Union
+
+from loguru import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class UnavailableError(RuntimeError):
+    """Raised when Things3 could not be reached, as opposed to a script error."""
+
+
+class CircuitOpenError(UnavailableError):
+    """Raised instead of calling Things3 while the circuit is open."""
+
+    def __init__(self, message: str, retry_in: float = 0.0) -> None:
+        """Initialize the error.
+
+        Args:
+            message: Error message
+            retry_in: Seconds until the circuit lets a call through again
+        """
+        super().__init__(message)
+        self.retry_in = retry_in
+
+
+def unavailable_message(error: UnavailableError) -> str:
+    """Tool response for a call that could not reach Things3.
+
+    Args:
+        error: Error raised by the call
+
+    Returns:
+        Message saying Things3 is unavailable and, with an open circuit, when
+        it will be tried again
+    """
+    if isinstance(error, CircuitOpenError):
+        return f"Things3 unavailable (circuit open, retry in {round(error.retry_in, 1)}s)"
+    return f"Things3 unavailable ({error})"
+
+
+class CircuitBreaker:
+    """Fails calls fast while Things3 is unreachable.
+
+    The circuit opens after ``failure_threshold`` consecutive availability
+    failures, or immediately after a timeout, since every further call would
+    wait out the same timeout. While open, calls raise ``CircuitOpenError``
+    without running anything. After ``reset_timeout`` seconds the next call
+    runs the cheap ``probe`` first (concurrent calls keep failing fast) and
+    the circuit closes only if the probe succeeds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        probe: Optional[Callable[[], bool]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Initialize the breaker.
+
+        Args:
+            name: What the breaker protects, used in messages
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to fail fast before probing again
+            probe: Liveness check run before closing again; without one,
+                the next call itself is the trial
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """``closed``, ``open`` or ``half-open``."""
+        return self._state
+
+    def snapshot(self) -> Dict[str, Union[str, int, float]]:
+        """Return the state for status reporting."""
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self._opened_at + self.reset_timeout - self._clock())
+            return {"state": self._state, "failures": self._failures, "retry_in": round(retry_in, 1)}
+
+    def before_call(self) -> None:
+        """Check that a call may proceed, probing if the circuit is due to close.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            remaining = self._opened_at + self.reset_timeout - self._clock()
+            if self._state == HALF_OPEN or remaining > 0:
+                raise CircuitOpenError(
+                    f"{self.name} is unavailable; failing fast for another {max(remaining, 0):.0f}s",
+                    retry_in=max(remaining, 0.0),
+                )
+            self._state = HALF_OPEN
+            if self.probe is None:
+                return
+
+        try:
+            healthy = self.probe()
+        except Exception as e:
+            logger.debug(f"{self.name} probe failed: {e}")
+            healthy = False
+
+        with self._lock:
+            if healthy:
+                self._close()
+                return
+            self._open()
+        raise CircuitOpenError(f"{self.name} is still unavailable", retry_in=self.reset_timeout)
+
+    def record_success(self) -> None:
+        """Record a call that reached Things3."""
+        with self._lock:
+            if self._state != CLOSED:
+                self._close()
+            self._failures = 0
+
+    def record_failure(self, timed_out: bool = False) -> None:
+        """Record a call that could not reach Things3.
+
+        Args:
+            timed_out: Whether the call timed out, which opens the circuit at once
+        """
+        with self._lock:
+            self._failures += 1
+            if timed_out or self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        if self._state != OPEN:
+            logger.warning(f"{self.name} unavailable, failing fast for {self.reset_timeout:.0f}s")
+        self._state = OPEN
+        self._opened_at = self._clock()
+
+    def _close(self) -> None:
+        if self._state != CLOSED:
+            logger.info(f"{self.name} available again")
+        self._state = CLOSED
+        self._failures = 0
@@ -0,0 +1,336 @@
+"""Read-only access to the Things3 SQLite database."""
+
+import sqlite3
+from contextlib import closing
+from datetime import date
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+from loguru import logger
+
+from ..hierarchy import build_hierarchy
+from ..models import Task, intern_tags, intern_text
+
+# Location of the database below the home directory; the ThingsData suffix
+# differs per installation
+DATABASE_GLOB = (
+    "Library/Group Containers/JLMPQHK86H.com.culturedcode.ThingsMac/"
+    "ThingsData-*/Things Database.thingsdatabase/main.sqlite"
+)
+
+# TMTask.type values
+TYPE_TODO = 0
+TYPE_PROJECT = 1
+TYPE_HEADING = 2
+
+# TMTask.status values
+STATUS_OPEN = 0
+STATUS_CANCELED = 2
+STATUS_COMPLETED = 3
+
+# Dates stored before Things 3.13 are Unix timestamps; later ones are packed
+# as year << 16 | month << 12 | day << 7, which is always below this bound
+_PACKED_DATE_LIMIT = 1 << 28
+
+_HIERARCHY_SQL = f"""
+SELECT 'area' AS type, uuid AS id, title, '' AS parent, "index" AS position, 0 AS kind
+FROM TMArea
+UNION ALL
+SELECT CASE type WHEN {TYPE_PROJECT} THEN 'project' WHEN {TYPE_HEADING} THEN 'heading' ELSE 'todo' END,
+       uuid,
+       title,
+       CASE type
+           WHEN {TYPE_PROJECT} THEN COALESCE(area, '')
+           WHEN {TYPE_HEADING} THEN COALESCE(project, '')
+           ELSE COALESCE(heading, project, '')
+       END,
+       "index",
+       1
+FROM TMTask
+WHERE trashed = 0 AND status = {STATUS_OPEN} AND type IN ({TYPE_TODO}, {TYPE_PROJECT}, {TYPE_HEADING})
+ORDER BY kind, position
+"""
+
+_PROJECT_SQL = f"""
+SELECT uuid, title, notes FROM TMTask
+WHERE type = {TYPE_PROJECT} AND trashed = 0 AND (uuid = ? OR title = ?)
+ORDER BY uuid = ? DESC, status = {STATUS_OPEN} DESC
+LIMIT 1
+"""
+
+_HEADINGS_SQL = f"""
+SELECT uuid, title FROM TMTask
+WHERE type = {TYPE_HEADING} AND trashed = 0 AND project = ?
+ORDER BY "index"
+"""
+
+# Open todos of a project, directly or under one of its headings, in display
+# order: todos without a heading first, then each heading's todos
+_PROJECT_TODOS_SQL = f"""
+SELECT t.uuid, t.title, t.notes, t.deadline, t.startDate, t.heading,
+       (SELECT group_concat(tag.title, ',') FROM TMTaskTag AS tt JOIN TMTag AS tag ON tag.uuid = tt.tags
+        WHERE tt.tasks = t.uuid) AS tags,
+       COUNT(*) OVER () AS total
+FROM TMTask AS t LEFT JOIN TMTask AS h ON h.uuid = t.heading
+WHERE t.type = {TYPE_TODO} AND t.trashed = 0 AND t.status = {STATUS_OPEN}
+  AND (t.project = ? OR h.project = ?)
+ORDER BY t.heading IS NOT NULL, h."index", t."index"
+LIMIT ? OFFSET ?
+"""
+
+
+# Items with a title created since a Unix time, oldest first; creationDate
+# is a Unix timestamp in every database version
+_CREATED_SQL = """
+SELECT uuid FROM TMTask
+WHERE type = ? AND title = ? AND trashed = 0 AND creationDate >= ?
+ORDER BY creationDate, uuid
+"""
+
+_TITLE_IDS_SQL = """
+SELECT uuid FROM TMTask
+WHERE type = ? AND title = ?
+"""
+
+
+def things_date(value: Any) -> Optional[date]:
+    """Convert a ``deadline`` or ``startDate`` column value to a date.
+
+    Args:
+        value: Packed date, Unix timestamp, or NULL
+
+    Returns:
+        The date, or None if unset
+    """
+    if not value:
+        return None
+    value = int(value)
+    if value >= _PACKED_DATE_LIMIT:
+        return date.fromtimestamp(value)
+    return date(value >> 16, (value >> 12) & 0xF, (value >> 7) & 0x1F)
+
+
+class ThingsDatabase:
+    """Reads Things3 data straight from its SQLite database.
+
+    Some data, such as headings, is not exposed to AppleScript at all, and
+    reading whole trees through AppleScript costs one Apple Event per object.
+    The database answers the same questions in a single query. It is opened
+    read-only for every call; all writes still go through Things3 itself.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """Initialize the database reader.
+
+        Args:
+            path: Database file (located automatically if omitted)
+        """
+        self._path = path
+
+    @cached_property
+    def path(self) -> Optional[Path]:
+        """Database file, or None if Things3 data could not be found."""
+        if self._path is not None:
+            return self._path if self._path.exists() else None
+        matches = sorted(Path.home().glob(DATABASE_GLOB))
+        return matches[0] if matches else None
+
+    @property
+    def available(self) -> bool:
+        """Whether a database was found."""
+        return self.path is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database read-only."""
+        connection = sqlite3.connect(f"file:{quote(str(self.path))}?mode=ro", uri=True)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+        """Run a query and return its rows as dictionaries."""
+        with closing(self._connect()) as connection:
+            return [dict(row) for row in connection.execute(sql, params)]
+
+    def ping(self) -> bool:
+        """Run a trivial query to check that the database can be read.
+
+        Returns:
+            True if the query succeeded
+        """
+        if not self.available:
+            return False
+        try:
+            self._query("SELECT 1 FROM TMTask LIMIT 1")
+            return True
+        except sqlite3.Error as e:
+            logger.debug(f"Things3 database ping failed: {e}")
+            return False
+
+    def item_ids(self, title: str, project: bool = False) -> Optional[Set[str]]:
+        """Return the IDs of every item with a title, including trashed ones.
+
+        Taken before creating an item, so that ``find_created`` can tell the
+        new item from existing ones with the same title.
+
+        Args:
+            title: Exact title
+            project: Whether to look at projects rather than todos
+
+        Returns:
+            Set of IDs, or None if the database is unavailable or could not
+            be read
+        """
+        if not self.available:
+            return None
+        try:
+            rows = self._query(_TITLE_IDS_SQL, (TYPE_PROJECT if project else TYPE_TODO, title))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to look up items in the Things3 database: {e}")
+            return None
+        return {row["uuid"] for row in rows}
+
+    def find_created(
+        self,
+        title: str,
+        project: bool = False,
+        since: float = 0.0,
+        exclude: Collection[str] = ()
+    ) -> Optional[str]:
+        """Find the ID of an item that was just created.
+
+        Args:
+            title: Exact title of the new item
+            project: Whether the item is a project rather than a todo
+            since: Unix time the item was created at or after
+            exclude: IDs that belong to other items, such as those that
+                existed before the item was created
+
+        Returns:
+            ID of the oldest matching item not in ``exclude``, or None if
+            there is none yet or the database is unavailable
+        """
+        if not self.available:
+            return None
+        try:
+            rows = self._query(_CREATED_SQL, (TYPE_PROJECT if project else TYPE_TODO, title, since))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to look up created item in the Things3 database: {e}")
+            return None
+        for row in rows:
+            if row["uuid"] not in exclude:
+                return str(row["uuid"])
+        return None
+
+    def get_hierarchy(self, include_todos: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Read areas, projects, headings and open todos in one query.
+
+        Args:
+            include_todos: Whether to include the todos, not only counts
+
+        Returns:
+            Tree as built by ``build_hierarchy``, or None if the database is
+            unavailable or could not be read
+        """
+        if not self.available:
+            return None
+        try:
+            rows = self._query(_HIERARCHY_SQL)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read hierarchy from the Things3 database: {e}")
+            return None
+        return build_hierarchy(rows, include_todos)
+
+    def get_project(
+        self,
+        project: str,
+        offset: int = 0,
+        limit: int = 50,
+        checklists: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Read a page of a project's open todos with their headings.
+
+        The project, its headings, the page of todos (with tags) and their
+        checklist items are read over one connection, one query each.
+
+        Args:
+            project: Project ID or exact title
+            offset: Number of todos to skip
+            limit: Maximum number of todos to return
+            checklists: Whether to read checklist items
+
+        Returns:
+            Dictionary with the project ``id``, ``title`` and ``notes``, the
+            ``total`` number of open todos, ``headings`` (ID to title), the
+            page of ``todos``, ``todo_headings`` (todo ID to heading ID) and
+            ``checklists`` (todo ID to (title, done) pairs); an empty
+            dictionary if no such project exists; or None if the database is
+            unavailable or could not be read
+        """
+        if not self.available:
+            return None
+        try:
+            with closing(self._connect()) as connection:
+                row = connection.execute(_PROJECT_SQL, (project, project, project)).fetchone()
+                if row is None:
+                    return {}
+                project_id = row["uuid"]
+                headings = {
+                    heading["uuid"]: heading["title"] or ""
+                    for heading in connection.execute(_HEADINGS_SQL, (project_id,))
+                }
+                todo_rows = connection.execute(
+                    _PROJECT_TODOS_SQL, (project_id, project_id, limit, offset)
+                ).fetchall()
+                checklist_items: Dict[str, List[Tuple[str, bool]]] = {}
+                if checklists and todo_rows:
+                    placeholders = ",".join("?" * len(todo_rows))
+                    for item in connection.execute(
+                        f'SELECT task, title, status FROM TMChecklistItem WHERE task IN ({placeholders}) '
+                        f'ORDER BY "index"',
+                        [todo["uuid"] for todo in todo_rows],
+                    ):
+                        checklist_items.setdefault(item["task"], []).append(
+                            (item["title"] or "", item["status"] == STATUS_COMPLETED)
+                        )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read project '{project}' from the Things3 database: {e}")
+            return None
+
+        project_title = intern_text(row["title"])
+        todos = [
+            Task(
+                todo["uuid"],
+                todo["title"] or "",
+                todo["notes"] or "",
+                things_date(todo["deadline"]),
+                things_date(todo["startDate"]),
+                intern_tags(todo["tags"]),
+                project_title,
+                status="open",
+            )
+            for todo in todo_rows
+        ]
+        return {
+            "id": project_id,
+            "title": row["title"] or "",
+            "notes": row["notes"] or "",
+            "total": todo_rows[0]["total"] if todo_rows else offset,
+            "headings": headings,
+            "todos": todos,
+            "todo_headings": {todo["uuid"]: todo["heading"] for todo in todo_rows if todo["heading"]},
+            "checklists": checklist_items,
+        }
+
+
+class DisabledDatabase(ThingsDatabase):
+    """Database reader that never finds a database.
+
+    Used when Things3 is simulated or replayed: its data is only reachable
+    through the AppleScript handler, so every read falls back to it.
+    """
+
+    @cached_property
+    def path(self) -> Optional[Path]:
+        return None
@@ -0,0 +1,350 @@
+"""Record-and-replay backend for deterministic performance runs.
+
+In record mode every script run and URL call is passed through to Things3
+and its input, output (or error) and duration are appended to a fixture
+archive. In replay mode the archive answers the same calls without Things3,
+so a session recorded on a Mac can be reproduced on Linux with identical
+output, optionally with the recorded latencies.
+
+The archive is a JSON Lines file, gzip-compressed when its name ends in
+``.gz``. The first line is a header; every following line is one call.
+Generated scripts are keyed by name and content hash, and the first call
+with each hash also carries the full source so the archive shows exactly
+what ran.
+"""
+
+import gzip
+import hashlib
+import json
+import platform
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from .applescript import AppleScriptHandler
+from .breaker import CircuitBreaker, CircuitOpenError, UnavailableError
+from .xcallback import XCallbackHandler, redact_url
+
+ARCHIVE_FORMAT = "things3-mcp-recording"
+ARCHIVE_VERSION = 1
+
+# Errors that are raised again on replay, by recorded class name
+_ERRORS = {
+    "CircuitOpenError": CircuitOpenError,
+    "UnavailableError": UnavailableError,
+    "RuntimeError": RuntimeError,
+}
+
+CallKey = Tuple[str, str, Tuple[str, ...]]
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8")
+
+
+def _source_target(name: str, source: str) -> str:
+    """Identify generated source by name and content, as the compile cache does."""
+    return f"{name}-{hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]}"
+
+
+class RecordingWriter:
+    """Appends calls to a fixture archive as they happen."""
+
+    def __init__(self, path: Path) -> None:
+        """Create the archive and write its header.
+
+        Args:
+            path: Archive file; an existing file is replaced
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._sources: Set[str] = set()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = _open(path, "w")
+        self._write({
+            "format": ARCHIVE_FORMAT,
+            "version": ARCHIVE_VERSION,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "platform": platform.platform(),
+        })
+        logger.info(f"Recording Things3 calls to {path}")
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            # Keep everything recorded so far if the server is killed
+            self._file.flush()
+
+    def record(
+        self,
+        kind: str,
+        target: str,
+        args: List[str],
+        seconds: float,
+        output: Any = None,
+        error: Optional[BaseException] = None,
+        source: Optional[str] = None
+    ) -> None:
+        """Append one call.
+
+        Args:
+            kind: ``script``, ``script_file``, ``script_source`` or ``url``
+            target: Script source, script name, generated script name or URL
+            args: Script arguments
+            seconds: Duration of the call
+            output: Script output or URL result
+            error: Exception the call raised, instead of an output
+            source: Generated script source, stored with the first call to
+                its target only
+        """
+        entry: Dict[str, Any] = {
+            "kind": kind,
+            "target": target,
+            "args": args,
+            "seconds": round(seconds, 6),
+        }
+        if error is None:
+            entry["output"] = output
+        else:
+            entry["error"] = {"type": type(error).__name__, "message": str(error)}
+        with self._lock:
+            if source is not None and target not in self._sources:
+                self._sources.add(target)
+                entry["source"] = source
+        self._write(entry)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class Recording:
+    """Recorded calls, served back in the order they were recorded.
+
+    Calls that were recorded several times, such as a list read before and
+    after a change, return each recorded answer in turn and then keep
+    returning the last one.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]) -> None:
+        """Index recorded calls.
+
+        Args:
+            entries: Call entries, without the header
+        """
+        self._entries: Dict[CallKey, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self.sources: Dict[str, str] = {}
+        for entry in entries:
+            key = (entry["kind"], entry["target"], tuple(entry.get("args") or ()))
+            self._entries[key].append(entry)
+            if "source" in entry:
+                self.sources[entry["target"]] = entry["source"]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    @classmethod
+    def load(cls, path: Path) -> "Recording":
+        """Read a fixture archive.
+
+        Args:
+            path: Archive written by ``RecordingWriter``
+
+        Returns:
+            The recording
+
+        Raises:
+            ValueError: If the file is not a recording this version can read
+        """
+        with _open(path, "r") as file:
+            lines = [json.loads(line) for line in file if line.strip()]
+        header = lines[0] if lines else {}
+        if header.get("format") != ARCHIVE_FORMAT or header.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"{path} is not a version {ARCHIVE_VERSION} Things3 MCP recording")
+        logger.info(f"Replaying {len(lines) - 1} recorded calls from {path}")
+        return cls(lines[1:])
+
+    def next(self, kind: str, target: str, args: List[str]) -> Optional[Dict[str, Any]]:
+        """Return the next recorded answer to a call.
+
+        Args:
+            kind: Kind of call
+            target: Script or URL
+            args: Script arguments
+
+        Returns:
+            The recorded entry, or None if the call was never recorded
+        """
+        with self._lock:
+            entries = self._entries.get((kind, target, tuple(args)))
+            if not entries:
+                return None
+            return entries.popleft() if len(entries) > 1 else entries[0]
+
+
+class RecordingAppleScriptHandler(AppleScriptHandler):
+    """AppleScript handler that records every script run to an archive."""
+
+    def __init__(
+        self,
+        writer: RecordingWriter,
+        breaker: Optional[CircuitBreaker] = None,
+        **kwargs: Any
+    ) -> None:
+        """Initialize the handler.
+
+        Args:
+            writer: Archive to record to
+            breaker: Circuit breaker guarding script runs
+            **kwargs: Further ``AppleScriptHandler`` arguments
+        """
+        super().__init__(breaker=breaker, **kwargs)
+        self.writer = writer
+
+    def _recorded(
+        self,
+        kind: str,
+        target: str,
+        args: Optional[List[str]],
+        run: Callable[[], str],
+        source: Optional[str] = None
+    ) -> str:
+        started = time.perf_counter()
+        try:
+            output = run()
+        except Exception as e:
+            self.writer.record(
+                kind, target, list(args or []), time.perf_counter() - started, error=e, source=source
+            )
+            raise
+        self.writer.record(
+            kind, target, list(args or []), time.perf_counter() - started, output=output, source=source
+        )
+        return output
+
+    def run_script(self, script: str, args: Optional[List[str]] = None) -> str:
+        return self._recorded(
+            "script", script, args,
+            lambda: super(RecordingAppleScriptHandler, self).run_script(script, args),
+        )
+
+    def run_script_file(self, filename: str, args: Optional[List[str]] = None) -> str:
+        name = filename.removesuffix(".applescript")
+        return self._recorded(
+            "script_file", name, args,
+            lambda: super(RecordingAppleScriptHandler, self).run_script_file(filename, args),
+        )
+
+    def run_script_source(self, name: str, source: str, args: Optional[List[str]] = None) -> str:
+        return self._recorded(
+            "script_source", _source_target(name, source), args,
+            lambda: super(RecordingAppleScriptHandler, self).run_script_source(name, source, args),
+            source=source,
+        )
+
+
+class ReplayAppleScriptHandler(AppleScriptHandler):
+    """AppleScript handler that answers script runs from a recording."""
+
+    def __init__(
+        self,
+        recording: Recording,
+        keep_latency: bool = False,
+        breaker: Optional[CircuitBreaker] = None
+    ) -> None:
+        """Initialize the handler.
+
+        Args:
+            recording: Recorded calls to serve
+            keep_latency: Whether to wait as long as each recorded call took
+            breaker: Circuit breaker (replayed errors do not trip it)
+        """
+        super().__init__(breaker=breaker)
+        self.recording = recording
+        self.keep_latency = keep_latency
+
+    def _replayed(self, kind: str, target: str, args: Optional[List[str]]) -> str:
+        entry = self.recording.next(kind, target, list(args or []))
+        if entry is None:
+            raise RuntimeError(f"AppleScript execution failed: no recording of {kind} {target[:60]!r}")
+        if self.keep_latency:
+            time.sleep(entry["seconds"])
+        if "error" in entry:
+            raise _ERRORS.get(entry["error"]["type"], RuntimeError)(entry["error"]["message"])
+        return str(entry["output"])
+
+    def run_script(self, script: str, args: Optional[List[str]] = None) -> str:
+        return self._replayed("script", script, args)
+
+    def run_script_file(self, filename: str, args: Optional[List[str]] = None) -> str:
+        return self._replayed("script_file", filename.removesuffix(".applescript"), args)
+
+    def run_script_source(self, name: str, source: str, args: Optional[List[str]] = None) -> str:
+        return self._replayed("script_source", _source_target(name, source), args)
+
+    def _execute(self, command: List[str], timeout: float = 30) -> str:
+        # Probes and pings: the recorded Things3 is always there
+        return "replay"
+
+
+class RecordingXCallbackHandler(XCallbackHandler):
+    """X-callback-url handler that records every URL call to an archive."""
+
+    def __init__(self, writer: RecordingWriter, breaker: Optional[CircuitBreaker] = None) -> None:
+        """Initialize the handler.
+
+        Args:
+            writer: Archive to record to
+            breaker: Circuit breaker guarding URL calls
+        """
+        super().__init__(breaker=breaker)
+        self.writer = writer
+
+    def call_url(self, url: str) -> bool:  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            result = XCallbackHandler.call_url(url)
+        except Exception as e:
+            self.writer.record("url", redact_url(url), [], time.perf_counter() - started, error=e)
+            raise
+        self.writer.record("url", redact_url(url), [], time.perf_counter() - started, output=result)
+        return result
+
+
+class ReplayXCallbackHandler(XCallbackHandler):
+    """X-callback-url handler that answers URL calls from a recording."""
+
+    def __init__(
+        self,
+        recording: Recording,
+        keep_latency: bool = False,
+        breaker: Optional[CircuitBreaker] = None
+    ) -> None:
+        """Initialize the handler.
+
+        Args:
+            recording: Recorded calls to serve
+            keep_latency: Whether to wait as long as each recorded call took
+            breaker: Circuit breaker guarding URL calls
+        """
+        super().__init__(breaker=breaker)
+        self.recording = recording
+        self.keep_latency = keep_latency
+
+    def call_url(self, url: str) -> bool:  # type: ignore[override]
+        entry = self.recording.next("url", redact_url(url), [])
+        if entry is None:
+            raise RuntimeError(f"X-callback-url execution failed: no recording of {url[:60]!r}")
+        if self.keep_latency:
+            time.sleep(entry["seconds"])
+        if "error" in entry:
+            raise RuntimeError(entry["error"]["message"])
+        return bool(entry["output"])
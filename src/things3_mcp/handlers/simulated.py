@@ -0,0 +1,434 @@
+"""Simulated Things3 backend for load tests and development off macOS.
+
+The simulated handlers answer every script and URL the real handlers send
+from a generated in-memory library, after a configurable delay standing in
+for the Apple Events round trip. They replace only the lowest layer
+(``AppleScriptHandler._execute`` and ``XCallbackHandler.call_url``), so
+decoding, caches, retries and the circuit breaker behave as they do against
+Things3.
+"""
+
+import json
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from loguru import logger
+
+from ..bulk import DEFAULT_MAX_COUNT, BulkChange
+from ..models import Task
+from ..query import TodoQuery
+from .applescript import AppleScriptHandler
+from .breaker import CircuitBreaker
+from .xcallback import XCallbackHandler
+
+LISTS = ("Inbox", "Today", "Anytime", "Someday")
+TAGS = ("errand", "home", "work", "urgent", "waiting")
+
+
+class SimulatedLibrary:
+    """Generated areas, projects and todos that the simulated handlers share.
+
+    The library is generated from ``seed``, so every run starts from the same
+    data. Mutations change it in place and bump ``version``, which the
+    simulated fingerprints report.
+    """
+
+    def __init__(self, todo_count: int = 200, seed: int = 0) -> None:
+        """Generate the library.
+
+        Args:
+            todo_count: Number of todos, a fifth of them completed
+            seed: Seed for the generated data
+        """
+        rng = random.Random(seed)
+        today = date.today()
+        self.version = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self.areas = [{"id": self._new_id("A"), "title": f"Area {i + 1}"} for i in range(4)]
+        self.projects = [
+            {
+                "id": self._new_id("P"),
+                "title": f"Project {i + 1}",
+                "notes": "",
+                "area": self.areas[i % len(self.areas)]["title"],
+                "area_id": self.areas[i % len(self.areas)]["id"],
+            }
+            for i in range(max(1, todo_count // 20))
+        ]
+        self.todos: Dict[str, Dict[str, Any]] = {}
+        for i in range(todo_count):
+            project = rng.choice(self.projects) if rng.random() < 0.6 else None
+            completed = rng.random() < 0.2
+            todo = {
+                "id": self._new_id("T"),
+                "title": f"Todo {i + 1}",
+                "notes": "",
+                "due_date": (today + timedelta(days=rng.randint(-5, 30))).isoformat() if rng.random() < 0.3 else "",
+                "when": (today + timedelta(days=rng.randint(0, 14))).isoformat() if rng.random() < 0.3 else "",
+                "tags": ",".join(rng.sample(TAGS, rng.randint(0, 2))),
+                "project": project["title"] if project else "",
+                "area": project["area"] if project else "",
+                "status": "completed" if completed else "open",
+                "completed_at": (
+                    datetime.now() - timedelta(minutes=rng.randint(1, 60 * 24 * 30))
+                ).strftime("%Y-%m-%dT%H:%M:%S") if completed else "",
+                "list": rng.choice(LISTS),
+            }
+            self.todos[todo["id"]] = todo
+
+    def _new_id(self, prefix: str) -> str:
+        self._next_id += 1
+        return f"SIM-{prefix}{self._next_id:05d}"
+
+    def open_todos(self, list_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Open todos, optionally only those in one list."""
+        return [
+            todo for todo in self.todos.values()
+            if todo["status"] == "open" and (list_name is None or todo["list"] == list_name)
+        ]
+
+    def add_todo(self, title: str, **fields: str) -> str:
+        """Add an open todo and return its ID."""
+        with self._lock:
+            todo = {
+                "id": self._new_id("T"), "title": title, "notes": "", "due_date": "", "when": "",
+                "tags": "", "project": "", "area": "", "status": "open", "completed_at": "",
+                "list": "Inbox",
+            }
+            todo.update({key: value for key, value in fields.items() if key in todo})
+            self.todos[todo["id"]] = todo
+            self.version += 1
+            return todo["id"]
+
+    def add_project(self, title: str, notes: str = "", area: str = "") -> str:
+        """Add a project and return its ID."""
+        with self._lock:
+            area_id = next((a["id"] for a in self.areas if a["title"] == area), "")
+            project = {"id": self._new_id("P"), "title": title, "notes": notes, "area": area, "area_id": area_id}
+            self.projects.append(project)
+            self.version += 1
+            return project["id"]
+
+    def update(self, todo_id: str, **fields: str) -> bool:
+        """Change fields of a todo; False if there is no such todo."""
+        with self._lock:
+            todo = self.todos.get(todo_id)
+            if todo is None:
+                return False
+            todo.update(fields)
+            self.version += 1
+            return True
+
+    def set_completed(self, todo_id: str, completed: bool) -> bool:
+        """Complete or reopen a todo; False if there is no such todo."""
+        if completed:
+            return self.update(
+                todo_id, status="completed", completed_at=datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+            )
+        return self.update(todo_id, status="open", completed_at="")
+
+
+def _task_fields(todo: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in todo.items() if key != "list"}
+
+
+class SimulatedAppleScriptHandler(AppleScriptHandler):
+    """AppleScript handler that answers from a ``SimulatedLibrary``."""
+
+    def __init__(
+        self,
+        library: Optional[SimulatedLibrary] = None,
+        latency: float = 0.05,
+        breaker: Optional[CircuitBreaker] = None,
+        seed: int = 0
+    ) -> None:
+        """Initialize the simulated handler.
+
+        Args:
+            library: Library to serve (generated if omitted)
+            latency: Mean seconds each script takes; individual runs vary
+                between half and one and a half times this
+            breaker: Circuit breaker guarding script runs
+            seed: Seed for the latency jitter
+        """
+        super().__init__(breaker=breaker)
+        self.library = library if library is not None else SimulatedLibrary()
+        self.latency = latency
+        self._rng = random.Random(seed)
+        # Generated query and bulk change scripts are not parsed; the
+        # request they were built from is evaluated instead
+        self._local = threading.local()
+        self._scripts: Dict[str, Callable[[List[str]], Any]] = {
+            "get_inbox": lambda args: self._list("Inbox"),
+            "get_today": lambda args: self._list("Today"),
+            "get_anytime": lambda args: self._list("Anytime"),
+            "get_someday": lambda args: self._list("Someday"),
+            "get_dated_todos": lambda args: [
+                _task_fields(t) for t in self.library.open_todos() if t["due_date"] or t["when"]
+            ],
+            "get_task_index": lambda args: [
+                {"id": t["id"], "title": t["title"]} for t in self.library.open_todos()
+            ],
+            "query_todos": lambda args: self._query_todos(),
+            "bulk_change": lambda args: self._bulk_change(),
+            "get_logbook": self._logbook,
+            "get_projects": lambda args: [
+                {"id": p["id"], "title": p["title"], "notes": p["notes"]} for p in self.library.projects
+            ],
+            "get_areas": lambda args: [{"id": a["id"], "title": a["title"]} for a in self.library.areas],
+            "get_hierarchy": self._hierarchy,
+            "get_selected": lambda args: [_task_fields(t) for t in self._selection()],
+            "get_selection_ids": lambda args: ",".join(t["id"] for t in self._selection()),
+            "get_fingerprints": lambda args: "\x1e".join(f"{key}:{self.library.version}" for key in args),
+            "assign_project": lambda args: self._set(args[0], project=args[1]),
+            "assign_area": lambda args: self._set(args[0], area=args[1]),
+            "set_tags": lambda args: self._set(args[0], tags=args[1]),
+            "rename_task": lambda args: "true" if self.library.update(args[0], title=args[1]) else "false",
+            "apply_changes": self._apply_changes,
+            "complete_selected": self._complete_selected,
+        }
+
+    def query_todos(self, query: TodoQuery) -> List[Task]:
+        """Run a query, evaluating it against the library instead of in Things3."""
+        self._local.query = query
+        try:
+            return super().query_todos(query)
+        finally:
+            self._local.query = None
+
+    def bulk_change(
+        self,
+        change: BulkChange,
+        query: Optional[TodoQuery] = None,
+        ids: Optional[List[str]] = None,
+        max_count: int = DEFAULT_MAX_COUNT,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Apply a bulk change to the library instead of in Things3."""
+        self._local.bulk = (change, query, ids, max_count, dry_run)
+        try:
+            return super().bulk_change(change, query=query, ids=ids, max_count=max_count, dry_run=dry_run)
+        finally:
+            self._local.bulk = None
+
+    def _compiled_script(self, script_path: Path) -> Path:
+        # Nothing is compiled; the script name is all the simulation needs
+        return script_path
+
+    def run_script_source(self, name: str, source: str, args: Optional[List[str]] = None) -> str:
+        """Run a generated script by name without writing its source to disk."""
+        return self._run_osascript(['osascript', f"{name}.applescript", *(args or [])], idempotent=True)
+
+    def _execute(self, command: List[str], timeout: float = 30) -> str:
+        """Answer a script from the library after the simulated latency.
+
+        Raises:
+            RuntimeError: If the script is not one the simulation knows
+        """
+        time.sleep(self.latency * self._rng.uniform(0.5, 1.5))
+        if command[1] == '-e':
+            # Probes and inline scripts
+            return "3.20"
+
+        name = Path(command[1]).stem
+        script = self._scripts.get(name)
+        if script is None:
+            raise RuntimeError(f"AppleScript execution failed: no simulation for script '{name}'")
+        result = script(command[2:])
+        return result if isinstance(result, str) else json.dumps(result)
+
+    def _list(self, list_name: str) -> List[Dict[str, Any]]:
+        return [_task_fields(t) for t in self.library.open_todos(list_name)]
+
+    def _query_todos(self) -> List[Dict[str, Any]]:
+        query: TodoQuery = self._local.query
+        matches = []
+        for todo in self._matching(query):
+            matches.append(_task_fields(todo))
+            if len(matches) >= query.limit:
+                break
+        return matches
+
+    def _matching(self, query: TodoQuery) -> List[Dict[str, Any]]:
+        matches = []
+        for todo in self.library.todos.values():
+            task = Task.from_dict(todo)
+            if todo["status"] != query.status:
+                continue
+            if query.list is not None and todo["list"] != query.list:
+                continue
+            if query.text is not None and query.text.lower() not in (todo["title"] + todo["notes"]).lower():
+                continue
+            if not query.matches_dates(task):
+                continue
+            if query.project is not None and todo["project"] != query.project:
+                continue
+            if query.area is not None and todo["area"] != query.area:
+                continue
+            if query.tag is not None and query.tag not in task.tags:
+                continue
+            matches.append(todo)
+        return matches
+
+    def _bulk_change(self) -> Dict[str, Any]:
+        change, query, ids, max_count, dry_run = self._local.bulk
+        skipped: List[str] = []
+        if query is not None:
+            matched = [todo["id"] for todo in self._matching(query)]
+        else:
+            matched = []
+            for todo_id in ids:
+                todo = self.library.todos.get(todo_id)
+                (matched if todo is not None and todo["status"] == "open" else skipped).append(todo_id)
+
+        aborted = len(matched) > max_count
+        if not aborted and not dry_run:
+            for todo_id in matched:
+                if change.when is not None:
+                    self.library.update(todo_id, when=change.when.isoformat())
+                if change.when_list is not None:
+                    self.library.update(todo_id, when="", list=change.when_list)
+                if change.deadline is not None:
+                    self.library.update(todo_id, due_date=change.deadline.isoformat())
+                if change.complete:
+                    self.library.set_completed(todo_id, True)
+        return {"ids": [] if aborted else matched, "skipped": skipped, "matched": len(matched), "aborted": aborted}
+
+    def _selection(self) -> List[Dict[str, Any]]:
+        return self.library.open_todos("Today")[:3]
+
+    def _set(self, todo_id: str, **fields: str) -> str:
+        if not self.library.update(todo_id, **fields):
+            raise RuntimeError(f"AppleScript execution failed: Can't get to do id \"{todo_id}\".")
+        return ""
+
+    def _logbook(self, args: List[str]) -> List[Dict[str, Any]]:
+        since, limit = args[0], int(args[1])
+        done = sorted(
+            (t for t in self.library.todos.values() if t["status"] == "completed"),
+            key=lambda t: t["completed_at"],
+        )
+        if since:
+            return [_task_fields(t) for t in done if t["completed_at"] >= since][:limit]
+        return [_task_fields(t) for t in done[-limit:]]
+
+    def _hierarchy(self, args: List[str]) -> List[Dict[str, Any]]:
+        include_todos = args[:1] == ["1"]
+        open_todos = self.library.open_todos()
+        rows: List[Dict[str, Any]] = [
+            {"type": "area", "id": a["id"], "title": a["title"], "parent": ""} for a in self.library.areas
+        ]
+        for project in self.library.projects:
+            todos = [t for t in open_todos if t["project"] == project["title"]]
+            rows.append({
+                "type": "project", "id": project["id"], "title": project["title"],
+                "parent": project["area_id"], "open_count": len(todos),
+            })
+            if include_todos:
+                rows.extend(
+                    {"type": "todo", "id": t["id"], "title": t["title"], "parent": project["id"]}
+                    for t in todos
+                )
+        return rows
+
+    def _apply_changes(self, args: List[str]) -> List[bool]:
+        fields = {"project": "project", "area": "area", "tags": "tags", "name": "title", "notes": "notes"}
+        results = []
+        for i in range(0, len(args) - 2, 3):
+            if args[i + 1] == "completed":
+                results.append(self.library.set_completed(args[i], args[i + 2] == "true"))
+            else:
+                results.append(self.library.update(args[i], **{fields[args[i + 1]]: args[i + 2]}))
+        return results
+
+    def _complete_selected(self, args: List[str]) -> Dict[str, Any]:
+        selected = self._selection()
+        for todo in selected:
+            self.library.set_completed(todo["id"], True)
+        return {"success": True, "message": f"Completed {len(selected)} todos"}
+
+
+class SimulatedXCallbackHandler(XCallbackHandler):
+    """X-callback-url handler that adds created items to a ``SimulatedLibrary``."""
+
+    def __init__(
+        self,
+        library: SimulatedLibrary,
+        latency: float = 0.05,
+        breaker: Optional[CircuitBreaker] = None
+    ) -> None:
+        """Initialize the simulated handler.
+
+        Args:
+            library: Library to add created items to
+            latency: Seconds each URL takes to open
+            breaker: Circuit breaker guarding URL calls
+        """
+        super().__init__(breaker=breaker)
+        self.library = library
+        self.latency = latency
+
+    def call_url(self, url: str) -> bool:  # type: ignore[override]
+        """Apply a ``things:///`` URL to the library after the simulated latency."""
+        time.sleep(self.latency)
+        parsed = urlparse(url)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        command = parsed.path.lstrip("/")
+        if command == "add":
+            self.library.add_todo(
+                params.get("title", ""),
+                notes=params.get("notes", ""),
+                tags=params.get("tags", ""),
+                list=params.get("list", "Inbox") if params.get("list") in LISTS else "Inbox",
+            )
+        elif command == "add-project":
+            self.library.add_project(params.get("title", ""), params.get("notes", ""), params.get("area", ""))
+        elif command == "json":
+            for item in json.loads(params.get("data", "[]")):
+                self._add_json_item(item)
+        else:
+            logger.debug(f"Simulated URL ignored: {url}")
+        return True
+
+    def _add_json_item(self, item: Dict[str, Any]) -> None:
+        attributes = item.get("attributes", {})
+        if item.get("operation") == "update":
+            self._update_json_item(item["id"], attributes)
+        elif item.get("type") == "to-do":
+            self.library.add_todo(attributes.get("title", ""), notes=attributes.get("notes", ""))
+        elif item.get("type") == "project":
+            title = attributes.get("title", "")
+            self.library.add_project(title, attributes.get("notes", ""), attributes.get("area", ""))
+            for child in attributes.get("items", []):
+                if child.get("type") == "to-do":
+                    child_attributes = child.get("attributes", {})
+                    self.library.add_todo(
+                        child_attributes.get("title", ""),
+                        notes=child_attributes.get("notes", ""),
+                        project=title,
+                        list="Anytime",
+                    )
+
+    def _update_json_item(self, todo_id: str, attributes: Dict[str, Any]) -> None:
+        fields: Dict[str, Any] = {
+            key: attributes[key] for key in ("title", "notes", "when") if key in attributes
+        }
+        if "deadline" in attributes:
+            fields["due_date"] = attributes["deadline"]
+        if "tags" in attributes:
+            fields["tags"] = ",".join(attributes["tags"])
+        if attributes.get("list") in LISTS:
+            fields["list"] = attributes["list"]
+        elif "list" in attributes:
+            fields["project"] = attributes["list"]
+        if fields:
+            self.library.update(todo_id, **fields)
+        if "completed" in attributes:
+            self.library.set_completed(todo_id, attributes["completed"])
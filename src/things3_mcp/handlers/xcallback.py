@@ -1,14 +1,37 @@
 """X-callback-url handler for Things3 creation operations."""
 
+import json
+import re
 import subprocess
 import urllib.parse
 from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+from .breaker import CircuitBreaker, UnavailableError
+
+_AUTH_TOKEN = re.compile(r"(auth-token=)[^&]*")
+
+
+def redact_url(url: str) -> str:
+    """Hide the auth token in a URL before it is logged or recorded."""
+    return _AUTH_TOKEN.sub(r"\1***", url)
+
 
 class XCallbackHandler:
-    """Handles x-callback-url execution for Things3 item creation."""
+    """Handles x-callback-url execution for Things3 item creation.
+    
+    URLs are opened through a circuit breaker, so that creations fail fast
+    while URLs cannot be handed to Things3.
+    """
+
+    def __init__(self, breaker: Optional[CircuitBreaker] = None) -> None:
+        """Initialize the x-callback-url handler.
+        
+        Args:
+            breaker: Circuit breaker guarding URL calls
+        """
+        self.breaker = breaker if breaker is not None else CircuitBreaker("Things3 URL scheme")
 
     @staticmethod
     def call_url(url: str) -> bool:
@@ -28,21 +51,44 @@ class XCallbackHandler:
                 ['open', url],
                 check=True,
                 capture_output=True,
+                text=True,
                 timeout=10
             )
-            logger.debug(f"X-callback URL executed successfully: {url}")
+            logger.debug(f"X-callback URL executed successfully: {redact_url(url)}")
             return True
         except FileNotFoundError:
             logger.error("'open' command not found - this requires macOS")
             raise RuntimeError("X-callback-url execution requires macOS")
         except subprocess.CalledProcessError as e:
-            stderr = e.stderr.decode('utf-8', errors='replace') if e.stderr else 'Unknown error'
+            stderr = e.stderr or 'Unknown error'
             logger.error(f"Failed to execute x-callback-url: {stderr}")
             raise RuntimeError(f"X-callback-url execution failed: {stderr}")
         except subprocess.TimeoutExpired:
             logger.error("X-callback-url execution timed out")
             raise RuntimeError("X-callback-url execution timed out")
 
+    def open_url(self, url: str) -> bool:
+        """Execute an x-callback-url through the circuit breaker.
+        
+        Args:
+            url: The x-callback-url to execute
+            
+        Returns:
+            True if successful
+            
+        Raises:
+            CircuitOpenError: If URL calls are known to be failing
+            RuntimeError: If the URL could not be opened
+        """
+        self.breaker.before_call()
+        try:
+            success = self.call_url(url)
+        except RuntimeError as e:
+            self.breaker.record_failure(timed_out="timed out" in str(e))
+            raise
+        self.breaker.record_success()
+        return success
+
     def create_project(
         self,
         title: str,
@@ -64,6 +110,9 @@ class XCallbackHandler:
             
         Returns:
             True if successful, False otherwise
+            
+        Raises:
+            UnavailableError: If Things3 could not be reached
         """
         params = {"title": title}
         
@@ -81,10 +130,12 @@ class XCallbackHandler:
         url = self._build_url("things:///add-project", params)
         
         try:
-            success = self.call_url(url)
+            success = self.open_url(url)
             if success:
                 logger.info(f"Created project: {title}")
             return success
+        except UnavailableError:
+            raise
         except RuntimeError as e:
             logger.error(f"Failed to create project '{title}': {e}")
             return False
@@ -114,6 +165,9 @@ class XCallbackHandler:
             
         Returns:
             True if successful, False otherwise
+            
+        Raises:
+            UnavailableError: If Things3 could not be reached
         """
         params = {"title": title}
         
@@ -135,14 +189,49 @@ class XCallbackHandler:
         url = self._build_url("things:///add", params)
         
         try:
-            success = self.call_url(url)
+            success = self.open_url(url)
             if success:
                 logger.info(f"Created todo: {title}")
             return success
+        except UnavailableError:
+            raise
         except RuntimeError as e:
             logger.error(f"Failed to create todo '{title}': {e}")
             return False
 
+    def run_json(
+        self,
+        data: List[Dict[str, Any]],
+        description: str = "items",
+        auth_token: Optional[str] = None
+    ) -> bool:
+        """Run a Things JSON command, creating or updating several items with one URL.
+        
+        Args:
+            data: Items in the Things JSON format
+            description: What the command does, for log messages
+            auth_token: Things URL scheme auth token, required for updates
+            
+        Returns:
+            True if successful, False otherwise
+            
+        Raises:
+            UnavailableError: If Things3 could not be reached
+        """
+        params = {"auth-token": auth_token, "data": json.dumps(data, separators=(",", ":"))}
+        url = self._build_url("things:///json", params)
+        
+        try:
+            success = self.open_url(url)
+            if success:
+                logger.info(f"Sent {description}")
+            return success
+        except UnavailableError:
+            raise
+        except RuntimeError as e:
+            logger.error(f"Failed to send {description}: {e}")
+            return False
+
     def _build_url(self, base_url: str, params: Dict[str, Any]) -> str:
         """Build a properly encoded x-callback-url.
         
@@ -164,5 +253,5 @@ class XCallbackHandler:
         else:
             url = base_url
             
-        logger.debug(f"Built URL: {url}")
+        logger.debug(f"Built URL: {redact_url(url)}")
         return url
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""Area → project → heading → todo tree for the ``view-hierarchy`` tool.
+
+Both backends (the Things3 database and AppleScript) produce the same flat
+rows, one per area, project, heading or open todo, and ``build_hierarchy``
+assembles them into a tree in a single pass.
+"""
+
+from typing import Any, Dict, Iterable, List
+
+from .models import Task
+
+# Row types, in the order their nodes are created
+ROW_TYPES = ("area", "project", "heading", "todo")
+
+
+def build_hierarchy(rows: Iterable[Dict[str, Any]], include_todos: bool = False) -> List[Dict[str, Any]]:
+    """Assemble flat rows into a tree.
+
+    Each row has a ``type`` (one of ``ROW_TYPES``), an ``id``, a ``title``
+    and the ``parent`` ID: the area of a project (empty if none), the project
+    of a heading, or the project or heading of a todo. A project row may
+    carry an ``open_count`` instead of a todo row per open todo.
+
+    Args:
+        rows: Rows in display order within each type
+        include_todos: Whether to attach the todos themselves, not only counts
+
+    Returns:
+        Areas, each with its projects, followed by an area with an empty ID
+        for projects outside any area (only if there are such projects).
+        Projects have ``open_count``, ``headings`` and ``todos``; headings
+        have ``open_count`` and ``todos``.
+    """
+    by_type: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in ROW_TYPES}
+    for row in rows:
+        if row.get("type") in by_type:
+            by_type[row["type"]].append(row)
+
+    areas: Dict[str, Dict[str, Any]] = {}
+    for row in by_type["area"]:
+        areas[row["id"]] = {"id": row["id"], "title": row.get("title") or "", "projects": []}
+    no_area = {"id": "", "title": "", "projects": []}
+
+    projects: Dict[str, Dict[str, Any]] = {}
+    counted = set()
+    for row in by_type["project"]:
+        project = {
+            "id": row["id"],
+            "title": row.get("title") or "",
+            "open_count": int(row.get("open_count") or 0),
+            "headings": [],
+            "todos": [],
+        }
+        if "open_count" in row:
+            counted.add(row["id"])
+        projects[row["id"]] = project
+        areas.get(row.get("parent") or "", no_area)["projects"].append(project)
+
+    headings: Dict[str, Dict[str, Any]] = {}
+    heading_project: Dict[str, Dict[str, Any]] = {}
+    for row in by_type["heading"]:
+        owner = projects.get(row.get("parent") or "")
+        if owner is None:
+            continue
+        heading = {"id": row["id"], "title": row.get("title") or "", "open_count": 0, "todos": []}
+        headings[row["id"]] = heading
+        heading_project[row["id"]] = owner
+        owner["headings"].append(heading)
+
+    for row in by_type["todo"]:
+        parent_id = row.get("parent") or ""
+        if parent_id in headings:
+            container = headings[parent_id]
+            project = heading_project[parent_id]
+            container["open_count"] += 1
+        elif parent_id in projects:
+            container = project = projects[parent_id]
+        else:
+            continue
+        if project["id"] not in counted:
+            project["open_count"] += 1
+        if include_todos:
+            container["todos"].append(Task(row["id"], row.get("title") or "", status="open"))
+
+    result = list(areas.values())
+    if no_area["projects"]:
+        result.append(no_area)
+    return result
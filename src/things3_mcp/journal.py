@@ -0,0 +1,310 @@
+"""Durable write-behind queue for Things3 mutations.
+
+Mutations are appended to a local SQLite journal and acknowledged right away.
+A background worker applies them to Things3 in order, in coalesced batches,
+retrying with exponential backoff. Entries are only marked applied after Things3 accepted
+them, so a restart resumes with whatever was still pending. Every mutation
+sets a property to a fixed value, so re-applying one that was in flight
+during a crash is harmless.
+"""
+
+import asyncio
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from .mutations import Mutation
+
+STATUS_PENDING = "pending"
+STATUS_APPLIED = "applied"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    value TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS operations_status ON operations (status, id);
+"""
+
+
+@dataclass
+class JournalEntry:
+    """A mutation recorded in the journal."""
+
+    op_id: int
+    mutation: Mutation
+    status: str
+    attempts: int
+    last_error: Optional[str]
+    created_at: float
+    next_attempt_at: float
+
+
+class MutationJournal:
+    """Ordered, durable log of mutations backed by SQLite."""
+
+    def __init__(self, path: Path) -> None:
+        """Open (and if needed create) the journal.
+
+        Args:
+            path: Location of the SQLite database file
+        """
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def append(self, mutation: Mutation) -> int:
+        """Append a mutation to the journal.
+
+        Args:
+            mutation: Mutation to record
+
+        Returns:
+            Operation ID of the new entry
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO operations (kind, task_id, value, status, created_at, updated_at, next_attempt_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (mutation.kind, mutation.task_id, json.dumps(mutation.value), STATUS_PENDING, now, now, now),
+            )
+            if cursor.lastrowid is None:
+                raise sqlite3.DatabaseError("Journal insert returned no row ID")
+            return cursor.lastrowid
+
+    def next_pending(self) -> Optional[JournalEntry]:
+        """Return the oldest pending entry, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM operations WHERE status = ? ORDER BY id LIMIT 1", (STATUS_PENDING,)
+            ).fetchone()
+        return self._to_entry(row) if row else None
+
+    def mark_applied(self, op_id: int) -> None:
+        """Record that an entry was applied to Things3."""
+        self._update(op_id, "status = ?, attempts = attempts + 1, last_error = NULL", (STATUS_APPLIED,))
+
+    def mark_retry(self, op_id: int, error: str, next_attempt_at: float) -> None:
+        """Record a failed attempt and when to try again."""
+        self._update(
+            op_id,
+            "attempts = attempts + 1, last_error = ?, next_attempt_at = ?",
+            (error, next_attempt_at),
+        )
+
+    def mark_failed(self, op_id: int, error: str) -> None:
+        """Record that an entry exhausted its retries."""
+        self._update(op_id, "status = ?, attempts = attempts + 1, last_error = ?", (STATUS_FAILED, error))
+
+    def get(self, op_id: int) -> Optional[JournalEntry]:
+        """Return a single entry by operation ID."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM operations WHERE id = ?", (op_id,)).fetchone()
+        return self._to_entry(row) if row else None
+
+    def entries(self, statuses: Sequence[str], limit: int = 50) -> List[JournalEntry]:
+        """Return entries with the given statuses, oldest first.
+
+        Args:
+            statuses: Statuses to include
+            limit: Maximum number of entries to return
+        """
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM operations WHERE status IN ({placeholders}) ORDER BY id LIMIT ?",
+                (*statuses, limit),
+            ).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of entries per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM operations GROUP BY status").fetchall()
+        counts = {STATUS_PENDING: 0, STATUS_APPLIED: 0, STATUS_FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def _update(self, op_id: int, assignments: str, params: Tuple[Any, ...]) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE operations SET {assignments}, updated_at = ? WHERE id = ?",
+                (*params, time.time(), op_id),
+            )
+
+    @staticmethod
+    def _to_entry(row: Tuple[Any, ...]) -> JournalEntry:
+        op_id, kind, task_id, value, status, attempts, last_error, created_at, _, next_attempt_at = row
+        return JournalEntry(
+            op_id=op_id,
+            mutation=Mutation(kind, task_id, json.loads(value)),
+            status=status,
+            attempts=attempts,
+            last_error=last_error,
+            created_at=created_at,
+            next_attempt_at=next_attempt_at,
+        )
+
+
+class WriteBehindQueue:
+    """Applies journaled mutations in the background, in order, with retries.
+    
+    Mutations that arrive together are gathered for ``coalesce_window``
+    seconds and applied as one batch, so a burst of edits costs a single
+    Apple Events round trip.
+    """
+
+    def __init__(
+        self,
+        journal: MutationJournal,
+        apply_batch: Callable[[List[Mutation]], List[bool]],
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        batch_size: int = 50,
+        coalesce_window: float = 0.0
+    ) -> None:
+        """Initialize the queue.
+
+        Args:
+            journal: Journal holding the mutations
+            apply_batch: Applies a list of mutations, returning one flag each
+            max_attempts: Attempts before an entry is marked failed
+            base_delay: Delay before the first retry, doubled on each attempt
+            max_delay: Upper bound for the retry delay
+            batch_size: Maximum number of entries applied together
+            coalesce_window: Seconds to wait for more mutations after waking up
+        """
+        self.journal = journal
+        self.apply_batch = apply_batch
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.batch_size = batch_size
+        self.coalesce_window = coalesce_window
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, mutation: Mutation) -> int:
+        """Journal a mutation for background application.
+
+        Args:
+            mutation: Mutation to apply
+
+        Returns:
+            Operation ID that can be looked up with ``mutation-status``
+        """
+        op_id = self.journal.append(mutation)
+        logger.info(f"Queued operation {op_id}: {mutation.describe()}")
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return op_id
+
+    def start(self) -> None:
+        """Start the background worker on the running event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        counts = self.journal.counts()
+        logger.info(f"Write-behind worker started with {counts[STATUS_PENDING]} pending operations")
+
+    async def stop(self) -> None:
+        """Stop the background worker. Pending entries stay in the journal."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def process_next(self) -> Optional[float]:
+        """Attempt the next batch of pending entries.
+
+        The batch is the run of due entries at the head of the journal; it
+        stops at the first entry still waiting for a retry so that order is
+        preserved.
+
+        Returns:
+            None if the journal has no pending entries, 0 after an attempt,
+            or the number of seconds until the oldest entry is due for retry
+        """
+        entries = self.journal.entries([STATUS_PENDING], limit=self.batch_size)
+        if not entries:
+            return None
+
+        now = time.time()
+        wait = entries[0].next_attempt_at - now
+        if wait > 0:
+            return wait
+
+        due = list(itertools.takewhile(lambda entry: entry.next_attempt_at <= now, entries))
+        try:
+            results = await asyncio.to_thread(self.apply_batch, [entry.mutation for entry in due])
+            errors = [None if success else "Things3 did not apply the change" for success in results]
+        except Exception as e:
+            errors = [str(e)] * len(due)
+
+        for entry, error in zip(due, errors):
+            self._record_attempt(entry, error)
+        return 0
+
+    def _record_attempt(self, entry: JournalEntry, error: Optional[str]) -> None:
+        if error is None:
+            self.journal.mark_applied(entry.op_id)
+            logger.info(f"Applied operation {entry.op_id}: {entry.mutation.describe()}")
+        elif entry.attempts + 1 >= self.max_attempts:
+            self.journal.mark_failed(entry.op_id, error)
+            logger.error(f"Operation {entry.op_id} failed after {entry.attempts + 1} attempts: {error}")
+        else:
+            delay = min(self.base_delay * 2 ** entry.attempts, self.max_delay)
+            self.journal.mark_retry(entry.op_id, error, time.time() + delay)
+            logger.warning(f"Operation {entry.op_id} failed, retrying in {delay:.1f}s: {error}")
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            wait = await self.process_next()
+            if wait == 0:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                continue
+            
+            # Woken by a new submission: let the rest of the burst arrive
+            if self.coalesce_window > 0:
+                await asyncio.sleep(self.coalesce_window)
@@ -0,0 +1,425 @@
+"""Load test that replays recorded MCP sessions against the server.
+
+A recorded session is a JSON Lines file with one JSON-RPC message per line,
+as a host sent them, or a JSON array of such messages. Requests are
+replayed in order. ``initialize`` and notifications are skipped, since
+every virtual client initializes its own session, and so are responses.
+
+The server under test is started with the simulated backend, or replaying
+a recording, unless a URL of a running server is given. Over stdio, every client gets its own server
+process, as every host does. Over HTTP, all clients share one server, which
+exercises the concurrency limit, caches and prefetching under contention.
+
+Run ``python -m things3_mcp.loadtest --help`` for the options.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import mcp.types as types
+from mcp import ClientSession
+
+# Result type of every request method that can be replayed
+RESULT_TYPES: Dict[str, Any] = {
+    "ping": types.EmptyResult,
+    "tools/list": types.ListToolsResult,
+    "tools/call": types.CallToolResult,
+    "resources/list": types.ListResourcesResult,
+    "resources/read": types.ReadResourceResult,
+    "resources/subscribe": types.EmptyResult,
+    "resources/unsubscribe": types.EmptyResult,
+}
+
+SAMPLE_SESSION = Path(__file__).parent / "sessions" / "agent.jsonl"
+
+
+def load_session(path: Path) -> List[Dict[str, Any]]:
+    """Read the requests of a recorded session.
+
+    Args:
+        path: JSON Lines file or JSON array of JSON-RPC messages
+
+    Returns:
+        Requests to replay, as ``{"method": ..., "params": ...}``
+
+    Raises:
+        ValueError: If the file contains a method that cannot be replayed
+    """
+    text = path.read_text(encoding="utf-8").strip()
+    if text.startswith("["):
+        messages = json.loads(text)
+    else:
+        messages = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    requests = []
+    for message in messages:
+        method = message.get("method")
+        if method is None or "id" not in message or method == "initialize":
+            continue
+        if method not in RESULT_TYPES:
+            raise ValueError(f"{path}: cannot replay method '{method}'")
+        requests.append({"method": method, "params": message.get("params")})
+    return requests
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class RateLimiter:
+    """Spaces request starts evenly across all clients."""
+
+    def __init__(self, rate: float) -> None:
+        """Initialize the limiter.
+
+        Args:
+            rate: Requests per second; 0 for no limit
+        """
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Wait until the next request may start."""
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.perf_counter()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        await asyncio.sleep(start - now)
+
+
+@dataclass
+class LoadReport:
+    """Latencies and errors collected during a run."""
+
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    duration: float = 0.0
+
+    def record(self, label: str, seconds: float, error: bool) -> None:
+        self.latencies.setdefault(label, []).append(seconds)
+        if error:
+            self.errors[label] = self.errors.get(label, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the run.
+
+        Returns:
+            Totals and, per method or tool, count, errors and p50/p99
+            latency in milliseconds
+        """
+        def stats(values: List[float], errors: int) -> Dict[str, Any]:
+            return {
+                "requests": len(values),
+                "errors": errors,
+                "p50_ms": round(percentile(values, 0.5) * 1000, 1),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 1),
+            }
+
+        everything = [value for values in self.latencies.values() for value in values]
+        total = stats(everything, sum(self.errors.values()))
+        total["duration_s"] = round(self.duration, 2)
+        total["throughput_rps"] = round(len(everything) / self.duration, 1) if self.duration else 0.0
+        total["by_request"] = {
+            label: stats(values, self.errors.get(label, 0))
+            for label, values in sorted(self.latencies.items())
+        }
+        return total
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Format a summary as a text table."""
+    lines = [
+        f"{summary['requests']} requests in {summary['duration_s']}s "
+        f"({summary['throughput_rps']} req/s), {summary['errors']} errors",
+        f"p50 {summary['p50_ms']} ms, p99 {summary['p99_ms']} ms",
+        "",
+        f"{'request':<32}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}",
+    ]
+    for label, stats in summary["by_request"].items():
+        lines.append(
+            f"{label:<32}{stats['requests']:>8}{stats['errors']:>8}{stats['p50_ms']:>10}{stats['p99_ms']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def _is_error(result: Any) -> bool:
+    """Whether a tool result reports a failure."""
+    if not isinstance(result, types.CallToolResult):
+        return False
+    if result.isError:
+        return True
+    text = next((item.text for item in result.content if isinstance(item, types.TextContent)), "")
+    return text.startswith("Error")
+
+
+def server_environment(
+    latency_ms: float, replay: Optional[Path] = None, keep_latency: bool = False
+) -> Dict[str, str]:
+    """Environment for a server process under test.
+
+    Args:
+        latency_ms: Latency of the simulated backend
+        replay: Recording to replay instead of simulating Things3
+        keep_latency: Whether replayed calls take as long as recorded
+
+    Returns:
+        Environment variables
+    """
+    environ = dict(os.environ)
+    environ["THINGS3_MCP_USE_DAEMON"] = "0"
+    if replay is not None:
+        environ.update({
+            "THINGS3_MCP_BACKEND": "replay",
+            "THINGS3_MCP_RECORDING": str(replay.resolve()),
+            "THINGS3_MCP_REPLAY_LATENCY": "1" if keep_latency else "0",
+        })
+    else:
+        environ.update({
+            "THINGS3_MCP_BACKEND": "simulated",
+            "THINGS3_MCP_SIMULATED_LATENCY_MS": str(latency_ms),
+        })
+    return environ
+
+
+@asynccontextmanager
+async def http_server(environment: Dict[str, str], max_concurrency: Optional[int] = None) -> AsyncIterator[str]:
+    """Run a server over HTTP in a child process.
+
+    Yields:
+        URL of the MCP endpoint
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    command = [sys.executable, "-m", "things3_mcp.server", "--transport", "http", "--port", str(port)]
+    if max_concurrency:
+        command += ["--max-concurrency", str(max_concurrency)]
+    process = subprocess.Popen(
+        command,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(200):
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                    break
+            except OSError:
+                if process.poll() is not None:
+                    raise RuntimeError("Server under test exited during startup")
+                await asyncio.sleep(0.05)
+        else:
+            raise RuntimeError("Server under test did not start listening")
+        yield f"http://127.0.0.1:{port}/mcp/"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+@asynccontextmanager
+async def connect(
+    transport: str,
+    url: Optional[str],
+    environment: Dict[str, str],
+    max_concurrency: Optional[int] = None
+) -> AsyncIterator[ClientSession]:
+    """Open an initialized client session.
+
+    Args:
+        transport: ``stdio`` (a server process per session) or ``http``
+        url: MCP endpoint for HTTP
+        environment: Environment of spawned stdio servers
+        max_concurrency: Tool-call limit for spawned stdio servers
+
+    Raises:
+        ValueError: If ``http`` is used without a URL
+    """
+    if transport == "http":
+        from mcp.client.streamable_http import streamablehttp_client
+
+        if url is None:
+            raise ValueError("An MCP endpoint URL is required for the http transport")
+
+        async with streamablehttp_client(url) as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+        return
+
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+
+    args = ["-m", "things3_mcp.server"]
+    if max_concurrency:
+        args += ["--max-concurrency", str(max_concurrency)]
+    parameters = StdioServerParameters(command=sys.executable, args=args, env=environment)
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(parameters, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+
+
+async def replay_session(
+    session: ClientSession,
+    requests: List[Dict[str, Any]],
+    limiter: RateLimiter,
+    report: LoadReport
+) -> None:
+    """Send the requests of one recorded session and record their latency."""
+    for request in requests:
+        method = request["method"]
+        label = method
+        if method == "tools/call":
+            label = request["params"]["name"]
+        message = types.ClientRequest.model_validate(
+            {"method": method, "params": request["params"]} if request["params"] else {"method": method}
+        )
+
+        await limiter.wait()
+        started = time.perf_counter()
+        try:
+            result = await session.send_request(message, RESULT_TYPES[method])
+            error = _is_error(result)
+        except Exception:
+            error = True
+        report.record(label, time.perf_counter() - started, error)
+
+
+async def run_load(
+    sessions: List[List[Dict[str, Any]]],
+    transport: str = "stdio",
+    concurrency: int = 4,
+    rate: float = 0.0,
+    repeat: int = 1,
+    url: Optional[str] = None,
+    latency_ms: float = 50.0,
+    max_concurrency: Optional[int] = None,
+    replay: Optional[Path] = None,
+    keep_latency: bool = False
+) -> LoadReport:
+    """Replay recorded sessions from concurrent clients.
+
+    Each client connects once and replays every session ``repeat`` times,
+    starting at a different session so that clients do not move in lockstep.
+
+    Args:
+        sessions: Requests of each recorded session
+        transport: ``stdio`` or ``http``
+        concurrency: Number of concurrent clients
+        rate: Requests per second across all clients; 0 for no limit
+        repeat: Times each client replays the sessions
+        url: MCP endpoint of a running server (HTTP only); a simulated
+            server is started when omitted
+        latency_ms: Simulated backend latency for started servers
+        max_concurrency: Tool-call limit for started servers
+        replay: Recording that started servers replay instead of
+            simulating Things3
+        keep_latency: Whether replayed calls take as long as recorded
+
+    Returns:
+        Collected latencies and errors
+    """
+    report = LoadReport()
+    limiter = RateLimiter(rate)
+    environment = server_environment(latency_ms, replay, keep_latency)
+
+    async def client(index: int, endpoint: Optional[str]) -> None:
+        async with connect(transport, endpoint, environment, max_concurrency) as session:
+            for round_number in range(repeat):
+                for offset in range(len(sessions)):
+                    requests = sessions[(index + round_number + offset) % len(sessions)]
+                    await replay_session(session, requests, limiter, report)
+
+    async def run_clients(endpoint: Optional[str]) -> None:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(index, endpoint) for index in range(concurrency)))
+        report.duration = time.perf_counter() - started
+
+    if transport == "http" and url is None:
+        async with http_server(environment, max_concurrency) as endpoint:
+            await run_clients(endpoint)
+    else:
+        await run_clients(url)
+    return report
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="things3-mcp-loadtest", description="Replay recorded MCP sessions against the server"
+    )
+    parser.add_argument(
+        "sessions",
+        nargs="*",
+        type=Path,
+        help="Recorded sessions (JSON Lines of JSON-RPC messages); defaults to a sample agent session",
+    )
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--url", help="MCP endpoint of a running HTTP server instead of a simulated one")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent clients (default: 4)")
+    parser.add_argument("--rate", type=float, default=0.0, help="Requests per second, 0 for unlimited (default)")
+    parser.add_argument("--repeat", type=int, default=1, help="Times each client replays the sessions")
+    parser.add_argument(
+        "--latency-ms", type=float, default=50.0, help="Simulated backend latency in ms (default: 50)"
+    )
+    parser.add_argument("--max-concurrency", type=int, help="Tool-call limit of the started servers")
+    parser.add_argument(
+        "--replay", type=Path, help="Serve Things3 from a recording (THINGS3_MCP_BACKEND=record) instead"
+    )
+    parser.add_argument(
+        "--keep-latency", action="store_true", help="Replay calls with their recorded latency"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Entry point of the load test."""
+    args = parse_args()
+    paths = args.sessions or [SAMPLE_SESSION]
+    sessions = [load_session(path) for path in paths]
+
+    report = asyncio.run(run_load(
+        sessions,
+        transport=args.transport,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        repeat=args.repeat,
+        url=args.url,
+        latency_ms=args.latency_ms,
+        max_concurrency=args.max_concurrency,
+        replay=args.replay,
+        keep_latency=args.keep_latency,
+    ))
+    summary = report.summary()
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+    if summary["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
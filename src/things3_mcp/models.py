@@ -0,0 +1,162 @@
+"""Compact in-memory representation of Things3 todos."""
+
+import sys
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+# A date as parsed from script output. Values the parser does not understand
+# (e.g. locale-formatted dates) are kept as the original text.
+DateValue = Union[date, str, None]
+
+# Shared tag tuples, so todos with the same tags reference one tuple
+_tag_tuples: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def intern_text(value: Optional[str]) -> str:
+    """Intern a short, frequently repeated string such as a tag or project name."""
+    return sys.intern(value) if value else ""
+
+
+def intern_tags(tags: Union[str, Iterable[str], None]) -> Tuple[str, ...]:
+    """Split and intern a tag list.
+
+    Args:
+        tags: Comma-joined tag names as returned by Things3, or an iterable
+
+    Returns:
+        Shared tuple of interned tag names
+    """
+    if not tags:
+        return ()
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    key = tuple(sys.intern(tag.strip()) for tag in tags if tag.strip())
+    return _tag_tuples.setdefault(key, key)
+
+
+def parse_date(value: Optional[str]) -> DateValue:
+    """Parse a date from script output once, at decode time.
+
+    Args:
+        value: Date text, ideally starting with ``YYYY-MM-DD``
+
+    Returns:
+        The date, None for an empty value, or the original text if it is not
+        in ISO format
+    """
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return sys.intern(value)
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp such as ``2026-10-19T08:30:00``.
+
+    Args:
+        value: Timestamp text
+
+    Returns:
+        The timestamp, or None if the value is empty or not ISO formatted
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+class Task:
+    """A Things3 todo.
+
+    Uses ``__slots__`` instead of a per-instance dict and interns the tag,
+    project, area and status strings, which repeat across most todos. A
+    50k-todo result set takes a fraction of the memory of the equivalent
+    list of dicts (see ``tests/test_models.py``).
+    """
+
+    __slots__ = (
+        "id", "title", "notes", "due_date", "when", "tags", "project", "area", "status", "completed_at"
+    )
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        notes: str = "",
+        due_date: DateValue = None,
+        when: DateValue = None,
+        tags: Tuple[str, ...] = (),
+        project: str = "",
+        area: str = "",
+        status: str = "",
+        completed_at: Optional[datetime] = None,
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.notes = notes
+        self.due_date = due_date
+        self.when = when
+        self.tags = tags
+        self.project = project
+        self.area = area
+        self.status = status
+        self.completed_at = completed_at
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        """Build a task from a decoded script result.
+
+        Args:
+            data: Dictionary with the keys emitted by the scripts
+
+        Returns:
+            Task with parsed dates and interned names
+        """
+        return cls(
+            id=data.get("id") or "",
+            title=data.get("title") or "",
+            notes=data.get("notes") or "",
+            due_date=parse_date(data.get("due_date")),
+            when=parse_date(data.get("when")),
+            tags=intern_tags(data.get("tags")),
+            project=intern_text(data.get("project")),
+            area=intern_text(data.get("area")),
+            status=intern_text(data.get("status")),
+            completed_at=parse_datetime(data.get("completed_at")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the task as a JSON-serializable dictionary."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "notes": self.notes,
+            "due_date": format_date(self.due_date),
+            "when": format_date(self.when),
+            "tags": list(self.tags),
+            "project": self.project,
+            "area": self.area,
+            "status": self.status,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else "",
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Task):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Task(id={self.id!r}, title={self.title!r})"
+
+
+def format_date(value: DateValue) -> str:
+    """Format a parsed date for output (empty string when unset)."""
+    if value is None:
+        return ""
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
@@ -0,0 +1,183 @@
+"""Mutation records shared by the synchronous and write-behind write paths."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .handlers import AppleScriptHandler
+
+# Mutation kinds, mapped to the AppleScriptHandler method that applies them
+# one at a time. Each method takes the task ID and the mutation value.
+MUTATION_METHODS: Dict[str, str] = {
+    "assign_project": "assign_project",
+    "assign_area": "assign_area",
+    "set_tags": "set_tags",
+    "rename_task": "rename_task",
+}
+
+# Field written by each kind in a batched ``apply_changes`` run
+_FIELDS: Dict[str, str] = {
+    "assign_project": "project",
+    "assign_area": "area",
+    "set_tags": "tags",
+    "rename_task": "name",
+}
+
+# Writes to the same slot of the same todo supersede each other. A todo lives
+# in either a project or an area, so both assignments share one slot.
+_SLOTS: Dict[str, str] = {
+    "assign_project": "container",
+    "assign_area": "container",
+    "set_tags": "tags",
+    "rename_task": "name",
+}
+
+
+@dataclass
+class Mutation:
+    """A single change to one todo, addressed by Things ID."""
+
+    kind: str
+    task_id: str
+    value: Any
+
+    def __post_init__(self) -> None:
+        if self.kind not in MUTATION_METHODS:
+            raise ValueError(f"Unknown mutation kind: {self.kind}")
+
+    def describe(self) -> str:
+        """Human-readable summary used in tool responses and logs."""
+        if self.kind == "set_tags":
+            return f"set tags [{', '.join(self.value)}] on task {self.task_id}"
+        if self.kind == "rename_task":
+            return f"rename task {self.task_id} to '{self.value}'"
+        target = self.kind.split("_", 1)[1]
+        return f"assign {target} '{self.value}' to task {self.task_id}"
+
+
+def apply_mutation(handler: AppleScriptHandler, mutation: Mutation) -> bool:
+    """Apply a mutation through the AppleScript handler.
+
+    Args:
+        handler: Handler used to run the mutation script
+        mutation: Mutation to apply
+
+    Returns:
+        True if successful, False otherwise
+    """
+    method = getattr(handler, MUTATION_METHODS[mutation.kind])
+    return bool(method(mutation.task_id, mutation.value))
+
+
+def coalesce(mutations: List[Mutation]) -> Tuple[List[Mutation], List[int]]:
+    """Drop writes that a later write to the same todo and slot overrides.
+
+    The surviving mutations are grouped by todo (in order of first
+    appearance), and within a todo ordered by when they were issued, so
+    applying them gives the same end state as applying every input in order.
+
+    Args:
+        mutations: Mutations in the order they were issued
+
+    Returns:
+        Tuple of the surviving mutations and, for each input, the index of
+        the surviving mutation whose result it shares
+    """
+    latest: Dict[Tuple[str, str], int] = {}
+    target_order: Dict[str, int] = {}
+    for index, mutation in enumerate(mutations):
+        latest[(mutation.task_id, _SLOTS[mutation.kind])] = index
+        target_order.setdefault(mutation.task_id, len(target_order))
+
+    keys = sorted(latest, key=lambda key: (target_order[key[0]], latest[key]))
+    survivors = [mutations[latest[key]] for key in keys]
+    position = {latest[key]: n for n, key in enumerate(keys)}
+    owners = [position[latest[(m.task_id, _SLOTS[m.kind])]] for m in mutations]
+    return survivors, owners
+
+
+def apply_mutations(handler: AppleScriptHandler, mutations: List[Mutation]) -> List[bool]:
+    """Coalesce mutations and apply them in one script run.
+
+    Args:
+        handler: Handler used to run the batch script
+        mutations: Mutations in the order they were issued
+
+    Returns:
+        Success flag for each input mutation; superseded mutations report
+        the result of the write that replaced them
+    """
+    if not mutations:
+        return []
+
+    survivors, owners = coalesce(mutations)
+    if len(survivors) < len(mutations):
+        logger.debug(f"Coalesced {len(mutations)} mutations into {len(survivors)} writes")
+
+    changes = []
+    for mutation in survivors:
+        value = ",".join(mutation.value) if mutation.kind == "set_tags" else str(mutation.value)
+        changes.append((mutation.task_id, _FIELDS[mutation.kind], value))
+
+    results = handler.apply_changes(changes)
+    return [results[owner] for owner in owners]
+
+
+class MutationBatcher:
+    """Gathers mutations over a short window and applies them as one batch.
+
+    The first submission opens a window; everything submitted before it
+    closes is coalesced and applied in a single Apple Events round trip.
+    Batches are applied one at a time so they reach Things3 in order.
+    """
+
+    def __init__(self, apply_batch: Callable[[List[Mutation]], List[bool]], window: float) -> None:
+        """Initialize the batcher.
+
+        Args:
+            apply_batch: Applies a list of mutations, returning one flag each
+            window: Seconds to gather mutations before applying them
+        """
+        self.apply_batch = apply_batch
+        self.window = window
+        self._pending: List[Tuple[Mutation, "asyncio.Future[bool]"]] = []
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+        self._apply_lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of mutations waiting for the current window to close."""
+        return len(self._pending)
+
+    async def submit(self, mutation: Mutation) -> bool:
+        """Add a mutation to the current batch and wait for its result.
+
+        Args:
+            mutation: Mutation to apply
+
+        Returns:
+            True if successful, False otherwise
+        """
+        future: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+        self._pending.append((mutation, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+
+        async with self._apply_lock:
+            try:
+                results = await asyncio.to_thread(self.apply_batch, [m for m, _ in batch])
+            except Exception as e:
+                logger.error(f"Failed to apply batch of {len(batch)} mutations: {e}")
+                results = [False] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
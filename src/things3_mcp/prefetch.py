@@ -0,0 +1,217 @@
+"""Background warmup and predictive prefetch of read-only tool results.
+
+The first ``view-today`` or ``view-projects`` of a session would otherwise
+pay a full script run, and agents tend to repeat the same sequences of
+calls. The ``Prefetcher`` runs the configured tools in the background at
+startup, learns which call usually follows which, and runs the likely next
+call while the agent is still thinking. A prefetched result is served once,
+if it is still fresh, and every call to a tool in ``WRITE_TOOLS`` discards
+them all.
+"""
+
+import asyncio
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+# Tools whose results only depend on their arguments and Things3 data
+PREFETCHABLE_TOOLS = frozenset({
+    "view-inbox",
+    "view-today",
+    "view-anytime",
+    "view-someday",
+    "view-projects",
+    "view-areas",
+    "view-hierarchy",
+    "view-project",
+    "query-todos",
+})
+
+# Tools that change Things3 data. Reads outside PREFETCHABLE_TOOLS (logbook,
+# selection, health, mutation status) leave prefetched results alone, so a
+# new write tool must be added here.
+WRITE_TOOLS = frozenset({
+    "create-todo",
+    "create-project",
+    "assign-project",
+    "assign-area",
+    "set-tags",
+    "rename-task",
+    "update-todos",
+    "complete-todos",
+    "complete-selected",
+    "reschedule-todos",
+})
+
+CallKey = Tuple[str, str]
+Fetch = Callable[[str, Dict[str, Any]], Awaitable[List[Any]]]
+
+
+@dataclass
+class _Entry:
+    """A prefetched result, or one still being fetched."""
+
+    task: "asyncio.Task[List[Any]]"
+    created_at: float = field(default_factory=time.monotonic)
+    started: bool = False
+
+
+def call_key(name: str, arguments: Dict[str, Any]) -> CallKey:
+    """Key identifying a tool call by name and canonical arguments."""
+    return name, json.dumps(arguments, sort_keys=True, default=str)
+
+
+class Prefetcher:
+    """Warms up and predicts read-only tool calls.
+
+    Call sequences are learned across all sessions of the server: after a
+    call, the call that most often followed it is prefetched once it has
+    been seen ``min_count`` times and accounts for at least half of what
+    followed.
+    """
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        ttl: float = 10.0,
+        min_count: int = 2,
+        slots: Optional[asyncio.Semaphore] = None
+    ) -> None:
+        """Initialize the prefetcher.
+
+        Args:
+            fetch: Runs a tool call and returns its result
+            ttl: Seconds a prefetched result may be served; 0 disables prefetching
+            min_count: Times a sequence must be seen before it is predicted
+            slots: Tool-call limit that background fetches share with clients
+        """
+        self.fetch = fetch
+        self.ttl = ttl
+        self.min_count = min_count
+        self.slots = slots if slots is not None else asyncio.Semaphore(1)
+        self._entries: Dict[CallKey, _Entry] = {}
+        self._transitions: Dict[CallKey, Counter[CallKey]] = {}
+        self._last_key: Optional[CallKey] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters for status reporting."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "pending": len(self._entries),
+            "learned_sequences": sum(len(counts) for counts in self._transitions.values()),
+        }
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> List[Any]:
+        """Run a tool call, serving a prefetched result when there is one.
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+
+        Returns:
+            Tool result
+        """
+        key = call_key(name, arguments)
+        self._learn(key)
+
+        if name in WRITE_TOOLS:
+            self.invalidate()
+        if name not in PREFETCHABLE_TOOLS:
+            return await self.fetch(name, arguments)
+
+        result = await self._take(key)
+        if result is None:
+            self.misses += 1
+            result = await self.fetch(name, arguments)
+        else:
+            self.hits += 1
+            logger.debug(f"Served {name} from prefetch")
+
+        self._predict(key)
+        return result
+
+    async def _take(self, key: CallKey) -> Optional[List[Any]]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created_at > self.ttl:
+            entry.task.cancel()
+            return None
+        if not entry.started:
+            # Still waiting for a tool slot, which the caller may hold itself
+            entry.task.cancel()
+            return None
+        try:
+            return await asyncio.shield(entry.task)
+        except Exception as e:
+            logger.debug(f"Prefetch of {key[0]} failed: {e}")
+            return None
+
+    def _learn(self, key: CallKey) -> None:
+        if self._last_key is not None:
+            self._transitions.setdefault(self._last_key, Counter())[key] += 1
+        self._last_key = key
+
+    def _predict(self, key: CallKey) -> None:
+        counts = self._transitions.get(key)
+        if not counts:
+            return
+        (next_key, count), = counts.most_common(1)
+        if count >= self.min_count and count * 2 >= sum(counts.values()):
+            self.schedule(next_key[0], json.loads(next_key[1]))
+
+    def schedule(self, name: str, arguments: Dict[str, Any]) -> None:
+        """Start fetching a tool result in the background.
+
+        Args:
+            name: Tool name (ignored unless it is prefetchable)
+            arguments: Tool arguments
+        """
+        if not self.enabled or name not in PREFETCHABLE_TOOLS:
+            return
+        key = call_key(name, arguments)
+        if key in self._entries:
+            return
+
+        entry = _Entry(task=None)  # type: ignore[arg-type]
+
+        async def run() -> List[Any]:
+            async with self.slots:
+                entry.started = True
+                return await self.fetch(name, arguments)
+
+        entry.task = asyncio.create_task(run())
+        self._entries[key] = entry
+        logger.debug(f"Prefetching {name}")
+
+    def warm(self, names: Iterable[str]) -> None:
+        """Prefetch tools that take no arguments, such as at startup.
+
+        Args:
+            names: Tool names
+        """
+        for name in names:
+            self.schedule(name, {})
+
+    def invalidate(self) -> None:
+        """Discard all prefetched results."""
+        for entry in self._entries.values():
+            entry.task.cancel()
+        self._entries.clear()
+
+    async def stop(self) -> None:
+        """Cancel background fetches."""
+        tasks = [entry.task for entry in self._entries.values()]
+        self.invalidate()
+        await asyncio.gather(*tasks, return_exceptions=True)
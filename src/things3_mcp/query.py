@@ -0,0 +1,445 @@
+"""Todo filters for the ``query-todos`` tool.
+
+A ``TodoQuery`` is pushed down into Things3 as an AppleScript ``whose``
+clause, so only matching todos are fetched and serialized. The generated
+script depends only on which filters are set: the filter values are passed
+through ``argv``, which keeps user input out of the script source and lets
+every filter combination be compiled once and cached.
+
+``LogbookCursor`` is the resume position for paging through the Logbook.
+"""
+
+import base64
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import Task
+
+# Lists that can be queried by name
+LISTS = ("Inbox", "Today", "Anytime", "Upcoming", "Someday", "Logbook")
+
+STATUSES = ("open", "completed", "canceled")
+
+_RELATIVE_DATE = re.compile(r"^([+-]\d+)d$")
+
+_NAMED_DATES = {"yesterday": -1, "today": 0, "tomorrow": 1}
+
+# Container filters, in the order they are preferred as the todo source.
+# The first one set is used to fetch todos; the rest become predicates.
+_CONTAINERS = ("list", "project", "area", "tag")
+
+
+def parse_date(value: str, today: Optional[date] = None) -> date:
+    """Parse a date filter value.
+
+    Args:
+        value: ``YYYY-MM-DD``, ``today``, ``tomorrow``, ``yesterday`` or a
+            relative offset in days such as ``+7d`` or ``-1d``
+        today: Reference date for relative values (defaults to today)
+
+    Returns:
+        Parsed date
+
+    Raises:
+        ValueError: If the value is not in a supported format
+    """
+    if today is None:
+        today = date.today()
+
+    text = value.strip().lower()
+    if text in _NAMED_DATES:
+        return today + timedelta(days=_NAMED_DATES[text])
+
+    match = _RELATIVE_DATE.match(text)
+    if match:
+        return today + timedelta(days=int(match.group(1)))
+
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise ValueError(
+            f"Invalid date '{value}': use YYYY-MM-DD, today, tomorrow, yesterday or +Nd/-Nd"
+        )
+
+
+def parse_timestamp(value: str, today: Optional[date] = None) -> datetime:
+    """Parse a ``since`` value: an ISO timestamp or any ``parse_date`` format.
+
+    Args:
+        value: ``YYYY-MM-DDTHH:MM[:SS]`` or a date accepted by ``parse_date``
+            (which means midnight of that day)
+        today: Reference date for relative values
+
+    Returns:
+        Parsed timestamp
+
+    Raises:
+        ValueError: If the value is not in a supported format
+    """
+    text = value.strip()
+    if len(text) > 10 and text[10] in "Tt ":
+        try:
+            return datetime.fromisoformat(text).replace(microsecond=0)
+        except ValueError:
+            raise ValueError(f"Invalid timestamp '{value}': use YYYY-MM-DDTHH:MM:SS")
+    return datetime.combine(parse_date(value, today), datetime.min.time())
+
+
+@dataclass
+class LogbookCursor:
+    """Position in the Logbook after the last item returned.
+
+    Things3 stores completion times to the second, so several todos can share
+    the cursor timestamp. Their IDs are kept so that the next page, which
+    starts at that same second, can skip them.
+    """
+
+    completed_at: datetime
+    seen: List[str] = field(default_factory=list)
+
+    @classmethod
+    def after(cls, tasks: List[Task]) -> Optional["LogbookCursor"]:
+        """Build the cursor following a page of tasks, oldest first.
+
+        Args:
+            tasks: Page of completed tasks
+
+        Returns:
+            Cursor after the last task, or None if no task has a completion
+            time
+        """
+        completed = [task for task in tasks if task.completed_at is not None]
+        if not completed:
+            return None
+        last = completed[-1].completed_at
+        assert last is not None
+        return cls(last, [task.id for task in completed if task.completed_at == last])
+
+    def encode(self) -> str:
+        """Return the cursor as an opaque, URL-safe token."""
+        data = json.dumps({"t": self.completed_at.isoformat(), "ids": self.seen}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "LogbookCursor":
+        """Parse a token produced by ``encode``.
+
+        Args:
+            token: Cursor token
+
+        Returns:
+            Decoded cursor
+
+        Raises:
+            ValueError: If the token is malformed
+        """
+        try:
+            padded = token.strip() + "=" * (-len(token.strip()) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            seen = data["ids"]
+            if not isinstance(seen, list) or not all(isinstance(item, str) for item in seen):
+                raise TypeError("ids must be a list of strings")
+            return cls(datetime.fromisoformat(data["t"]), seen)
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"Invalid cursor: {e}")
+
+
+class ScriptArgs:
+    """Values passed to a generated script through ``argv``.
+
+    Each bound value gets a variable named after its position, so the script
+    source depends only on which values are bound, not on what they are.
+    """
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._assignments: List[str] = []
+
+    def bind(self, value: str, as_date: bool = False) -> str:
+        """Pass a value to the script.
+
+        Args:
+            value: Value to pass
+            as_date: Whether the script should turn it into a date with ``isoDate``
+
+        Returns:
+            Name of the script variable holding the value
+        """
+        self.values.append(value)
+        name = f"arg{len(self.values)}"
+        item = f"item {len(self.values)} of argv"
+        self._assignments.append(f"set {name} to my isoDate({item})" if as_date else f"set {name} to {item}")
+        return name
+
+    def assignments(self) -> str:
+        """Statements that set the script variables, indented for ``on run``."""
+        return "\n".join(f"    {line}" for line in self._assignments)
+
+
+@dataclass
+class TodoQuery:
+    """Filters for a todo query. Unset filters match everything."""
+
+    list: Optional[str] = None
+    project: Optional[str] = None
+    area: Optional[str] = None
+    tag: Optional[str] = None
+    due_from: Optional[date] = None
+    due_to: Optional[date] = None
+    when_from: Optional[date] = None
+    when_to: Optional[date] = None
+    status: str = "open"
+    text: Optional[str] = None
+    limit: int = 100
+
+    def __post_init__(self) -> None:
+        if self.list is not None and self.list not in LISTS:
+            raise ValueError(f"Unknown list '{self.list}', expected one of: {', '.join(LISTS)}")
+        if self.status not in STATUSES:
+            raise ValueError(f"Unknown status '{self.status}', expected one of: {', '.join(STATUSES)}")
+        if self.limit < 1:
+            raise ValueError("limit must be at least 1")
+
+    @classmethod
+    def from_arguments(cls, arguments: Dict[str, Any], today: Optional[date] = None) -> "TodoQuery":
+        """Build a query from tool arguments.
+
+        Args:
+            arguments: ``query-todos`` tool arguments
+            today: Reference date for relative date values
+
+        Returns:
+            Validated query
+
+        Raises:
+            ValueError: If an argument is invalid
+        """
+        dates = {
+            key: parse_date(arguments[key], today)
+            for key in ("due_from", "due_to", "when_from", "when_to")
+            if arguments.get(key)
+        }
+        if arguments.get("overdue"):
+            yesterday = parse_date("yesterday", today)
+            dates["due_to"] = min(dates.get("due_to", yesterday), yesterday)
+        return cls(
+            list=arguments.get("list") or None,
+            project=arguments.get("project") or None,
+            area=arguments.get("area") or None,
+            tag=arguments.get("tag") or None,
+            status=arguments.get("status") or "open",
+            text=arguments.get("text") or None,
+            limit=int(arguments.get("limit", 100)),
+            **dates,
+        )
+
+    @property
+    def source(self) -> Optional[str]:
+        """Container filter used to fetch todos, or None to scan all todos."""
+        for name in _CONTAINERS:
+            if getattr(self, name) is not None:
+                return name
+        return None
+
+    @property
+    def date_only(self) -> bool:
+        """Whether the query filters open todos by date and nothing else.
+
+        Such queries can be answered from the date index without running a
+        script.
+        """
+        has_dates = any(
+            value is not None for value in (self.due_from, self.due_to, self.when_from, self.when_to)
+        )
+        return has_dates and self.status == "open" and self.source is None and self.text is None
+
+    def matches_dates(self, todo: Task) -> bool:
+        """Check the date range filters against a todo's parsed dates.
+
+        Args:
+            todo: Todo with ISO-parsed dates
+
+        Returns:
+            True if every date filter that is set is satisfied
+        """
+        for value, start, end in (
+            (todo.due_date, self.due_from, self.due_to),
+            (todo.when, self.when_from, self.when_to),
+        ):
+            if start is None and end is None:
+                continue
+            if not isinstance(value, date):
+                return False
+            if (start is not None and value < start) or (end is not None and value > end):
+                return False
+        return True
+
+    def whose_clause(self, script: "ScriptArgs") -> Tuple[str, str]:
+        """Build the todo container and ``whose`` predicates for the query.
+
+        Every filter is evaluated by Things3: the preferred container is the
+        source, and the other container filters become predicates, so a
+        script's ``maxCount`` only ever cuts off matching todos.
+
+        Args:
+            script: Argument list that filter values are bound to
+
+        Returns:
+            Tuple of the container and the predicates joined with ``and``
+        """
+        source = self.source
+        if source is None:
+            container = "to dos"
+        else:
+            container = f"to dos of {source} {script.bind(getattr(self, source))}"
+
+        predicates = [f"status is {self.status}"]
+        for name in ("project", "area"):
+            value = getattr(self, name)
+            if value is not None and source != name:
+                predicates.append(f"({name} is not missing value and name of {name} is {script.bind(value)})")
+        if self.tag is not None and source != "tag":
+            tag = script.bind(self.tag)
+            # Things3 joins tag names with ", "; match whole names only
+            predicates.append(
+                f"(tag names is {tag} or tag names starts with ({tag} & \", \") or "
+                f"tag names ends with (\", \" & {tag}) or tag names contains (\", \" & {tag} & \", \"))"
+            )
+        for prop, start, end in (
+            ("due date", self.due_from, self.due_to),
+            ("activation date", self.when_from, self.when_to),
+        ):
+            if start is not None:
+                predicates.append(f"{prop} >= {script.bind(start.isoformat(), as_date=True)}")
+            if end is not None:
+                next_day = end + timedelta(days=1)
+                predicates.append(f"{prop} < {script.bind(next_day.isoformat(), as_date=True)}")
+        if self.text is not None:
+            value = script.bind(self.text)
+            predicates.append(f"(name contains {value} or notes contains {value})")
+        return container, " and ".join(predicates)
+
+    def to_applescript(self) -> Tuple[str, List[str]]:
+        """Translate the query into an AppleScript ``on run argv`` handler.
+
+        The handler expects the ``jsonEscape``, ``isoDate`` and
+        ``isoDateText`` handlers from ``utils.applescript`` to be part of the
+        same script.
+
+        Returns:
+            Tuple of the handler source and the argv values to run it with
+        """
+        script = ScriptArgs()
+        container, predicates = self.whose_clause(script)
+        limit = script.bind(str(self.limit))
+        source = _QUERY_TEMPLATE.format(
+            assignments=script.assignments(),
+            container=container,
+            predicates=predicates,
+            limit=limit,
+        )
+        return source, script.values
+
+    def matches(self, todo: Task) -> bool:
+        """Check the container filters against a todo, case-sensitively.
+
+        AppleScript compares text ignoring case, so the ``whose`` clause can
+        return todos whose project, area or tag differs only in case.
+
+        Args:
+            todo: Todo returned by the query script
+
+        Returns:
+            True if the todo satisfies every container filter
+        """
+        source = self.source
+        if self.project is not None and source != "project" and todo.project != self.project:
+            return False
+        if self.area is not None and source != "area" and todo.area != self.area:
+            return False
+        if self.tag is not None and source != "tag" and self.tag not in todo.tags:
+            return False
+        return True
+
+
+_QUERY_TEMPLATE = """
+on run argv
+{assignments}
+    set maxCount to {limit} as integer
+    tell application "Things3"
+        set matches to ({container} whose {predicates})
+        set matchCount to count of matches
+        if matchCount > maxCount then set matchCount to maxCount
+        set tasksJSON to "["
+
+        repeat with i from 1 to matchCount
+            set t to item i of matches
+            set taskId to id of t
+            set taskTitle to my jsonEscape(name of t)
+
+            set taskNotes to ""
+            try
+                set taskNotes to notes of t
+                if taskNotes is missing value then
+                    set taskNotes to ""
+                else
+                    set taskNotes to my jsonEscape(taskNotes)
+                end if
+            end try
+
+            set dueDate to ""
+            try
+                set dueDate to due date of t
+                if dueDate is missing value then
+                    set dueDate to ""
+                else
+                    set dueDate to my isoDateText(dueDate)
+                end if
+            end try
+
+            set whenDate to ""
+            try
+                set whenDate to activation date of t
+                if whenDate is missing value then
+                    set whenDate to ""
+                else
+                    set whenDate to my isoDateText(whenDate)
+                end if
+            end try
+
+            set tagText to ""
+            try
+                set tagText to my jsonEscape(tag names of t)
+            end try
+
+            set projectName to ""
+            try
+                set projectName to my jsonEscape(name of project of t)
+            end try
+
+            set areaName to ""
+            try
+                set areaName to my jsonEscape(name of area of t)
+            end try
+
+            set tasksJSON to tasksJSON & "{{\\"id\\": \\"" & taskId & "\\", \\"title\\": \\"" & taskTitle & "\\"," & ¬
+                "\\"notes\\": \\"" & taskNotes & "\\"," & ¬
+                "\\"due_date\\": \\"" & dueDate & "\\"," & ¬
+                "\\"when\\": \\"" & whenDate & "\\"," & ¬
+                "\\"tags\\": \\"" & tagText & "\\"," & ¬
+                "\\"project\\": \\"" & projectName & "\\"," & ¬
+                "\\"area\\": \\"" & areaName & "\\"," & ¬
+                "\\"status\\": \\"" & ((status of t) as string) & "\\"}}"
+
+            if i is not matchCount then
+                set tasksJSON to tasksJSON & ","
+            end if
+        end repeat
+
+        return tasksJSON & "]"
+    end tell
+end run
+"""
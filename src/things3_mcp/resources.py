@@ -0,0 +1,245 @@
+"""MCP resources for Things3 lists, projects and areas, with change subscriptions.
+
+Clients can read ``things://list/today`` and friends instead of calling the
+view tools, and subscribe to them instead of polling. A background detector
+runs one small script per interval that fingerprints only the subscribed
+resources (IDs and modification dates, fetched in bulk) and sends
+``notifications/resources/updated`` to subscribers when a fingerprint
+changes. ``things://selection`` is pushed by the ``SelectionWatcher``
+instead.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import mcp.types as types
+from loguru import logger
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from pydantic import AnyUrl
+
+from .handlers import AppleScriptHandler
+from .models import Task
+from .selection import SelectionWatcher
+
+SELECTION_URI = "things://selection"
+
+# Resource URI -> (fingerprint key passed to the detector script, or None if
+# changes are pushed, name, description)
+RESOURCES: Dict[str, Tuple[Optional[str], str, str]] = {
+    "things://list/inbox": ("Inbox", "Inbox", "Todos in the Things3 Inbox"),
+    "things://list/today": ("Today", "Today", "Todos in the Things3 Today list"),
+    "things://list/anytime": ("Anytime", "Anytime", "Todos in the Things3 Anytime list"),
+    "things://list/someday": ("Someday", "Someday", "Todos in the Things3 Someday list"),
+    "things://projects": ("projects", "Projects", "All Things3 projects"),
+    "things://areas": ("areas", "Areas", "All Things3 areas"),
+    SELECTION_URI: (None, "Selection", "Todos currently selected in Things3"),
+}
+
+# Separates the fingerprints in the detector script output (ASCII record separator)
+_FINGERPRINT_SEPARATOR = "\x1e"
+
+
+class ResourceHub:
+    """Serves the Things3 resources and notifies subscribers of changes.
+
+    Subscriptions are tracked per session, so one server can serve many
+    clients (HTTP, daemon). The detector only runs while there are
+    subscriptions and only fingerprints the subscribed resources.
+    """
+
+    def __init__(
+        self,
+        applescript: AppleScriptHandler,
+        interval: float = 5.0,
+        selection: Optional[SelectionWatcher] = None
+    ) -> None:
+        """Initialize the hub.
+
+        Args:
+            applescript: Handler used to read resources and run the detector
+            interval: Seconds between change checks
+            selection: Selection watcher to share with the view tools
+        """
+        self.applescript = applescript
+        self.interval = interval
+        self.selection = selection if selection is not None else SelectionWatcher(applescript)
+        self.selection.add_listener(self._selection_changed)
+        self._subscribers: Dict[str, Set[Any]] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @staticmethod
+    def definitions() -> List[types.Resource]:
+        """Get MCP resource definitions."""
+        return [
+            types.Resource(uri=AnyUrl(uri), name=name, description=description, mimeType="application/json")
+            for uri, (_, name, description) in RESOURCES.items()
+        ]
+
+    def _read(self, uri: str) -> List[Dict[str, Any]]:
+        """Read a resource as JSON-serializable data."""
+        key = RESOURCES[uri][0]
+        # The selection has no key; it is read from the selection watcher
+        assert key is not None
+        if key == "projects":
+            return self.applescript.get_projects()
+        if key == "areas":
+            return self.applescript.get_areas()
+        return [task.to_dict() for task in self.applescript.get_list_tasks(key)]
+
+    async def read(self, uri: AnyUrl) -> List[ReadResourceContents]:
+        """Read a resource.
+
+        Args:
+            uri: Resource URI
+
+        Returns:
+            The resource as one JSON document
+
+        Raises:
+            ValueError: If the URI is not a Things3 resource
+        """
+        uri_text = str(uri)
+        if uri_text not in RESOURCES:
+            raise ValueError(f"Unknown resource: {uri_text}")
+        if uri_text == SELECTION_URI:
+            data = [task.to_dict() for task in await self.selection.selected_todos()]
+        else:
+            data = await asyncio.to_thread(self._read, uri_text)
+        return [ReadResourceContents(content=json.dumps(data, ensure_ascii=False), mime_type="application/json")]
+
+    def subscribe(self, uri: AnyUrl, session: Any) -> None:
+        """Subscribe a session to change notifications for a resource.
+
+        Args:
+            uri: Resource URI
+            session: Session to notify
+
+        Raises:
+            ValueError: If the URI is not a Things3 resource
+        """
+        uri_text = str(uri)
+        if uri_text not in RESOURCES:
+            raise ValueError(f"Unknown resource: {uri_text}")
+        self._subscribers.setdefault(uri_text, set()).add(session)
+        logger.debug(f"Subscribed to {uri_text}")
+        if uri_text == SELECTION_URI:
+            self.selection.touch()
+        self.start()
+
+    def unsubscribe(self, uri: AnyUrl, session: Any) -> None:
+        """Remove a session's subscription to a resource.
+
+        Args:
+            uri: Resource URI
+            session: Subscribed session
+        """
+        uri_text = str(uri)
+        sessions = self._subscribers.get(uri_text)
+        if sessions is None:
+            return
+        sessions.discard(session)
+        if not sessions:
+            del self._subscribers[uri_text]
+            self._fingerprints.pop(uri_text, None)
+
+    def fingerprint(self, uris: List[str]) -> Dict[str, str]:
+        """Fingerprint resources with one script run.
+
+        Args:
+            uris: Resource URIs to fingerprint
+
+        Returns:
+            Digest per URI; empty if the script failed
+        """
+        keys: List[str] = []
+        for uri in uris:
+            key = RESOURCES[uri][0]
+            # Pushed resources such as the selection are never fingerprinted
+            assert key is not None
+            keys.append(key)
+        try:
+            output = self.applescript.run_script_file("get_fingerprints", keys)
+        except RuntimeError as e:
+            logger.error(f"Failed to check resources for changes: {e}")
+            return {}
+
+        parts = output.split(_FINGERPRINT_SEPARATOR)
+        if len(parts) != len(uris):
+            logger.error(f"Expected {len(uris)} resource fingerprints, got {len(parts)}")
+            return {}
+        return {uri: hashlib.sha1(part.encode("utf-8")).hexdigest() for uri, part in zip(uris, parts)}
+
+    async def check(self) -> List[str]:
+        """Check the subscribed resources and notify subscribers of changes.
+
+        The first check of a resource only records its fingerprint.
+
+        Returns:
+            URIs that changed since the previous check
+        """
+        if SELECTION_URI in self._subscribers:
+            # Keep the watcher from stopping while someone listens
+            self.selection.touch()
+
+        uris = sorted(uri for uri in self._subscribers if RESOURCES[uri][0] is not None)
+        if not uris:
+            return []
+
+        fingerprints = await asyncio.to_thread(self.fingerprint, uris)
+        changed = []
+        for uri, digest in fingerprints.items():
+            previous = self._fingerprints.get(uri)
+            self._fingerprints[uri] = digest
+            if previous is not None and previous != digest:
+                changed.append(uri)
+
+        for uri in changed:
+            await self._notify(uri)
+        return changed
+
+    async def _selection_changed(self, todos: List[Task]) -> None:
+        if SELECTION_URI in self._subscribers:
+            await self._notify(SELECTION_URI)
+
+    async def _notify(self, uri: str) -> None:
+        """Send a resource update to every subscriber, dropping closed sessions."""
+        for session in list(self._subscribers.get(uri, ())):
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+            except Exception as e:
+                logger.debug(f"Dropping subscriber of {uri}: {e}")
+                self.unsubscribe(AnyUrl(uri), session)
+        logger.info(f"Resource changed: {uri}")
+
+    def start(self) -> None:
+        """Start the change detector on the running event loop."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the change detector."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Resource change check failed: {e}")
+            await asyncio.sleep(self.interval)
+        # Restarted by the next subscription
+        self._fingerprints.clear()
@@ -0,0 +1,165 @@
+"""Background watcher for the Things3 UI selection.
+
+Agents that follow the selection would otherwise run the full
+``get_selected`` script in a tight loop. The watcher polls only the IDs of
+the selected todos with a minimal script, speeds up while the selection is
+changing and backs off while it is not, and fetches the full todos once per
+settled change. ``get-selected-todos`` and the ``things://selection``
+resource are served from that cache.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from loguru import logger
+
+from .handlers import AppleScriptHandler
+from .models import Task
+
+SelectionListener = Callable[[List[Task]], Awaitable[None]]
+
+
+class SelectionWatcher:
+    """Polls the selection and caches the selected todos.
+
+    The watcher starts on first use and stops by itself once nothing has
+    asked for the selection for ``idle_timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        applescript: AppleScriptHandler,
+        min_interval: float = 0.25,
+        max_interval: float = 2.0,
+        debounce: float = 0.3,
+        max_age: float = 10.0,
+        idle_timeout: float = 60.0
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            applescript: Handler used to poll and fetch the selection
+            min_interval: Seconds between polls while the selection changes
+            max_interval: Seconds between polls once it has been stable
+            debounce: Seconds a new selection must stay unchanged before it
+                is fetched and reported
+            max_age: Seconds the cached todos are served before being fetched
+                again (the poll only sees IDs, not edits)
+            idle_timeout: Seconds without use after which the watcher stops
+        """
+        self.applescript = applescript
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.debounce = debounce
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+        self._listeners: List[SelectionListener] = []
+        self._pending: Optional[List[str]] = None
+        self._pending_since = 0.0
+        self._current: Optional[List[str]] = None
+        self._todos: Optional[List[Task]] = None
+        self._fetched_at = 0.0
+        self._interval = min_interval
+        self._last_used = time.monotonic()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_listener(self, listener: SelectionListener) -> None:
+        """Call ``listener`` with the new todos whenever the selection settles on a change."""
+        self._listeners.append(listener)
+
+    def touch(self) -> None:
+        """Record that the selection is in use and make sure the watcher runs."""
+        self._last_used = time.monotonic()
+        self.start()
+
+    async def selected_todos(self) -> List[Task]:
+        """Get the selected todos, from the cache when it is current.
+
+        Returns:
+            List of selected todos
+        """
+        self.touch()
+        fresh = time.monotonic() - self._fetched_at < self.max_age
+        if self._todos is not None and fresh and self._pending == self._current:
+            return list(self._todos)
+
+        todos = await asyncio.to_thread(self.applescript.get_selected_todos)
+        self._store([todo.id for todo in todos], todos)
+        self._pending = self._current
+        return list(todos)
+
+    def _store(self, ids: List[str], todos: List[Task]) -> None:
+        self._current = ids
+        self._todos = todos
+        self._fetched_at = time.monotonic()
+
+    async def poll(self) -> bool:
+        """Poll the selection once.
+
+        Returns:
+            True if the selection settled on a change that listeners were
+            told about
+        """
+        ids = await asyncio.to_thread(self.applescript.get_selected_ids)
+        if ids is None:
+            return False
+
+        now = time.monotonic()
+        if ids != self._pending:
+            # Still moving: poll quickly until it settles
+            self._pending = ids
+            self._pending_since = now
+            self._interval = self.min_interval
+            return False
+        if ids == self._current:
+            self._interval = min(self._interval * 2, self.max_interval)
+            return False
+        if now - self._pending_since < self.debounce:
+            return False
+
+        initial = self._current is None
+        todos = await asyncio.to_thread(self.applescript.get_selected_todos) if ids else []
+        self._store(ids, todos)
+        if initial:
+            return False
+
+        logger.debug(f"Selection changed to {len(ids)} todos")
+        for listener in self._listeners:
+            try:
+                await listener(list(todos))
+            except Exception as e:
+                logger.error(f"Selection listener failed: {e}")
+        return True
+
+    def start(self) -> None:
+        """Start polling on the running event loop."""
+        if self.running:
+            return
+        self._interval = self.min_interval
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while time.monotonic() - self._last_used < self.idle_timeout:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"Selection poll failed: {e}")
+            await asyncio.sleep(self._interval)
+        # Nothing tracks changes while stopped, so drop the cache
+        self._pending = self._current = self._todos = None
+        logger.debug("Selection watcher stopped after being idle")
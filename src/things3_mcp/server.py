@@ -1,52 +1,314 @@
 """Main MCP server implementation for Things3 MCP."""
 
+import argparse
 import asyncio
+import contextlib
+import json
 import signal
+import subprocess
 import sys
+import time
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
-import mcp.server.stdio
 import mcp.types as types
 from loguru import logger
 from mcp.server import Server, NotificationOptions
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.models import InitializationOptions
+from pydantic import AnyUrl
 
-from .tools import CreateTools, ManageTools, ViewTools
+from . import __version__
 
-# Configure logging
-logger.remove()  # Remove default handler
-logger.add(
-    sys.stderr, 
-    level="INFO", 
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
-)
+if TYPE_CHECKING:
+    from .config import Settings
+    from .handlers import AppleScriptHandler, ThingsDatabase, XCallbackHandler
+    from .handlers.recording import Recording, RecordingWriter
+    from .journal import WriteBehindQueue
+    from .mutations import MutationBatcher
+    from .prefetch import Prefetcher
+    from .resources import ResourceHub
+    from .selection import SelectionWatcher
+    from .tools import CreateTools, HealthTools, ManageTools, ViewTools
 
-# Add file logging for debugging
-log_file = Path.home() / "things3-mcp.log"
-logger.add(
-    log_file,
-    level="DEBUG",
-    rotation="10 MB",
-    retention="7 days",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
-)
+
+def configure_logging() -> None:
+    """Configure console and file logging.
+    
+    Called from ``main`` rather than at import time so that importing the
+    server module (tests, profiling, embedding) has no side effects. The log
+    file is opened lazily on the first message.
+    """
+    logger.remove()  # Remove default handler
+    logger.add(
+        sys.stderr, 
+        level="INFO", 
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+    )
+
+    # Add file logging for debugging
+    log_file = Path.home() / "things3-mcp.log"
+    logger.add(
+        log_file,
+        level="DEBUG",
+        rotation="10 MB",
+        retention="7 days",
+        delay=True,
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+    )
 
 
 class Things3Server:
-    """Main MCP server for Things3 MCP integration."""
+    """Main MCP server for Things3 MCP integration.
+    
+    Tool groups (and the handlers they own) are built lazily on first use, so
+    constructing the server only registers the MCP request handlers. Their
+    modules are imported in the properties that build them, which keeps them
+    off the import path of the server module.
+    """
     
-    def __init__(self) -> None:
-        """Initialize the Things3 server."""
-        self.server = Server("things3-mcp")
-        self.create_tools = CreateTools()
-        self.view_tools = ViewTools()
-        self.manage_tools = ManageTools()
+    def __init__(self, settings: Optional["Settings"] = None) -> None:
+        """Initialize the Things3 server.
+        
+        Args:
+            settings: Server settings (read from the environment if omitted)
+        """
+        if settings is None:
+            from .config import Settings
+            
+            settings = Settings.from_env()
+        self.settings = settings
+        self.server = Server("things3-mcp", version=__version__)
+        self.calls_running = 0
+        self.calls_waiting = 0
         
         # Setup server handlers
         self._setup_handlers()
         
         logger.info("Things3 MCP server initialized")
+
+    @cached_property
+    def tool_slots(self) -> asyncio.Semaphore:
+        """Limits how many tool calls run at once across all sessions."""
+        return asyncio.Semaphore(self.settings.max_concurrency)
+
+    @contextlib.asynccontextmanager
+    async def tool_slot(self) -> AsyncIterator[None]:
+        """Hold one of the tool slots, counting running and waiting calls."""
+        self.calls_waiting += 1
+        try:
+            await self.tool_slots.acquire()
+        finally:
+            self.calls_waiting -= 1
+        self.calls_running += 1
+        try:
+            yield
+        finally:
+            self.calls_running -= 1
+            self.tool_slots.release()
+
+    def load(self) -> Dict[str, int]:
+        """Tool calls running and waiting for a slot."""
+        return {
+            "running": self.calls_running,
+            "waiting": self.calls_waiting,
+            "limit": self.settings.max_concurrency,
+        }
+
+    @cached_property
+    def applescript(self) -> "AppleScriptHandler":
+        """AppleScript handler shared by all tool groups, built on first use.
+        
+        Raises:
+            ValueError: If the configured backend is unknown
+        """
+        from .handlers import AppleScriptHandler, CircuitBreaker
+        
+        breaker = CircuitBreaker(
+            "Things3",
+            failure_threshold=self.settings.breaker_threshold,
+            reset_timeout=self.settings.breaker_reset,
+        )
+        backend = self.settings.backend
+        if backend == "things3":
+            return AppleScriptHandler(breaker=breaker)
+        if backend == "simulated":
+            from .handlers.simulated import SimulatedAppleScriptHandler
+            
+            return SimulatedAppleScriptHandler(latency=self.settings.simulated_latency, breaker=breaker)
+        if backend == "record":
+            from .handlers.recording import RecordingAppleScriptHandler
+            
+            return RecordingAppleScriptHandler(self.recorder, breaker=breaker)
+        if backend == "replay":
+            from .handlers.recording import ReplayAppleScriptHandler
+            
+            return ReplayAppleScriptHandler(
+                self.recording, keep_latency=self.settings.replay_latency, breaker=breaker
+            )
+        raise ValueError(f"Unknown backend: {backend}")
+
+    @cached_property
+    def xcallback(self) -> "XCallbackHandler":
+        """X-callback-url handler for the configured backend."""
+        from .handlers import CircuitBreaker, XCallbackHandler
+        
+        breaker = CircuitBreaker(
+            "Things3 URL scheme",
+            failure_threshold=self.settings.breaker_threshold,
+            reset_timeout=self.settings.breaker_reset,
+        )
+        backend = self.settings.backend
+        if backend == "simulated":
+            from .handlers.simulated import SimulatedXCallbackHandler
+            
+            library = self.applescript.library  # type: ignore[attr-defined]
+            return SimulatedXCallbackHandler(library, latency=self.settings.simulated_latency, breaker=breaker)
+        if backend == "record":
+            from .handlers.recording import RecordingXCallbackHandler
+            
+            return RecordingXCallbackHandler(self.recorder, breaker=breaker)
+        if backend == "replay":
+            from .handlers.recording import ReplayXCallbackHandler
+            
+            return ReplayXCallbackHandler(
+                self.recording, keep_latency=self.settings.replay_latency, breaker=breaker
+            )
+        return XCallbackHandler(breaker=breaker)
+
+    @cached_property
+    def recorder(self) -> "RecordingWriter":
+        """Archive that the record backend writes to."""
+        from .handlers.recording import RecordingWriter
+        
+        return RecordingWriter(self._recording_path())
+
+    @cached_property
+    def recording(self) -> "Recording":
+        """Recorded calls that the replay backend serves."""
+        from .handlers.recording import Recording
+        
+        return Recording.load(self._recording_path())
+
+    def _recording_path(self) -> Path:
+        if self.settings.recording_path is None:
+            raise ValueError("Set THINGS3_MCP_RECORDING to the archive to record to or replay")
+        return self.settings.recording_path
+
+    @cached_property
+    def database(self) -> "ThingsDatabase":
+        """Read-only Things3 database, shared by all tool groups.
+        
+        Only the real backend reads it; simulated and recorded sessions
+        see Things3 through AppleScript alone.
+        """
+        from .handlers import DisabledDatabase, ThingsDatabase
+        
+        if self.settings.backend != "things3":
+            return DisabledDatabase()
+        return ThingsDatabase(self.settings.database_path)
+
+    @cached_property
+    def selection(self) -> "SelectionWatcher":
+        """Watcher that caches the Things3 selection, started on first use."""
+        from .selection import SelectionWatcher
+        
+        interval = self.settings.selection_poll_interval
+        return SelectionWatcher(self.applescript, min_interval=interval, max_interval=max(interval, 2.0))
+
+    @cached_property
+    def resources(self) -> "ResourceHub":
+        """Resources and their change subscriptions, shared by all sessions."""
+        from .resources import ResourceHub
+        
+        return ResourceHub(
+            self.applescript, interval=self.settings.resource_poll_interval, selection=self.selection
+        )
+
+    @cached_property
+    def prefetcher(self) -> "Prefetcher":
+        """Warmup and predictive prefetch of read-only tool results."""
+        from .prefetch import Prefetcher
+        
+        return Prefetcher(self._call_tool, ttl=self.settings.prefetch_ttl, slots=self.tool_slots)
+
+    @cached_property
+    def write_queue(self) -> Optional["WriteBehindQueue"]:
+        """Write-behind queue, or None when mutations are applied inline."""
+        if not self.settings.write_behind:
+            return None
+        from .journal import MutationJournal, WriteBehindQueue
+        from .mutations import apply_mutations
+        
+        journal = MutationJournal(self.settings.journal_path)
+        return WriteBehindQueue(
+            journal,
+            lambda mutations: apply_mutations(self.applescript, mutations),
+            max_attempts=self.settings.write_max_attempts,
+            coalesce_window=self.settings.coalesce_window,
+        )
+
+    @cached_property
+    def batcher(self) -> Optional["MutationBatcher"]:
+        """Mutation batcher, or None when coalescing is disabled."""
+        if self.settings.coalesce_window <= 0:
+            return None
+        from .mutations import MutationBatcher, apply_mutations
+        
+        return MutationBatcher(
+            lambda mutations: apply_mutations(self.applescript, mutations),
+            self.settings.coalesce_window,
+        )
+
+    @cached_property
+    def create_tools(self) -> "CreateTools":
+        """Creation tools, built on first use."""
+        from .templates import TemplateStore
+        from .tools import CreateTools
+        
+        return CreateTools(
+            self.xcallback,
+            database=self.database,
+            applescript=self.applescript,
+            templates=TemplateStore(self.settings.templates_path),
+        )
+
+    @cached_property
+    def view_tools(self) -> "ViewTools":
+        """View tools, built on first use."""
+        from .tools import ViewTools
+        
+        return ViewTools(self.applescript, database=self.database, selection=self.selection)
+
+    @cached_property
+    def manage_tools(self) -> "ManageTools":
+        """Management tools, built on first use."""
+        from .tools import ManageTools
+        
+        return ManageTools(
+            self.applescript,
+            write_queue=self.write_queue,
+            batcher=self.batcher,
+            xcallback=self.xcallback,
+            auth_token=self.settings.auth_token,
+            url_batch_size=self.settings.url_batch_size,
+        )
+
+    @cached_property
+    def health_tools(self) -> "HealthTools":
+        """Health tool, built on first use."""
+        from .tools import HealthTools
+        
+        return HealthTools(
+            self.applescript,
+            database=self.database,
+            load=self.load,
+            prefetcher=self.prefetcher,
+            selection=self.selection,
+            write_queue=self.write_queue,
+            batcher=self.batcher,
+        )
     
     def _setup_handlers(self) -> None:
         """Setup MCP server handlers."""
@@ -58,10 +320,31 @@ class Things3Server:
             tools.extend(self.create_tools.get_tool_definitions())
             tools.extend(self.view_tools.get_tool_definitions())
             tools.extend(self.manage_tools.get_tool_definitions())
+            tools.extend(self.health_tools.get_tool_definitions())
             
             logger.debug(f"Listed {len(tools)} tools")
             return tools
         
+        @self.server.list_resources()  # type: ignore[no-untyped-call, untyped-decorator]
+        async def handle_list_resources() -> List[types.Resource]:
+            """List the Things3 resources."""
+            return self.resources.definitions()
+        
+        @self.server.read_resource()  # type: ignore[no-untyped-call, untyped-decorator]
+        async def handle_read_resource(uri: AnyUrl) -> List[ReadResourceContents]:
+            """Read a Things3 resource."""
+            return await self.resources.read(uri)
+        
+        @self.server.subscribe_resource()  # type: ignore[no-untyped-call, untyped-decorator]
+        async def handle_subscribe_resource(uri: AnyUrl) -> None:
+            """Subscribe the calling session to changes of a resource."""
+            self.resources.subscribe(uri, self.server.request_context.session)
+        
+        @self.server.unsubscribe_resource()  # type: ignore[no-untyped-call, untyped-decorator]
+        async def handle_unsubscribe_resource(uri: AnyUrl) -> None:
+            """Unsubscribe the calling session from a resource."""
+            self.resources.unsubscribe(uri, self.server.request_context.session)
+        
         @self.server.call_tool()
         async def handle_call_tool(
             name: str, arguments: Dict[str, Any] | None
@@ -73,87 +356,352 @@ class Things3Server:
             logger.info(f"Executing tool: {name} with arguments: {arguments}")
             
             try:
-                # Creation tools
-                if name == "create-project":
-                    return await self.create_tools.handle_create_project(arguments)
-                elif name == "create-todo":
-                    return await self.create_tools.handle_create_todo(arguments)
-                
-                # View tools
-                elif name == "view-inbox":
-                    return await self.view_tools.handle_view_inbox(arguments)
-                elif name == "view-today":
-                    return await self.view_tools.handle_view_today(arguments)
-                elif name == "view-anytime":
-                    return await self.view_tools.handle_view_anytime(arguments)
-                elif name == "view-someday":
-                    return await self.view_tools.handle_view_someday(arguments)
-                elif name == "view-projects":
-                    return await self.view_tools.handle_view_projects(arguments)
-                elif name == "view-areas":
-                    return await self.view_tools.handle_view_areas(arguments)
-                elif name == "get-selected-todos":
-                    return await self.view_tools.handle_get_selected_todos(arguments)
-                
-                # Management tools
-                elif name == "assign-project":
-                    return await self.manage_tools.handle_assign_project(arguments)
-                elif name == "assign-area":
-                    return await self.manage_tools.handle_assign_area(arguments)
-                elif name == "set-tags":
-                    return await self.manage_tools.handle_set_tags(arguments)
-                elif name == "complete-selected":
-                    return await self.manage_tools.handle_complete_selected(arguments)
-                elif name == "rename-task":
-                    return await self.manage_tools.handle_rename_task(arguments)
+                # Health checks must answer even when every slot is busy
+                if name == "health":
+                    return await self.health_tools.handle_health(arguments)
                 
-                else:
-                    raise ValueError(f"Unknown tool: {name}")
+                # Bound how many tools run at once when many clients share
+                # one server; each one may hold an osascript process.
+                async with self.tool_slot():
+                    return await self.prefetcher.call(name, arguments)
                     
             except Exception as e:
                 error_msg = f"Error executing tool '{name}': {str(e)}"
                 logger.error(error_msg)
                 return [types.TextContent(type="text", text=error_msg)]
     
-    async def run(self) -> None:
-        """Run the MCP server using stdio transport."""
-        logger.info("Starting Things3 MCP server...")
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Dispatch a tool call to the tool group that implements it."""
+        # Creation tools
+        if name == "create-project":
+            return await self.create_tools.handle_create_project(arguments)
+        elif name == "create-todo":
+            return await self.create_tools.handle_create_todo(arguments)
         
-        # Setup signal handlers for graceful shutdown
-        def signal_handler(signum: int, frame: Any) -> None:
-            logger.info(f"Received signal {signum}, shutting down gracefully...")
-            raise SystemExit(0)
+        # View tools
+        elif name == "view-inbox":
+            return await self.view_tools.handle_view_inbox(arguments)
+        elif name == "view-today":
+            return await self.view_tools.handle_view_today(arguments)
+        elif name == "view-anytime":
+            return await self.view_tools.handle_view_anytime(arguments)
+        elif name == "view-someday":
+            return await self.view_tools.handle_view_someday(arguments)
+        elif name == "view-projects":
+            return await self.view_tools.handle_view_projects(arguments)
+        elif name == "view-areas":
+            return await self.view_tools.handle_view_areas(arguments)
+        elif name == "query-todos":
+            return await self.view_tools.handle_query_todos(arguments)
+        elif name == "view-project":
+            return await self.view_tools.handle_view_project(arguments)
+        elif name == "view-hierarchy":
+            return await self.view_tools.handle_view_hierarchy(arguments)
+        elif name == "view-logbook":
+            return await self.view_tools.handle_view_logbook(arguments)
+        elif name == "get-selected-todos":
+            return await self.view_tools.handle_get_selected_todos(arguments)
         
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        # Management tools
+        elif name == "assign-project":
+            return await self.manage_tools.handle_assign_project(arguments)
+        elif name == "assign-area":
+            return await self.manage_tools.handle_assign_area(arguments)
+        elif name == "set-tags":
+            return await self.manage_tools.handle_set_tags(arguments)
+        elif name == "complete-selected":
+            return await self.manage_tools.handle_complete_selected(arguments)
+        elif name == "rename-task":
+            return await self.manage_tools.handle_rename_task(arguments)
+        elif name == "mutation-status":
+            return await self.manage_tools.handle_mutation_status(arguments)
+        elif name == "update-todos":
+            return await self.manage_tools.handle_update_todos(arguments)
+        elif name == "complete-todos":
+            return await self.manage_tools.handle_complete_todos(arguments)
+        elif name == "reschedule-todos":
+            return await self.manage_tools.handle_reschedule_todos(arguments)
+        
+        else:
+            raise ValueError(f"Unknown tool: {name}")
+
+    async def run(
+        self, transport: str = "stdio", host: Optional[str] = None, port: Optional[int] = None
+    ) -> None:
+        """Run the MCP server.
+        
+        Args:
+            transport: ``stdio`` to serve a single host over stdin/stdout,
+                ``http`` to serve many clients over Streamable HTTP (and SSE),
+                or ``unix`` to run as the daemon behind the stdio shims
+            host: Address to bind in HTTP mode (defaults to the settings)
+            port: Port to bind in HTTP mode (defaults to the settings)
+        """
+        logger.info(f"Starting Things3 MCP server ({transport} transport)...")
+        
+        # Resume any mutations journaled by a previous run
+        if self.write_queue is not None:
+            self.write_queue.start()
+        self.prefetcher.warm(self.settings.warmup_tools)
         
         try:
-            # Run the server using stdin/stdout streams
-            async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-                await self.server.run(
-                    read_stream,
-                    write_stream,
-                    InitializationOptions(
-                        server_name="things3-mcp",
-                        server_version="1.0.0",
-                        capabilities=self.server.get_capabilities(
-                            notification_options=NotificationOptions(),
-                            experimental_capabilities={},
-                        ),
-                    ),
-                )
+            if transport == "http":
+                await self._run_http(host or self.settings.http_host, port or self.settings.http_port)
+            elif transport == "unix":
+                await self._run_daemon()
+            else:
+                await self._run_stdio()
         except SystemExit:
             logger.info("Server shutdown completed")
         except Exception as e:
             logger.error(f"Server error: {e}")
             sys.exit(1)
+        finally:
+            await self.prefetcher.stop()
+            await self.resources.stop()
+            await self.selection.stop()
+            if self.write_queue is not None:
+                await self.write_queue.stop()
+            if "recorder" in self.__dict__:
+                self.recorder.close()
+
+    async def _run_stdio(self) -> None:
+        """Serve a single host over stdin/stdout."""
+        # Setup signal handlers for graceful shutdown
+        def signal_handler(signum: int, frame: Any) -> None:
+            logger.info(f"Received signal {signum}, shutting down gracefully...")
+            raise SystemExit(0)
+        
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
+        
+        from mcp.server.stdio import stdio_server
+        
+        # Run the server using stdin/stdout streams
+        async with stdio_server() as (read_stream, write_stream):
+            await self.server.run(
+                read_stream,
+                write_stream,
+                self.initialization_options(),
+            )
+
+    async def _run_http(self, host: str, port: int) -> None:
+        """Serve many clients over HTTP until interrupted.
+        
+        Uvicorn installs its own signal handlers and shuts down gracefully on
+        SIGINT/SIGTERM.
+        
+        Args:
+            host: Address to bind
+            port: Port to bind
+        """
+        import uvicorn
+        
+        config = uvicorn.Config(
+            self.http_app(),
+            host=host,
+            port=port,
+            log_level="warning",
+        )
+        logger.info(f"Serving MCP over HTTP at http://{host}:{port}/mcp (SSE at /sse)")
+        await uvicorn.Server(config).serve()
+
+    async def _run_daemon(self) -> None:
+        """Serve the stdio shims on a Unix domain socket until signalled."""
+        import anyio
+
+        from .daemon import serve_daemon
+        
+        async with anyio.create_task_group() as tg:
+            async def stop_on_signal() -> None:
+                with anyio.open_signal_receiver(signal.SIGINT, signal.SIGTERM) as signals:
+                    async for signum in signals:
+                        logger.info(f"Received signal {signum}, shutting down gracefully...")
+                        tg.cancel_scope.cancel()
+                        return
+            
+            async def serve() -> None:
+                await serve_daemon(self, self.settings.socket_path)
+                tg.cancel_scope.cancel()
+            
+            tg.start_soon(stop_on_signal)
+            tg.start_soon(serve)
+
+    def http_app(self) -> Any:
+        """Build the ASGI application for the HTTP transport.
+        
+        ``/mcp`` serves the Streamable HTTP transport; ``/sse`` and
+        ``/messages/`` serve the older HTTP+SSE transport for clients that
+        have not moved on yet. All sessions share this server's handlers,
+        caches and write queue.
+        
+        Returns:
+            Starlette application
+        """
+        import contextlib
+        
+        from mcp.server.sse import SseServerTransport
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+        from starlette.applications import Starlette
+        from starlette.responses import Response
+        from starlette.routing import Mount, Route
+        
+        session_manager = StreamableHTTPSessionManager(app=self.server)
+        sse = SseServerTransport("/messages/")
+        
+        async def handle_streamable_http(scope: Any, receive: Any, send: Any) -> None:
+            await session_manager.handle_request(scope, receive, send)
+        
+        async def handle_sse(request: Any) -> Response:
+            async with sse.connect_sse(request.scope, request.receive, request._send) as (
+                read_stream,
+                write_stream,
+            ):
+                await self.server.run(read_stream, write_stream, self.initialization_options())
+            return Response()
+        
+        @contextlib.asynccontextmanager
+        async def lifespan(app: Any) -> Any:
+            async with session_manager.run():
+                yield
+        
+        return Starlette(
+            routes=[
+                Mount("/mcp", app=handle_streamable_http),
+                Route("/sse", endpoint=handle_sse, methods=["GET"]),
+                Mount("/messages/", app=sse.handle_post_message),
+            ],
+            lifespan=lifespan,
+        )
+
+    def initialization_options(self) -> InitializationOptions:
+        """Initialization options sent to every connecting client."""
+        capabilities = self.server.get_capabilities(
+            notification_options=NotificationOptions(),
+            experimental_capabilities={},
+        )
+        # The low-level server always reports subscribe=False
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return InitializationOptions(
+            server_name="things3-mcp",
+            server_version=__version__,
+            capabilities=capabilities,
+        )
+
+
+def _measure_import_ms() -> float:
+    """Measure a cold import of the server module in a fresh interpreter."""
+    code = (
+        "import time; started = time.perf_counter(); "
+        "import things3_mcp.server; "
+        "print((time.perf_counter() - started) * 1000)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    return float(result.stdout.strip())
+
+
+def profile_startup() -> Dict[str, float]:
+    """Measure import and initialization time of the server.
+    
+    Returns:
+        Dictionary of timings in milliseconds
+    """
+    import_ms = _measure_import_ms()
+    
+    started = time.perf_counter()
+    server = Things3Server()
+    init_finished = time.perf_counter()
+    
+    # Listing tools is the first request every host makes; it is the point
+    # where the lazily built tool groups are constructed.
+    server.create_tools.get_tool_definitions()
+    server.view_tools.get_tool_definitions()
+    server.manage_tools.get_tool_definitions()
+    server.health_tools.get_tool_definitions()
+    first_request_finished = time.perf_counter()
+    
+    return {
+        "import_ms": round(import_ms, 2),
+        "init_ms": round((init_finished - started) * 1000, 2),
+        "first_list_tools_ms": round((first_request_finished - init_finished) * 1000, 2),
+    }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="things3-mcp", description="MCP server for Things3")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["serve", "daemon", "shim"],
+        default="serve",
+        help=(
+            "serve: run the server in this process (default); daemon: run the shared "
+            "server on a Unix socket; shim: forward stdio to the daemon, starting it if needed"
+        ),
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import and initialization time as JSON and exit",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http"],
+        default="stdio",
+        help="Serve one host over stdio (default) or many clients over HTTP",
+    )
+    parser.add_argument("--host", help="Address to bind in HTTP mode (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="Port to bind in HTTP mode (default: 8765)")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        help="Maximum number of tool calls executed at once (default: 8)",
+    )
+    return parser.parse_args(argv)
 
 
 def main() -> None:
     """Main entry point for the MCP server."""
-    server = Things3Server()
+    args = parse_args()
+    if args.profile_startup:
+        print(json.dumps(profile_startup()))
+        return
+    
+    configure_logging()
+    from .config import Settings
+    
+    settings = Settings.from_env()
+    if args.max_concurrency:
+        settings.max_concurrency = args.max_concurrency
+    
+    command = args.command
+    if command == "serve" and args.transport == "stdio" and settings.use_daemon:
+        command = "shim"
+    
+    if command == "shim":
+        from .daemon import run_shim
+        
+        try:
+            asyncio.run(run_shim(settings.socket_path))
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            logger.error(f"Could not reach the daemon: {e}")
+            sys.exit(1)
+        return
+    
+    transport = "unix" if command == "daemon" else args.transport
+    server = Things3Server(settings)
     try:
-        asyncio.run(server.run())
+        asyncio.run(server.run(transport, host=args.host, port=args.port))
     except KeyboardInterrupt:
         logger.info("Server interrupted by user")
     except Exception as e:
@@ -0,0 +1,226 @@
+"""Project structures and named project templates.
+
+A project structure lists todos, and headings with their own todos, each
+todo optionally with notes, dates, tags and checklist items. It is turned
+into a single Things JSON command (``things:///json``), so a whole project
+is created with one URL instead of one per todo.
+
+Templates are JSON files named ``<template>.json`` in the templates
+directory. Each holds a project structure plus optional project attributes
+(``notes``, ``area``, ``when``, ``deadline``, ``tags``). All templates are
+read and validated once, when the store is created.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from .decode import DecodeError, loads
+
+# Things accepts at most this many items per JSON command
+MAX_ITEMS = 250
+
+PROJECT_ATTRIBUTES = ("notes", "area", "when", "deadline")
+TODO_ATTRIBUTES = ("notes", "when", "deadline")
+
+
+def _text(value: Any, where: str) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{where} must be a non-empty string")
+    return value
+
+
+def _strings(value: Any, where: str) -> List[str]:
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{where} must be a list of strings")
+    return value
+
+
+def _todo(value: Any, where: str) -> Dict[str, Any]:
+    if isinstance(value, str):
+        value = {"title": value}
+    if not isinstance(value, dict):
+        raise ValueError(f"{where} must be an object or a title")
+    unknown = set(value) - {"title", "tags", "checklist", *TODO_ATTRIBUTES}
+    if unknown:
+        raise ValueError(f"{where} has unknown fields: {', '.join(sorted(unknown))}")
+
+    todo: Dict[str, Any] = {"title": _text(value.get("title"), f"{where}.title")}
+    for key in TODO_ATTRIBUTES:
+        if value.get(key):
+            todo[key] = _text(value[key], f"{where}.{key}")
+    if value.get("tags"):
+        todo["tags"] = _strings(value["tags"], f"{where}.tags")
+    if value.get("checklist"):
+        todo["checklist"] = _strings(value["checklist"], f"{where}.checklist")
+    return todo
+
+
+def validate_structure(value: Dict[str, Any], where: str = "project") -> Dict[str, Any]:
+    """Validate a project structure and normalize it.
+
+    Args:
+        value: Mapping with optional ``todos``, ``headings`` and project
+            attributes
+        where: Name used in error messages
+
+    Returns:
+        Structure with ``todos``, ``headings`` and the attributes that are set;
+        todos given as plain titles become ``{"title": ...}``
+
+    Raises:
+        ValueError: If the structure is malformed
+    """
+    unknown = set(value) - {"todos", "headings", "tags", *PROJECT_ATTRIBUTES}
+    if unknown:
+        raise ValueError(f"{where} has unknown fields: {', '.join(sorted(unknown))}")
+
+    todos = value.get("todos") or []
+    headings = value.get("headings") or []
+    if not isinstance(todos, list):
+        raise ValueError(f"{where}.todos must be a list")
+    if not isinstance(headings, list):
+        raise ValueError(f"{where}.headings must be a list")
+
+    structure: Dict[str, Any] = {
+        "todos": [_todo(todo, f"{where}.todos[{i}]") for i, todo in enumerate(todos)],
+        "headings": [],
+    }
+    for i, heading in enumerate(headings):
+        name = f"{where}.headings[{i}]"
+        if not isinstance(heading, dict):
+            raise ValueError(f"{name} must be an object")
+        heading_todos = heading.get("todos") or []
+        if not isinstance(heading_todos, list):
+            raise ValueError(f"{name}.todos must be a list")
+        structure["headings"].append({
+            "title": _text(heading.get("title"), f"{name}.title"),
+            "todos": [_todo(todo, f"{name}.todos[{j}]") for j, todo in enumerate(heading_todos)],
+        })
+    for key in PROJECT_ATTRIBUTES:
+        if value.get(key):
+            structure[key] = _text(value[key], f"{where}.{key}")
+    if value.get("tags"):
+        structure["tags"] = _strings(value["tags"], f"{where}.tags")
+
+    count = item_count(structure)
+    if count > MAX_ITEMS:
+        raise ValueError(f"{where} has {count} items; Things accepts at most {MAX_ITEMS} per command")
+    return structure
+
+
+def item_count(structure: Dict[str, Any]) -> int:
+    """Number of Things items (project, headings and todos) in a structure."""
+    return 1 + len(structure["todos"]) + sum(1 + len(heading["todos"]) for heading in structure["headings"])
+
+
+def merge(template: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine a template with a structure given for one project.
+
+    Attributes given directly replace the template's; todos and headings
+    given directly are added after the template's.
+
+    Args:
+        template: Validated template structure
+        overrides: Validated structure from the tool arguments
+
+    Returns:
+        Combined structure
+    """
+    combined = {**template, **{k: v for k, v in overrides.items() if k not in ("todos", "headings")}}
+    combined["todos"] = template["todos"] + overrides["todos"]
+    combined["headings"] = template["headings"] + overrides["headings"]
+    return combined
+
+
+def _things_todo(todo: Dict[str, Any]) -> Dict[str, Any]:
+    attributes: Dict[str, Any] = {"title": todo["title"]}
+    for key in TODO_ATTRIBUTES:
+        if key in todo:
+            attributes[key] = todo[key]
+    if "tags" in todo:
+        attributes["tags"] = todo["tags"]
+    if "checklist" in todo:
+        attributes["checklist-items"] = [
+            {"type": "checklist-item", "attributes": {"title": title}} for title in todo["checklist"]
+        ]
+    return {"type": "to-do", "attributes": attributes}
+
+
+def to_things_json(title: str, structure: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Build the Things JSON for a project.
+
+    In Things JSON a project's items are flat: todos that follow a heading
+    belong to it, so todos without a heading come first.
+
+    Args:
+        title: Project title
+        structure: Validated project structure
+
+    Returns:
+        Value of the ``data`` parameter of ``things:///json``
+    """
+    items = [_things_todo(todo) for todo in structure["todos"]]
+    for heading in structure["headings"]:
+        items.append({"type": "heading", "attributes": {"title": heading["title"]}})
+        items.extend(_things_todo(todo) for todo in heading["todos"])
+
+    attributes: Dict[str, Any] = {"title": title}
+    for key in PROJECT_ATTRIBUTES:
+        if key in structure:
+            attributes[key] = structure[key]
+    if "tags" in structure:
+        attributes["tags"] = structure["tags"]
+    attributes["items"] = items
+    return [{"type": "project", "attributes": attributes}]
+
+
+class TemplateStore:
+    """Named project templates, read and validated once."""
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        """Load every template in ``directory``.
+
+        Templates that cannot be read or are invalid are logged and skipped.
+
+        Args:
+            directory: Directory of ``<template>.json`` files; none when omitted
+                or missing
+        """
+        self.directory = directory
+        self._templates: Dict[str, Dict[str, Any]] = {}
+        if directory is None or not directory.is_dir():
+            return
+
+        for path in sorted(directory.glob("*.json")):
+            try:
+                self._templates[path.stem] = validate_structure(
+                    loads(path.read_bytes()), f"template '{path.stem}'"
+                )
+            except (OSError, DecodeError, ValueError, AttributeError, TypeError) as e:
+                logger.error(f"Skipping project template {path}: {e}")
+        if self._templates:
+            logger.info(f"Loaded {len(self._templates)} project templates from {directory}")
+
+    def names(self) -> List[str]:
+        """Names of the loaded templates."""
+        return list(self._templates)
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """Return a validated template.
+
+        Args:
+            name: Template name
+
+        Returns:
+            Template structure
+
+        Raises:
+            ValueError: If there is no such template
+        """
+        template = self._templates.get(name)
+        if template is None:
+            available = ", ".join(self._templates) or "none"
+            raise ValueError(f"Unknown project template '{name}' (available: {available})")
+        return template
@@ -1,7 +1,8 @@
 """Tools for MCP Things3 Enhanced."""
 
 from .create import CreateTools
+from .health import HealthTools
 from .view import ViewTools
 from .manage import ManageTools
 
-__all__ = ["CreateTools", "ViewTools", "ManageTools"]
\ No newline at end of file
+__all__ = ["CreateTools", "ViewTools", "ManageTools", "HealthTools"]
\ No newline at end of file
@@ -1,22 +1,103 @@
 """Creation tools for Things3 projects and todos."""
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import time
+from functools import cached_property, partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import mcp.types as types
 from loguru import logger
 
-from ..handlers import XCallbackHandler
+from ..handlers import (
+    AppleScriptHandler,
+    ThingsDatabase,
+    UnavailableError,
+    XCallbackHandler,
+    unavailable_message,
+)
+from ..models import Task
+from ..templates import TemplateStore, merge, to_things_json, validate_structure
+
+# Things3 handles URLs asynchronously, so the new item may take a moment to
+# reach the database
+CREATED_LOOKUP_ATTEMPTS = 20
+CREATED_LOOKUP_INTERVAL = 0.05
+
+_TODO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string", "description": "Todo title"},
+        "notes": {"type": "string", "description": "Todo notes"},
+        "when": {"type": "string", "description": "When to schedule the todo"},
+        "deadline": {"type": "string", "description": "Todo deadline"},
+        "tags": {"type": "array", "items": {"type": "string"}, "description": "Tags to assign"},
+        "checklist": {"type": "array", "items": {"type": "string"}, "description": "Checklist items"},
+    },
+    "required": ["title"],
+    "additionalProperties": False
+}
 
 
 class CreateTools:
-    """Handles creation of projects and todos in Things3."""
+    """Handles creation of projects and todos in Things3.
+    
+    The ``open`` command gives no way to receive x-success callbacks, so the
+    ID of a created item is looked up in the database instead and returned
+    with the result: the first ID with its title that neither existed before
+    the item was created nor was handed to another create still in progress.
+    New todos are added to the name index at once, so that editing them next
+    needs no scan.
     
-    def __init__(self) -> None:
-        """Initialize the create tools."""
-        self.xcallback = XCallbackHandler()
+    A project with todos, headings or a template is created with a single
+    Things JSON command rather than one URL per item.
+    """
+    
+    database: Optional[ThingsDatabase] = None
+    applescript: Optional[AppleScriptHandler] = None
+    templates: Optional[TemplateStore] = None
+    
+    def __init__(
+        self,
+        xcallback: Optional[XCallbackHandler] = None,
+        database: Optional[ThingsDatabase] = None,
+        applescript: Optional[AppleScriptHandler] = None,
+        templates: Optional[TemplateStore] = None
+    ) -> None:
+        """Initialize the creation tools.
+        
+        Args:
+            xcallback: X-callback handler to use instead of the default one
+            database: Things3 database reader used to find created items
+            applescript: AppleScript handler whose name index learns new todos
+            templates: Project templates available to create-project
+        """
+        if xcallback is not None:
+            self.xcallback = xcallback
+        self.database = database
+        self.applescript = applescript
+        self.templates = templates
+        # IDs returned while other creates may still be looking for theirs
+        self._claimed_ids: Set[str] = set()
+        self._pending_creates = 0
+    
+    @cached_property
+    def xcallback(self) -> XCallbackHandler:
+        """X-callback handler, built on first use."""
+        return XCallbackHandler()
+    
+    @staticmethod
+    def _unavailable(error: UnavailableError) -> List[types.TextContent]:
+        """Report that Things3 could not be reached, rather than a plain failure."""
+        message = unavailable_message(error)
+        logger.warning(message)
+        return [types.TextContent(type="text", text=message)]
         
     def get_tool_definitions(self) -> List[types.Tool]:
         """Get MCP tool definitions for creation tools."""
+        template_names = self.templates.names() if self.templates is not None else []
+        template_description = "Name of a project template to build the project from"
+        if template_names:
+            template_description += f" ({', '.join(template_names)})"
         return [
             types.Tool(
                 name="create-project",
@@ -30,6 +111,21 @@ class CreateTools:
                         "when": {"type": "string", "description": "When to schedule the project"},
                         "deadline": {"type": "string", "description": "Project deadline"},
                         "tags": {"type": "array", "items": {"type": "string"}, "description": "Tags to assign"},
+                        "todos": {"type": "array", "items": _TODO_SCHEMA, "description": "Todos outside any heading"},
+                        "headings": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "title": {"type": "string", "description": "Heading title"},
+                                    "todos": {"type": "array", "items": _TODO_SCHEMA, "description": "Todos under the heading"},
+                                },
+                                "required": ["title"],
+                                "additionalProperties": False
+                            },
+                            "description": "Headings, each with its todos"
+                        },
+                        "template": {"type": "string", "description": template_description},
                     },
                     "required": ["title"],
                     "additionalProperties": False
@@ -58,6 +154,9 @@ class CreateTools:
     
     async def handle_create_project(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle project creation request."""
+        if any(arguments.get(key) for key in ("todos", "headings", "template")):
+            return await self._create_project_structure(arguments)
+        
         title = arguments["title"]
         notes = arguments.get("notes")
         area = arguments.get("area")
@@ -66,17 +165,64 @@ class CreateTools:
         tags = arguments.get("tags")
         
         try:
-            success = self.xcallback.create_project(
+            success, project_id = await self._create_and_find(title, True, partial(
+                self.xcallback.create_project,
                 title=title,
                 notes=notes,
                 area=area,
                 when=when,
                 deadline=deadline,
                 tags=tags
-            )
+            ))
             
             if success:
                 message = f"Successfully created project '{title}' in Things3"
+                if project_id:
+                    message += f" [id: {project_id}]"
+                logger.info(message)
+                return [types.TextContent(type="text", text=message)]
+            else:
+                message = f"Failed to create project '{title}'"
+                logger.error(message)
+                return [types.TextContent(type="text", text=message)]
+                
+        except UnavailableError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            message = f"Error creating project '{title}': {str(e)}"
+            logger.error(message)
+            return [types.TextContent(type="text", text=message)]
+    
+    async def _create_project_structure(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Create a project with its headings and todos in one Things JSON command."""
+        title = arguments["title"]
+        
+        try:
+            structure = validate_structure(
+                {key: value for key, value in arguments.items() if key not in ("title", "template")}
+            )
+            if arguments.get("template"):
+                if self.templates is None:
+                    raise ValueError("No project templates are configured")
+                structure = merge(self.templates.get(arguments["template"]), structure)
+        except ValueError as e:
+            message = f"Invalid project '{title}': {str(e)}"
+            logger.error(message)
+            return [types.TextContent(type="text", text=message)]
+        
+        try:
+            success, project_id = await self._create_and_find(title, True, partial(
+                self.xcallback.run_json, to_things_json(title, structure), f"project: {title}"
+            ))
+            
+            if success:
+                todo_count = len(structure["todos"]) + sum(len(h["todos"]) for h in structure["headings"])
+                message = (
+                    f"Successfully created project '{title}' with {len(structure['headings'])} headings "
+                    f"and {todo_count} todos in Things3"
+                )
+                if project_id:
+                    message += f" [id: {project_id}]"
                 logger.info(message)
                 return [types.TextContent(type="text", text=message)]
             else:
@@ -84,6 +230,8 @@ class CreateTools:
                 logger.error(message)
                 return [types.TextContent(type="text", text=message)]
                 
+        except UnavailableError as e:
+            return self._unavailable(e)
         except Exception as e:
             message = f"Error creating project '{title}': {str(e)}"
             logger.error(message)
@@ -101,7 +249,8 @@ class CreateTools:
         heading = arguments.get("heading")
         
         try:
-            success = self.xcallback.create_todo(
+            success, todo_id = await self._create_and_find(title, False, partial(
+                self.xcallback.create_todo,
                 title=title,
                 notes=notes,
                 when=when,
@@ -110,10 +259,12 @@ class CreateTools:
                 tags=tags,
                 list_name=list_name,
                 heading=heading
-            )
+            ))
             
             if success:
                 message = f"Successfully created todo '{title}' in Things3"
+                if todo_id:
+                    message += f" [id: {todo_id}]"
                 logger.info(message)
                 return [types.TextContent(type="text", text=message)]
             else:
@@ -121,7 +272,69 @@ class CreateTools:
                 logger.error(message)
                 return [types.TextContent(type="text", text=message)]
                 
+        except UnavailableError as e:
+            return self._unavailable(e)
         except Exception as e:
             message = f"Error creating todo '{title}': {str(e)}"
             logger.error(message)
-            return [types.TextContent(type="text", text=message)]
\ No newline at end of file
+            return [types.TextContent(type="text", text=message)]
+    
+    async def _create_and_find(
+        self, title: str, project: bool, create: Callable[[], bool]
+    ) -> Tuple[bool, Optional[str]]:
+        """Create an item and look up its ID.
+        
+        Args:
+            title: Title of the new item
+            project: Whether the item is a project
+            create: Opens the URL that creates the item, returning success
+            
+        Returns:
+            Tuple of whether the item was created and its ID, which is None
+            without a database or if it did not show up in time
+        """
+        if self.database is None or not self.database.available:
+            return await asyncio.to_thread(create), None
+        
+        self._pending_creates += 1
+        try:
+            existing = await asyncio.to_thread(self.database.item_ids, title, project)
+            started = time.time()
+            if not await asyncio.to_thread(create):
+                return False, None
+            return True, await self._created_id(title, project, started, existing or set())
+        finally:
+            self._pending_creates -= 1
+            # Later creates see the claimed IDs in their own snapshots
+            if not self._pending_creates:
+                self._claimed_ids.clear()
+    
+    async def _created_id(self, title: str, project: bool, since: float, existing: Set[str]) -> Optional[str]:
+        """Look up the ID of an item created at or after ``since``.
+        
+        Args:
+            title: Title of the new item
+            project: Whether the item is a project
+            since: Unix time taken before the item was created
+            existing: IDs with the same title from before the item was created
+            
+        Returns:
+            The ID, or None if it did not show up in time
+        """
+        assert self.database is not None
+        # creationDate has sub-second precision but the clocks may differ slightly
+        since -= 1.0
+        for _ in range(CREATED_LOOKUP_ATTEMPTS):
+            item_id = await asyncio.to_thread(
+                self.database.find_created, title, project, since, existing | self._claimed_ids
+            )
+            # Another create may have claimed the same ID while this lookup ran
+            if item_id and item_id not in self._claimed_ids:
+                self._claimed_ids.add(item_id)
+                if not project and self.applescript is not None:
+                    self.applescript.name_index.update([Task(item_id, title)])
+                return item_id
+            await asyncio.sleep(CREATED_LOOKUP_INTERVAL)
+        
+        logger.warning(f"Created '{title}' but could not find its ID in the Things3 database")
+        return None
@@ -0,0 +1,239 @@
+"""Health tool reporting on the Things3 bridge."""
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import mcp.types as types
+from loguru import logger
+
+from ..handlers import AppleScriptHandler, ThingsDatabase
+from ..handlers.breaker import CLOSED, OPEN
+from ..journal import STATUS_FAILED, STATUS_PENDING, WriteBehindQueue
+from ..mutations import MutationBatcher
+from ..prefetch import Prefetcher
+from ..selection import SelectionWatcher
+
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+UNAVAILABLE = "unavailable"
+
+
+class HealthTools:
+    """Reports latency and internal state so a supervisor can check the bridge.
+
+    The latency probes run concurrently and their result is reused for
+    ``probe_max_age`` seconds, so frequent callers cost a few short processes
+    at most. No probe goes through the circuit breaker, and the Things3 probe
+    is skipped while the circuit is open.
+    """
+
+    def __init__(
+        self,
+        applescript: AppleScriptHandler,
+        database: Optional[ThingsDatabase] = None,
+        load: Optional[Callable[[], Dict[str, int]]] = None,
+        prefetcher: Optional[Prefetcher] = None,
+        selection: Optional[SelectionWatcher] = None,
+        write_queue: Optional[WriteBehindQueue] = None,
+        batcher: Optional[MutationBatcher] = None,
+        probe_max_age: float = 2.0
+    ) -> None:
+        """Initialize the health tools.
+
+        Args:
+            applescript: AppleScript handler shared with other tool groups
+            database: Read-only database, when configured
+            load: Returns the number of running and waiting tool calls
+            prefetcher: Prefetcher whose counters are reported
+            selection: Selection watcher whose state is reported
+            write_queue: Write-behind queue whose depth is reported
+            batcher: Mutation batcher whose depth is reported
+            probe_max_age: Seconds a latency measurement is reused
+        """
+        self.applescript = applescript
+        self.database = database
+        self.load = load
+        self.prefetcher = prefetcher
+        self.selection = selection
+        self.write_queue = write_queue
+        self.batcher = batcher
+        self.probe_max_age = probe_max_age
+        self._latency: Optional[Dict[str, Any]] = None
+        self._probed_at = 0.0
+        self._probe_lock = asyncio.Lock()
+
+    def get_tool_definitions(self) -> List[types.Tool]:
+        """Get MCP tool definitions for the health tool."""
+        return [
+            types.Tool(
+                name="health",
+                description="Check that the Things3 bridge is healthy: latency, circuit breaker, queues and caches",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "probe": {
+                            "type": "boolean",
+                            "description": "Measure latency (default true); false only reports state"
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": ["text", "json"],
+                            "description": "Output format (default text)"
+                        },
+                    },
+                    "additionalProperties": False
+                },
+            ),
+        ]
+
+    async def measure_latency(self) -> Dict[str, Any]:
+        """Measure round trips to osascript, Things3 and the data source.
+
+        Returns:
+            Dictionary with ``osascript``, ``things3`` and ``data_source``
+            entries, each holding ``ok`` and ``ms`` (None when skipped)
+        """
+        async with self._probe_lock:
+            if self._latency is not None and time.monotonic() - self._probed_at < self.probe_max_age:
+                return self._latency
+
+            database_ping = self.database.ping if self.database is not None and self.database.available else None
+            use_database = database_ping is not None
+            skip_things = self.applescript.breaker.state == OPEN
+            osascript, things3, database = await asyncio.gather(
+                self._timed(self.applescript.ping),
+                self._timed(None if skip_things else self.applescript.probe),
+                self._timed(database_ping),
+            )
+            if not use_database:
+                database = things3
+
+            self._latency = {
+                "osascript": osascript,
+                "things3": things3,
+                "data_source": dict(database, type="database" if use_database else "applescript"),
+            }
+            self._probed_at = time.monotonic()
+            return self._latency
+
+    @staticmethod
+    async def _timed(check: Optional[Callable[[], bool]]) -> Dict[str, Any]:
+        if check is None:
+            return {"ok": None, "ms": None}
+        started = time.perf_counter()
+        ok = await asyncio.to_thread(check)
+        return {"ok": ok, "ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    def state(self) -> Dict[str, Any]:
+        """Collect breaker, queue and cache state without running anything.
+
+        Returns:
+            Dictionary of state sections
+        """
+        report: Dict[str, Any] = {"breaker": self.applescript.breaker.snapshot()}
+
+        queues: Dict[str, Any] = {"tool_calls": self.load() if self.load is not None else None}
+        if self.write_queue is not None:
+            counts = self.write_queue.journal.counts()
+            queues["write_behind"] = {"pending": counts[STATUS_PENDING], "failed": counts[STATUS_FAILED]}
+        if self.batcher is not None:
+            queues["batcher"] = {"pending": self.batcher.pending}
+        report["queues"] = queues
+
+        caches: Dict[str, Any] = {
+            "name_index": {"entries": len(self.applescript.name_index), "stale": self.applescript.name_index.is_stale},
+            "date_index": {"entries": len(self.applescript.date_index), "stale": self.applescript.date_index.is_stale},
+        }
+        if self.selection is not None:
+            caches["selection"] = {"watching": self.selection.running}
+        if self.prefetcher is not None:
+            caches["prefetch"] = self.prefetcher.stats()
+        report["caches"] = caches
+        return report
+
+    @staticmethod
+    def _status(report: Dict[str, Any]) -> str:
+        breaker = report["breaker"]["state"]
+        latency = report.get("latency")
+        if breaker == OPEN or (latency is not None and latency["things3"]["ok"] is False):
+            return UNAVAILABLE
+        write_behind = report["queues"].get("write_behind") or {}
+        if breaker != CLOSED or write_behind.get("failed"):
+            return DEGRADED
+        if latency is not None and not (latency["osascript"]["ok"] and latency["data_source"]["ok"]):
+            return DEGRADED
+        return HEALTHY
+
+    async def handle_health(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Handle health request."""
+        try:
+            report = self.state()
+            if arguments.get("probe", True):
+                report["latency"] = await self.measure_latency()
+            report = {"status": self._status(report), **report}
+
+            if arguments.get("format") == "json":
+                return [types.TextContent(type="text", text=json.dumps(report))]
+            return [types.TextContent(type="text", text=self._format_report(report))]
+
+        except Exception as e:
+            message = f"Error checking health: {str(e)}"
+            logger.error(message)
+            return [types.TextContent(type="text", text=message)]
+
+    @staticmethod
+    def _format_report(report: Dict[str, Any]) -> str:
+        """Format a health report as text."""
+        lines = [f"🩺 Things3 bridge: {report['status']}"]
+
+        latency = report.get("latency")
+        if latency is not None:
+            probes: List[Tuple[str, Dict[str, Any]]] = [
+                ("osascript", latency["osascript"]),
+                ("Things3", latency["things3"]),
+                (latency["data_source"]["type"], latency["data_source"]),
+            ]
+            parts = []
+            for label, probe in probes:
+                if probe["ok"] is None:
+                    parts.append(f"{label} skipped")
+                elif probe["ok"]:
+                    parts.append(f"{label} {probe['ms']} ms")
+                else:
+                    parts.append(f"{label} failed after {probe['ms']} ms")
+            lines.append("Latency: " + ", ".join(parts))
+
+        breaker = report["breaker"]
+        line = f"Circuit breaker: {breaker['state']} ({breaker['failures']} failures)"
+        if breaker["state"] == OPEN:
+            line += f", retrying in {breaker['retry_in']}s"
+        lines.append(line)
+
+        queues = report["queues"]
+        calls = queues["tool_calls"]
+        if calls is not None:
+            lines.append(
+                f"Tool calls: {calls['running']} running, {calls['waiting']} waiting (limit {calls['limit']})"
+            )
+        if "write_behind" in queues:
+            lines.append(
+                f"Write-behind queue: {queues['write_behind']['pending']} pending, "
+                f"{queues['write_behind']['failed']} failed"
+            )
+        if "batcher" in queues:
+            lines.append(f"Batcher: {queues['batcher']['pending']} pending")
+
+        caches = report["caches"]
+        for label, key in (("Name index", "name_index"), ("Date index", "date_index")):
+            index = caches[key]
+            lines.append(f"{label}: {index['entries']} entries ({'stale' if index['stale'] else 'fresh'})")
+        if "selection" in caches:
+            lines.append(f"Selection watcher: {'running' if caches['selection']['watching'] else 'stopped'}")
+        if "prefetch" in caches:
+            prefetch = caches["prefetch"]
+            lines.append(
+                f"Prefetch: {prefetch['hits']} hits, {prefetch['misses']} misses, {prefetch['pending']} pending"
+            )
+        return "\n".join(lines)
@@ -1,19 +1,107 @@
 """Management tools for Things3 task organization."""
 
-from typing import Any, Dict, List
+import asyncio
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
 
 import mcp.types as types
 from loguru import logger
 
-from ..handlers import AppleScriptHandler
+from ..bulk import DEFAULT_MAX_COUNT, BulkChange
+from ..handlers import AppleScriptHandler, UnavailableError, XCallbackHandler, unavailable_message
+from ..journal import STATUS_APPLIED, STATUS_FAILED, STATUS_PENDING, WriteBehindQueue
+from ..mutations import Mutation, MutationBatcher
+from ..query import LISTS, TodoQuery
+from ..updates import (
+    URL_CHUNK_SIZE,
+    VIA_APPLESCRIPT,
+    VIA_URL,
+    TodoUpdate,
+    choose_path,
+    to_changes,
+    to_things_json,
+)
+
+# Arguments of complete-todos and reschedule-todos that select todos by filter
+_BULK_FILTERS = ("list", "project", "area", "tag", "due_from", "due_to", "when_from", "when_to", "overdue", "text")
+
+_BULK_SELECTION = {
+    "ids": {"type": "array", "items": {"type": "string"}, "description": "Things IDs of the todos (instead of filters)"},
+    "list": {"type": "string", "enum": list(LISTS), "description": "Only todos in this list"},
+    "project": {"type": "string", "description": "Only todos in this project"},
+    "area": {"type": "string", "description": "Only todos in this area"},
+    "tag": {"type": "string", "description": "Only todos with this tag"},
+    "due_from": {"type": "string", "description": "Due on or after this date (YYYY-MM-DD, today, tomorrow, yesterday or +Nd/-Nd)"},
+    "due_to": {"type": "string", "description": "Due on or before this date (same formats as due_from)"},
+    "when_from": {"type": "string", "description": "Scheduled on or after this date (same formats as due_from)"},
+    "when_to": {"type": "string", "description": "Scheduled on or before this date (same formats as due_from)"},
+    "overdue": {"type": "boolean", "description": "Only todos due before today"},
+    "text": {"type": "string", "description": "Text contained in the title or notes"},
+    "max_count": {
+        "type": "integer",
+        "minimum": 1,
+        "description": f"Change nothing if more todos match (default: {DEFAULT_MAX_COUNT})"
+    },
+    "dry_run": {"type": "boolean", "description": "Only list the todos that would change"},
+}
 
 
 class ManageTools:
     """Handles management and organization of Things3 tasks."""
     
-    def __init__(self) -> None:
-        """Initialize the manage tools."""
-        self.applescript = AppleScriptHandler()
+    write_queue: Optional[WriteBehindQueue] = None
+    batcher: Optional[MutationBatcher] = None
+    auth_token: Optional[str] = None
+    url_batch_size: int = 10
+    
+    def __init__(
+        self,
+        applescript: Optional[AppleScriptHandler] = None,
+        write_queue: Optional[WriteBehindQueue] = None,
+        batcher: Optional[MutationBatcher] = None,
+        xcallback: Optional[XCallbackHandler] = None,
+        auth_token: Optional[str] = None,
+        url_batch_size: int = 10
+    ) -> None:
+        """Initialize the manage tools.
+        
+        Args:
+            applescript: AppleScript handler to share with other tool groups
+            write_queue: Write-behind queue; when set, mutations are journaled
+                and acknowledged immediately instead of applied inline
+            batcher: Mutation batcher; when set, inline mutations issued close
+                together are coalesced into one script run
+            xcallback: X-callback handler used for URL scheme updates
+            auth_token: Things URL scheme auth token; without it every update
+                goes through AppleScript
+            url_batch_size: Bulk updates of at least this many todos go
+                through the URL scheme
+        """
+        if applescript is not None:
+            self.applescript = applescript
+        if xcallback is not None:
+            self.xcallback = xcallback
+        self.write_queue = write_queue
+        self.batcher = batcher
+        self.auth_token = auth_token
+        self.url_batch_size = url_batch_size
+    
+    @cached_property
+    def applescript(self) -> AppleScriptHandler:
+        """AppleScript handler, built on first use."""
+        return AppleScriptHandler()
+    
+    @cached_property
+    def xcallback(self) -> XCallbackHandler:
+        """X-callback handler, built on first use."""
+        return XCallbackHandler()
+    
+    @staticmethod
+    def _unavailable(error: UnavailableError) -> List[types.TextContent]:
+        """Report that Things3 could not be reached, rather than a plain failure."""
+        message = unavailable_message(error)
+        logger.warning(message)
+        return [types.TextContent(type="text", text=message)]
         
     def get_tool_definitions(self) -> List[types.Tool]:
         """Get MCP tool definitions for management tools."""
@@ -25,9 +113,10 @@ class ManageTools:
                     "type": "object",
                     "properties": {
                         "task": {"type": "string", "description": "Name of the task"},
+                        "id": {"type": "string", "description": "Things ID of the task (preferred over name)"},
                         "project": {"type": "string", "description": "Name of the project to assign"},
                     },
-                    "required": ["task", "project"],
+                    "required": ["project"],
                     "additionalProperties": False
                 },
             ),
@@ -38,9 +127,10 @@ class ManageTools:
                     "type": "object",
                     "properties": {
                         "task": {"type": "string", "description": "Name of the task"},
+                        "id": {"type": "string", "description": "Things ID of the task (preferred over name)"},
                         "area": {"type": "string", "description": "Name of the area to assign"},
                     },
-                    "required": ["task", "area"],
+                    "required": ["area"],
                     "additionalProperties": False
                 },
             ),
@@ -51,9 +141,10 @@ class ManageTools:
                     "type": "object",
                     "properties": {
                         "task": {"type": "string", "description": "Name of the task"},
+                        "id": {"type": "string", "description": "Things ID of the task (preferred over name)"},
                         "tags": {"type": "array", "items": {"type": "string"}, "description": "List of tags to set"},
                     },
-                    "required": ["task", "tags"],
+                    "required": ["tags"],
                     "additionalProperties": False
                 },
             ),
@@ -66,6 +157,19 @@ class ManageTools:
                     "additionalProperties": False
                 },
             ),
+            types.Tool(
+                name="mutation-status",
+                description="Show pending and failed write-behind operations",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "operation_id": {"type": "integer", "description": "Show a single operation"},
+                        "include_applied": {"type": "boolean", "description": "Also list applied operations"},
+                        "limit": {"type": "integer", "description": "Maximum operations to list (default 50)"},
+                    },
+                    "additionalProperties": False
+                },
+            ),
             types.Tool(
                 name="rename-task",
                 description="Rename a task in Things3",
@@ -73,21 +177,133 @@ class ManageTools:
                     "type": "object",
                     "properties": {
                         "old_name": {"type": "string", "description": "Current name of the task"},
+                        "id": {"type": "string", "description": "Things ID of the task (preferred over name)"},
                         "new_name": {"type": "string", "description": "New name for the task"},
                     },
-                    "required": ["old_name", "new_name"],
+                    "required": ["new_name"],
+                    "additionalProperties": False
+                },
+            ),
+            types.Tool(
+                name="update-todos",
+                description="Edit many todos by ID at once: title, notes, when, deadline, tags, list and completion",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "updates": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "id": {"type": "string", "description": "Things ID of the todo"},
+                                    "title": {"type": "string", "description": "New title"},
+                                    "notes": {"type": "string", "description": "New notes (replaces existing notes)"},
+                                    "when": {"type": "string", "description": "today, tomorrow, evening, anytime, someday or a date"},
+                                    "deadline": {"type": "string", "description": "Deadline date; empty to clear"},
+                                    "tags": {"type": "array", "items": {"type": "string"}, "description": "Tags (replace existing tags)"},
+                                    "list": {"type": "string", "description": "Project or area to move the todo to"},
+                                    "completed": {"type": "boolean", "description": "Complete (true) or reopen (false)"},
+                                },
+                                "required": ["id"],
+                                "additionalProperties": False
+                            },
+                            "description": "One entry per todo"
+                        },
+                        "via": {
+                            "type": "string",
+                            "enum": [VIA_APPLESCRIPT, VIA_URL],
+                            "description": "Force a write path (default: chosen by fields and batch size)"
+                        },
+                    },
+                    "required": ["updates"],
+                    "additionalProperties": False
+                },
+            ),
+            types.Tool(
+                name="complete-todos",
+                description=(
+                    "Complete many open todos in one step, given by ID or by filters such as "
+                    "overdue todos in Today or todos tagged errand"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": _BULK_SELECTION,
+                    "additionalProperties": False
+                },
+            ),
+            types.Tool(
+                name="reschedule-todos",
+                description=(
+                    "Set the when date or deadline of many open todos in one step, given by ID or by filters"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "when": {
+                            "type": "string",
+                            "description": "New when date (same formats as due_from), anytime or someday"
+                        },
+                        "deadline": {"type": "string", "description": "New deadline (same formats as due_from)"},
+                        **_BULK_SELECTION,
+                    },
                     "additionalProperties": False
                 },
             ),
         ]
     
+    async def _resolve_task_id(self, arguments: Dict[str, Any], name_key: str = "task") -> str:
+        """Resolve the target of a mutation to a single Things ID.
+        
+        Args:
+            arguments: Tool arguments containing either ``id`` or a task name
+            name_key: Argument holding the task name
+            
+        Returns:
+            Things ID of the task
+            
+        Raises:
+            ValueError: If no target is given, the name is unknown, or the
+                name matches more than one task
+        """
+        task_id = arguments.get("id")
+        if task_id:
+            return str(task_id)
+        
+        task_name = arguments.get(name_key)
+        if not task_name:
+            raise ValueError(f"Either 'id' or '{name_key}' is required")
+        
+        task_ids = await asyncio.to_thread(self.applescript.resolve_task_ids, task_name)
+        if not task_ids:
+            raise ValueError(f"Task '{task_name}' not found")
+        if len(task_ids) > 1:
+            raise ValueError(
+                f"Task name '{task_name}' matches {len(task_ids)} tasks "
+                f"({', '.join(task_ids)}); pass 'id' to choose one"
+            )
+        return task_ids[0]
+    
+    def _queue_mutation(self, mutation: Mutation) -> List[types.TextContent]:
+        """Journal a mutation for the write-behind worker and acknowledge it."""
+        assert self.write_queue is not None
+        op_id = self.write_queue.submit(mutation)
+        message = f"Queued operation {op_id}: {mutation.describe()}"
+        return [types.TextContent(type="text", text=message)]
+    
     async def handle_assign_project(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle project assignment request."""
-        task_name = arguments["task"]
+        task_name = arguments.get("task") or arguments.get("id")
         project_name = arguments["project"]
         
         try:
-            success = self.applescript.assign_project(task_name, project_name)
+            task_id = await self._resolve_task_id(arguments)
+            mutation = Mutation("assign_project", task_id, project_name)
+            if self.write_queue is not None:
+                return self._queue_mutation(mutation)
+            if self.batcher is not None:
+                success = await self.batcher.submit(mutation)
+            else:
+                success = await asyncio.to_thread(self.applescript.assign_project, task_id, project_name)
             
             if success:
                 message = f"Successfully assigned project '{project_name}' to task '{task_name}'"
@@ -105,11 +321,18 @@ class ManageTools:
     
     async def handle_assign_area(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle area assignment request."""
-        task_name = arguments["task"]
+        task_name = arguments.get("task") or arguments.get("id")
         area_name = arguments["area"]
         
         try:
-            success = self.applescript.assign_area(task_name, area_name)
+            task_id = await self._resolve_task_id(arguments)
+            mutation = Mutation("assign_area", task_id, area_name)
+            if self.write_queue is not None:
+                return self._queue_mutation(mutation)
+            if self.batcher is not None:
+                success = await self.batcher.submit(mutation)
+            else:
+                success = await asyncio.to_thread(self.applescript.assign_area, task_id, area_name)
             
             if success:
                 message = f"Successfully assigned area '{area_name}' to task '{task_name}'"
@@ -127,11 +350,18 @@ class ManageTools:
     
     async def handle_set_tags(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle tag setting request."""
-        task_name = arguments["task"]
+        task_name = arguments.get("task") or arguments.get("id")
         tags = arguments["tags"]
         
         try:
-            success = self.applescript.set_tags(task_name, tags)
+            task_id = await self._resolve_task_id(arguments)
+            mutation = Mutation("set_tags", task_id, tags)
+            if self.write_queue is not None:
+                return self._queue_mutation(mutation)
+            if self.batcher is not None:
+                success = await self.batcher.submit(mutation)
+            else:
+                success = await asyncio.to_thread(self.applescript.set_tags, task_id, tags)
             
             if success:
                 tags_str = ", ".join(tags)
@@ -151,7 +381,7 @@ class ManageTools:
     async def handle_complete_selected(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle complete selected todos request."""
         try:
-            result = self.applescript.complete_selected_todos()
+            result = await asyncio.to_thread(self.applescript.complete_selected_todos)
             
             if result.get("success"):
                 message = result.get("message", "Successfully completed selected todos")
@@ -170,11 +400,18 @@ class ManageTools:
     
     async def handle_rename_task(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle task renaming request."""
-        old_name = arguments["old_name"]
+        old_name = arguments.get("old_name") or arguments.get("id")
         new_name = arguments["new_name"]
         
         try:
-            success = self.applescript.rename_task(old_name, new_name)
+            task_id = await self._resolve_task_id(arguments, name_key="old_name")
+            mutation = Mutation("rename_task", task_id, new_name)
+            if self.write_queue is not None:
+                return self._queue_mutation(mutation)
+            if self.batcher is not None:
+                success = await self.batcher.submit(mutation)
+            else:
+                success = await asyncio.to_thread(self.applescript.rename_task, task_id, new_name)
             
             if success:
                 message = f"Successfully renamed task from '{old_name}' to '{new_name}'"
@@ -188,4 +425,182 @@ class ManageTools:
         except Exception as e:
             message = f"Error renaming task: {str(e)}"
             logger.error(message)
-            return [types.TextContent(type="text", text=message)]
\ No newline at end of file
+            return [types.TextContent(type="text", text=message)]
+    
+    async def handle_mutation_status(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Handle write-behind status request."""
+        if self.write_queue is None:
+            message = "Write-behind mode is disabled; mutations are applied immediately."
+            return [types.TextContent(type="text", text=message)]
+        
+        try:
+            journal = self.write_queue.journal
+            
+            op_id = arguments.get("operation_id")
+            if op_id is not None:
+                entry = journal.get(op_id)
+                if entry is None:
+                    return [types.TextContent(type="text", text=f"Operation {op_id} not found")]
+                entries = [entry]
+            else:
+                statuses = [STATUS_PENDING, STATUS_FAILED]
+                if arguments.get("include_applied"):
+                    statuses.append(STATUS_APPLIED)
+                entries = journal.entries(statuses, limit=arguments.get("limit", 50))
+            
+            counts = journal.counts()
+            response_lines = [
+                f"📝 Write-behind queue: {counts[STATUS_PENDING]} pending, "
+                f"{counts[STATUS_FAILED]} failed, {counts[STATUS_APPLIED]} applied"
+            ]
+            for entry in entries:
+                line = f"\n• #{entry.op_id} [{entry.status}] {entry.mutation.describe()}"
+                if entry.attempts:
+                    line += f" (attempts: {entry.attempts})"
+                if entry.last_error:
+                    line += f" - {entry.last_error}"
+                response_lines.append(line)
+            
+            return [types.TextContent(type="text", text="\n".join(response_lines))]
+            
+        except Exception as e:
+            message = f"Error reading mutation status: {str(e)}"
+            logger.error(message)
+            return [types.TextContent(type="text", text=message)]
+    
+    async def handle_update_todos(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Handle bulk todo update request."""
+        try:
+            updates = [
+                TodoUpdate.from_arguments(value, f"updates[{i}]")
+                for i, value in enumerate(arguments.get("updates") or [])
+            ]
+            if not updates:
+                raise ValueError("No updates given")
+            via = choose_path(updates, self.auth_token, self.url_batch_size, arguments.get("via"))
+            
+            if via == VIA_URL:
+                applied, failed = await self._update_via_url(updates)
+                urls = (len(updates) + URL_CHUNK_SIZE - 1) // URL_CHUNK_SIZE
+                path = f"the Things URL scheme ({urls} {'URL' if urls == 1 else 'URLs'})"
+            else:
+                applied, failed = await self._update_via_applescript(updates)
+                path = "AppleScript"
+            self._refresh_indexes(applied)
+            
+            message = f"Updated {len(applied)} of {len(updates)} todos via {path}"
+            if failed:
+                message += f"\nFailed: {', '.join(update.describe() for update in failed)}"
+                logger.error(message)
+            else:
+                logger.info(message)
+            return [types.TextContent(type="text", text=message)]
+            
+        except UnavailableError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            message = f"Error updating todos: {str(e)}"
+            logger.error(message)
+            return [types.TextContent(type="text", text=message)]
+    
+    async def _update_via_applescript(self, updates: List[TodoUpdate]) -> Tuple[List[TodoUpdate], List[TodoUpdate]]:
+        """Apply updates in one ``apply_changes`` run; an update fails if any of its changes does."""
+        changes, owners = to_changes(updates)
+        flags = await asyncio.to_thread(self.applescript.apply_changes, changes)
+        succeeded = [True] * len(updates)
+        for owner, flag in zip(owners, flags):
+            succeeded[owner] = succeeded[owner] and flag
+        return (
+            [update for update, ok in zip(updates, succeeded) if ok],
+            [update for update, ok in zip(updates, succeeded) if not ok],
+        )
+    
+    async def _update_via_url(self, updates: List[TodoUpdate]) -> Tuple[List[TodoUpdate], List[TodoUpdate]]:
+        """Send updates as Things JSON, one URL per chunk; Things reports no result per todo.
+        
+        Raises:
+            UnavailableError: If Things3 could not be reached before any chunk was sent
+        """
+        for start in range(0, len(updates), URL_CHUNK_SIZE):
+            chunk = updates[start:start + URL_CHUNK_SIZE]
+            try:
+                success = await asyncio.to_thread(
+                    self.xcallback.run_json, to_things_json(chunk), f"{len(chunk)} todo updates", self.auth_token
+                )
+            except UnavailableError:
+                if not start:
+                    raise
+                success = False
+            if not success:
+                return updates[:start], updates[start:]
+        return updates, []
+    
+    def _refresh_indexes(self, applied: List[TodoUpdate]) -> None:
+        """Keep the name and date indexes in step with applied updates."""
+        for update in applied:
+            if "title" in update.changes:
+                self.applescript.name_index.rename(update.task_id, update.changes["title"])
+            if update.changes.get("completed") is True:
+                self.applescript.name_index.discard(update.task_id)
+        if any({"when", "deadline", "completed"} & set(update.changes) for update in applied):
+            self.applescript.date_index.invalidate()
+    
+    async def handle_complete_todos(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Handle bulk completion request."""
+        return await self._handle_bulk_change(BulkChange(complete=True), arguments)
+    
+    async def handle_reschedule_todos(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Handle bulk rescheduling request."""
+        try:
+            change = BulkChange.reschedule(arguments.get("when"), arguments.get("deadline"))
+        except ValueError as e:
+            return [types.TextContent(type="text", text=f"Error rescheduling todos: {str(e)}")]
+        return await self._handle_bulk_change(change, arguments)
+    
+    async def _handle_bulk_change(self, change: BulkChange, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Apply a bulk change to the todos selected by ``ids`` or filters."""
+        action = "completing" if change.complete else "rescheduling"
+        try:
+            ids = arguments.get("ids") or None
+            filters = {key: arguments[key] for key in _BULK_FILTERS if arguments.get(key)}
+            if ids and filters:
+                raise ValueError("Pass either 'ids' or filters, not both")
+            if not ids and not filters:
+                raise ValueError("Pass 'ids' or at least one filter")
+            query = TodoQuery.from_arguments(filters) if filters else None
+            dry_run = bool(arguments.get("dry_run"))
+            
+            result = await asyncio.to_thread(
+                self.applescript.bulk_change,
+                change,
+                query=query,
+                ids=ids,
+                max_count=int(arguments.get("max_count", DEFAULT_MAX_COUNT)),
+                dry_run=dry_run,
+            )
+            
+            if not result.get("success"):
+                message = f"Failed {action} todos: {result.get('error', 'Unknown error')}"
+                logger.error(message)
+                return [types.TextContent(type="text", text=message)]
+            
+            if result["aborted"]:
+                message = (
+                    f"{result['matched']} todos match, more than max_count allows; nothing was changed. "
+                    f"Narrow the selection or raise max_count."
+                )
+            elif dry_run:
+                message = f"{result['matched']} todos would be {change.describe()}"
+            else:
+                message = f"{len(result['ids'])} todos {change.describe()}"
+                logger.info(message)
+            if result["ids"]:
+                message += f"\nIDs: {', '.join(result['ids'])}"
+            if result["skipped"]:
+                message += f"\nSkipped (not found or not open): {', '.join(result['skipped'])}"
+            return [types.TextContent(type="text", text=message)]
+            
+        except Exception as e:
+            message = f"Error {action} todos: {str(e)}"
+            logger.error(message)
+            return [types.TextContent(type="text", text=message)]
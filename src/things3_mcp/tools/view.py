@@ -1,11 +1,16 @@
 """View tools for querying Things3 data."""
 
-from typing import Any, Dict, List
+import asyncio
+from functools import cached_property
+from typing import Any, Dict, List, Optional
 
 import mcp.types as types
 from loguru import logger
 
-from ..handlers import AppleScriptHandler
+from ..handlers import AppleScriptHandler, ThingsDatabase, UnavailableError, unavailable_message
+from ..models import Task, format_date
+from ..query import LISTS, STATUSES, LogbookCursor, TodoQuery, parse_timestamp
+from ..selection import SelectionWatcher
 
 
 # List configurations for Things3 smart lists
@@ -40,13 +45,45 @@ LIST_CONFIGS = {
     },
 }
 
+# Optional todo fields for view-project, besides the title and ID
+PROJECT_FIELDS = ("notes", "due_date", "when", "tags", "checklist")
+
 
 class ViewTools:
     """Handles viewing and querying of Things3 data."""
     
-    def __init__(self) -> None:
-        """Initialize the view tools."""
-        self.applescript = AppleScriptHandler()
+    # Serves get-selected-todos from a cache when set
+    selection: Optional[SelectionWatcher] = None
+    
+    def __init__(
+        self,
+        applescript: Optional[AppleScriptHandler] = None,
+        database: Optional[ThingsDatabase] = None,
+        selection: Optional[SelectionWatcher] = None
+    ) -> None:
+        """Initialize the view tools.
+        
+        Args:
+            applescript: AppleScript handler to share with other tool groups
+            database: Things3 database reader to share with other tool groups
+            selection: Selection watcher to serve selected todos from
+        """
+        if applescript is not None:
+            self.applescript = applescript
+        if database is not None:
+            self.database = database
+        if selection is not None:
+            self.selection = selection
+    
+    @cached_property
+    def applescript(self) -> AppleScriptHandler:
+        """AppleScript handler, built on first use."""
+        return AppleScriptHandler()
+    
+    @cached_property
+    def database(self) -> ThingsDatabase:
+        """Things3 database reader, built on first use."""
+        return ThingsDatabase()
         
     def get_tool_definitions(self) -> List[types.Tool]:
         """Get MCP tool definitions for view tools."""
@@ -86,6 +123,149 @@ class ViewTools:
                     "additionalProperties": False
                 },
             ),
+            types.Tool(
+                name="view-hierarchy",
+                description=(
+                    "View all areas with their projects, headings and open-todo counts in one call, "
+                    "optionally with the open todos themselves"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "include_todos": {
+                            "type": "boolean",
+                            "description": "List the open todos under each project and heading (default: false)"
+                        }
+                    },
+                    "additionalProperties": False
+                },
+            ),
+            types.Tool(
+                name="view-project",
+                description=(
+                    "View the open todos of one project, grouped by heading, with optional notes, "
+                    "dates, tags and checklist items"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "project": {
+                            "type": "string",
+                            "description": "Project name or Things ID"
+                        },
+                        "fields": {
+                            "type": "array",
+                            "items": {"type": "string", "enum": list(PROJECT_FIELDS)},
+                            "description": "Todo fields to include besides title and ID (default: none)"
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "description": "Number of todos to skip (default: 0)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": "Maximum number of todos to return (default: 50)"
+                        }
+                    },
+                    "required": ["project"],
+                    "additionalProperties": False
+                },
+            ),
+            types.Tool(
+                name="query-todos",
+                description=(
+                    "Find todos matching filters. Filters are combined with AND and "
+                    "evaluated inside Things3, so only matching todos are returned."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "list": {
+                            "type": "string",
+                            "enum": list(LISTS),
+                            "description": "Only todos in this list"
+                        },
+                        "project": {
+                            "type": "string",
+                            "description": "Only todos in this project"
+                        },
+                        "area": {
+                            "type": "string",
+                            "description": "Only todos in this area"
+                        },
+                        "tag": {
+                            "type": "string",
+                            "description": "Only todos with this tag"
+                        },
+                        "due_from": {
+                            "type": "string",
+                            "description": "Due on or after this date (YYYY-MM-DD, today, tomorrow, yesterday or +Nd/-Nd)"
+                        },
+                        "due_to": {
+                            "type": "string",
+                            "description": "Due on or before this date (same formats as due_from)"
+                        },
+                        "when_from": {
+                            "type": "string",
+                            "description": "Scheduled on or after this date (same formats as due_from)"
+                        },
+                        "when_to": {
+                            "type": "string",
+                            "description": "Scheduled on or before this date (same formats as due_from)"
+                        },
+                        "overdue": {
+                            "type": "boolean",
+                            "description": "Only open todos due before today"
+                        },
+                        "status": {
+                            "type": "string",
+                            "enum": list(STATUSES),
+                            "description": "Todo status (default: open)"
+                        },
+                        "text": {
+                            "type": "string",
+                            "description": "Text contained in the title or notes"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": "Maximum number of todos to return (default: 100)"
+                        }
+                    },
+                    "additionalProperties": False
+                },
+            ),
+            types.Tool(
+                name="view-logbook",
+                description=(
+                    "View completed todos from the Things3 Logbook, oldest first. "
+                    "Pass the returned cursor back to fetch only todos completed since the last call."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "since": {
+                            "type": "string",
+                            "description": (
+                                "Only todos completed at or after this time: YYYY-MM-DDTHH:MM:SS, "
+                                "YYYY-MM-DD, today, yesterday or -Nd"
+                            )
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Cursor returned by a previous call; continues after its last todo"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": "Maximum number of todos to return (default: 50)"
+                        }
+                    },
+                    "additionalProperties": False
+                },
+            ),
             types.Tool(
                 name="get-selected-todos",
                 description="Get currently selected todos in Things3",
@@ -99,10 +279,34 @@ class ViewTools:
         
         return tools
     
-    def _handle_list_view(self, list_config: Dict[str, str], list_name: str) -> List[types.TextContent]:
+    @staticmethod
+    def _unavailable(error: UnavailableError) -> List[types.TextContent]:
+        """Report that Things3 could not be reached, rather than an empty result."""
+        message = unavailable_message(error)
+        logger.warning(message)
+        return [types.TextContent(type="text", text=message)]
+    
+    @staticmethod
+    def _format_todo_line(todo: Task) -> str:
+        """Format one todo as a bullet line for list output."""
+        title = todo.title.strip() or "Untitled Todo"
+        notes = todo.notes
+        
+        line = f"\n• {title}"
+        if todo.due_date:
+            line += f" (Due: {format_date(todo.due_date)})"
+        if todo.when:
+            line += f" (When: {format_date(todo.when)})"
+        if notes:
+            line += f" - {notes[:50]}{'...' if len(notes) > 50 else ''}"
+        if todo.id:
+            line += f" [id: {todo.id}]"
+        return line
+    
+    async def _handle_list_view(self, list_config: Dict[str, str], list_name: str) -> List[types.TextContent]:
         """Common handler for list-based view requests."""
         try:
-            todos = self.applescript.get_list_tasks(list_config["list_name"])
+            todos = await asyncio.to_thread(self.applescript.get_list_tasks, list_config["list_name"])
             
             if not todos:
                 return [types.TextContent(
@@ -112,23 +316,12 @@ class ViewTools:
             
             response_lines = [f"{list_config['emoji']} {list_config['display_name']}:"]
             for todo in todos:
-                title = todo.get("title", "Untitled Todo").strip()
-                due_date = todo.get("due_date", "No Due Date")
-                when_date = todo.get("when", "No Scheduled Date")
-                notes = todo.get("notes", "")
-                
-                line = f"\n• {title}"
-                if due_date != "No Due Date":
-                    line += f" (Due: {due_date})"
-                if when_date != "No Scheduled Date":
-                    line += f" (When: {when_date})"
-                if notes:
-                    line += f" - {notes[:50]}{'...' if len(notes) > 50 else ''}"
-                    
-                response_lines.append(line)
+                response_lines.append(self._format_todo_line(todo))
             
             return [types.TextContent(type="text", text="\n".join(response_lines))]
             
+        except UnavailableError as e:
+            return self._unavailable(e)
         except Exception as e:
             message = f"Error retrieving {list_name.lower()} todos: {str(e)}"
             logger.error(message)
@@ -136,24 +329,248 @@ class ViewTools:
 
     async def handle_view_inbox(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle inbox viewing request."""
-        return self._handle_list_view(LIST_CONFIGS["inbox"], "inbox")
+        return await self._handle_list_view(LIST_CONFIGS["inbox"], "inbox")
     
     async def handle_view_today(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle today's todos viewing request."""
-        return self._handle_list_view(LIST_CONFIGS["today"], "today")
+        return await self._handle_list_view(LIST_CONFIGS["today"], "today")
     
     async def handle_view_anytime(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle Anytime todos viewing request."""
-        return self._handle_list_view(LIST_CONFIGS["anytime"], "anytime")
+        return await self._handle_list_view(LIST_CONFIGS["anytime"], "anytime")
     
     async def handle_view_someday(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle Someday todos viewing request."""
-        return self._handle_list_view(LIST_CONFIGS["someday"], "someday")
+        return await self._handle_list_view(LIST_CONFIGS["someday"], "someday")
+    
+    async def handle_query_todos(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Handle a filtered todo query."""
+        try:
+            query = TodoQuery.from_arguments(arguments)
+        except ValueError as e:
+            return [types.TextContent(type="text", text=f"Invalid query: {str(e)}")]
+        
+        try:
+            todos = await asyncio.to_thread(self.applescript.query_todos, query)
+            
+            if not todos:
+                return [types.TextContent(type="text", text="No todos match the query.")]
+            
+            response_lines = [f"🔎 {len(todos)} matching todos:"]
+            for todo in todos:
+                line = self._format_todo_line(todo)
+                context = [name for name in (todo.project, todo.area) if name]
+                if todo.tags:
+                    context.append(f"tags: {', '.join(todo.tags)}")
+                if context:
+                    line += f" {{{'; '.join(context)}}}"
+                response_lines.append(line)
+            
+            if len(todos) >= query.limit:
+                response_lines.append(f"\n(Showing the first {query.limit}; raise 'limit' to see more.)")
+            
+            return [types.TextContent(type="text", text="\n".join(response_lines))]
+            
+        except UnavailableError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            message = f"Error querying todos: {str(e)}"
+            logger.error(message)
+            return [types.TextContent(type="text", text=message)]
+    
+    def _get_hierarchy(self, include_todos: bool) -> List[Dict[str, Any]]:
+        """Read the hierarchy from the database, or through AppleScript without it."""
+        hierarchy = self.database.get_hierarchy(include_todos)
+        if hierarchy is None:
+            hierarchy = self.applescript.get_hierarchy(include_todos)
+        return hierarchy
+    
+    async def handle_view_hierarchy(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Handle an area/project hierarchy request."""
+        try:
+            include_todos = bool(arguments.get("include_todos", False))
+            areas = await asyncio.to_thread(self._get_hierarchy, include_todos)
+            
+            if not areas:
+                return [types.TextContent(type="text", text="No areas or projects found in Things3.")]
+            
+            response_lines = ["🗂️ Things3 areas and projects:"]
+            for area in areas:
+                line = f"\n▸ {area['title'] or 'No Area'}"
+                if area["id"]:
+                    line += f" [id: {area['id']}]"
+                response_lines.append(line)
+                
+                for project in area["projects"]:
+                    response_lines.append(
+                        f"  • {project['title']} ({project['open_count']} open) [id: {project['id']}]"
+                    )
+                    for todo in project["todos"]:
+                        response_lines.append(f"    - {todo.title} [id: {todo.id}]")
+                    for heading in project["headings"]:
+                        response_lines.append(f"    ◦ {heading['title']} ({heading['open_count']} open)")
+                        for todo in heading["todos"]:
+                            response_lines.append(f"      - {todo.title} [id: {todo.id}]")
+            
+            return [types.TextContent(type="text", text="\n".join(response_lines))]
+            
+        except UnavailableError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            message = f"Error retrieving hierarchy: {str(e)}"
+            logger.error(message)
+            return [types.TextContent(type="text", text=message)]
+    
+    def _get_project(self, project: str, offset: int, limit: int, checklists: bool) -> Dict[str, Any]:
+        """Read a project page from the database, or through AppleScript without it.
+        
+        AppleScript sees neither headings nor checklists, and can only find
+        a project by name, so the fallback returns plain todos.
+        """
+        page = self.database.get_project(project, offset, limit, checklists)
+        if page is not None:
+            return page
+        
+        todos = self.applescript.query_todos(TodoQuery(project=project, limit=offset + limit))
+        return {
+            "id": "",
+            "title": project,
+            "notes": "",
+            "total": None,
+            "headings": {},
+            "todos": todos[offset:],
+            "todo_headings": {},
+            "checklists": {},
+        }
+    
+    @staticmethod
+    def _format_project_todo(todo: Task, fields: List[str], indent: str) -> str:
+        """Format one todo of a project with the requested fields."""
+        line = f"{indent}• {todo.title.strip() or 'Untitled Todo'}"
+        if "due_date" in fields and todo.due_date:
+            line += f" (Due: {format_date(todo.due_date)})"
+        if "when" in fields and todo.when:
+            line += f" (When: {format_date(todo.when)})"
+        if "tags" in fields and todo.tags:
+            line += f" {{tags: {', '.join(todo.tags)}}}"
+        if todo.id:
+            line += f" [id: {todo.id}]"
+        if "notes" in fields and todo.notes:
+            notes = todo.notes.replace("\n", " ")
+            line += f"\n{indent}  {notes[:200]}{'...' if len(notes) > 200 else ''}"
+        return line
+    
+    async def handle_view_project(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Handle a project contents request."""
+        project = (arguments.get("project") or "").strip()
+        fields = list(arguments.get("fields") or [])
+        try:
+            offset = int(arguments.get("offset", 0))
+            limit = int(arguments.get("limit", 50))
+            if not project:
+                raise ValueError("project is required")
+            if offset < 0 or limit < 1:
+                raise ValueError("offset must be at least 0 and limit at least 1")
+            unknown = [name for name in fields if name not in PROJECT_FIELDS]
+            if unknown:
+                raise ValueError(
+                    f"Unknown fields: {', '.join(unknown)}; expected any of: {', '.join(PROJECT_FIELDS)}"
+                )
+        except ValueError as e:
+            return [types.TextContent(type="text", text=f"Invalid project request: {str(e)}")]
+        
+        try:
+            page = await asyncio.to_thread(self._get_project, project, offset, limit, "checklist" in fields)
+            
+            if not page:
+                return [types.TextContent(type="text", text=f"Project '{project}' not found in Things3.")]
+            
+            todos = page["todos"]
+            total = page["total"]
+            header = f"📂 {page['title']}"
+            if page["id"]:
+                header += f" [id: {page['id']}]"
+            response_lines = [header]
+            if page["notes"]:
+                response_lines.append(page["notes"])
+            
+            if not todos:
+                response_lines.append("\nNo open todos on this page.")
+            else:
+                span = f"{offset + 1}-{offset + len(todos)}"
+                response_lines.append(f"\nTodos {span} of {total}:" if total is not None else f"\nTodos {span}:")
+            
+            current_heading = None
+            for todo in todos:
+                heading_id = page["todo_headings"].get(todo.id)
+                if heading_id != current_heading:
+                    current_heading = heading_id
+                    response_lines.append(f"\n◦ {page['headings'].get(heading_id, 'Untitled Heading')}")
+                indent = "  " if heading_id else ""
+                response_lines.append(self._format_project_todo(todo, fields, indent))
+                for title, done in page["checklists"].get(todo.id, []):
+                    response_lines.append(f"{indent}    {'☑' if done else '☐'} {title}")
+            
+            more = offset + len(todos) < total if total is not None else len(todos) >= limit
+            if todos and more:
+                response_lines.append(f"\n(More todos follow; call again with offset {offset + len(todos)}.)")
+            
+            return [types.TextContent(type="text", text="\n".join(response_lines))]
+            
+        except UnavailableError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            message = f"Error retrieving project: {str(e)}"
+            logger.error(message)
+            return [types.TextContent(type="text", text=message)]
+    
+    async def handle_view_logbook(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Handle a Logbook page request."""
+        try:
+            limit = int(arguments.get("limit", 50))
+            if limit < 1:
+                raise ValueError("limit must be at least 1")
+            if arguments.get("cursor"):
+                since = LogbookCursor.decode(arguments["cursor"])
+            elif arguments.get("since"):
+                since = LogbookCursor(parse_timestamp(arguments["since"]))
+            else:
+                since = None
+        except ValueError as e:
+            return [types.TextContent(type="text", text=f"Invalid logbook request: {str(e)}")]
+        
+        try:
+            todos = await asyncio.to_thread(self.applescript.get_logbook, since, limit)
+            next_cursor = LogbookCursor.after(todos) or since
+            
+            if not todos:
+                response_lines = ["No completed todos since the cursor."]
+            else:
+                response_lines = [f"📔 {len(todos)} completed todos:"]
+                for todo in todos:
+                    line = self._format_todo_line(todo)
+                    if todo.completed_at:
+                        line += f" (Completed: {todo.completed_at.isoformat(sep=' ')})"
+                    response_lines.append(line)
+                if len(todos) >= limit:
+                    response_lines.append("\n(More todos may follow; call again with the cursor.)")
+            
+            if next_cursor is not None:
+                response_lines.append(f"\nNext cursor: {next_cursor.encode()}")
+            
+            return [types.TextContent(type="text", text="\n".join(response_lines))]
+            
+        except UnavailableError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            message = f"Error retrieving logbook: {str(e)}"
+            logger.error(message)
+            return [types.TextContent(type="text", text=message)]
     
     async def handle_view_projects(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle projects viewing request."""
         try:
-            projects = self.applescript.get_projects()
+            projects = await asyncio.to_thread(self.applescript.get_projects)
             
             if not projects:
                 return [types.TextContent(type="text", text="No projects found in Things3.")]
@@ -166,11 +583,15 @@ class ViewTools:
                 line = f"\n• {title}"
                 if notes:
                     line += f" - {notes[:100]}{'...' if len(notes) > 100 else ''}"
+                if project.get("id"):
+                    line += f" [id: {project['id']}]"
                     
                 response_lines.append(line)
             
             return [types.TextContent(type="text", text="\n".join(response_lines))]
             
+        except UnavailableError as e:
+            return self._unavailable(e)
         except Exception as e:
             message = f"Error retrieving projects: {str(e)}"
             logger.error(message)
@@ -179,7 +600,7 @@ class ViewTools:
     async def handle_view_areas(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle areas viewing request."""
         try:
-            areas = self.applescript.get_areas()
+            areas = await asyncio.to_thread(self.applescript.get_areas)
             
             if not areas:
                 return [types.TextContent(type="text", text="No areas found in Things3.")]
@@ -187,10 +608,15 @@ class ViewTools:
             response_lines = ["🏢 Areas in Things3:"]
             for area in areas:
                 title = area.get("title", "Untitled Area").strip()
-                response_lines.append(f"\n• {title}")
+                line = f"\n• {title}"
+                if area.get("id"):
+                    line += f" [id: {area['id']}]"
+                response_lines.append(line)
             
             return [types.TextContent(type="text", text="\n".join(response_lines))]
             
+        except UnavailableError as e:
+            return self._unavailable(e)
         except Exception as e:
             message = f"Error retrieving areas: {str(e)}"
             logger.error(message)
@@ -199,23 +625,29 @@ class ViewTools:
     async def handle_get_selected_todos(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
         """Handle selected todos request."""
         try:
-            todos = self.applescript.get_selected_todos()
+            if self.selection is not None:
+                todos = await self.selection.selected_todos()
+            else:
+                todos = await asyncio.to_thread(self.applescript.get_selected_todos)
             
             if not todos:
                 return [types.TextContent(type="text", text="No todos are currently selected in Things3.")]
             
             response_lines = ["✅ Selected todos in Things3:"]
             for todo in todos:
-                title = todo.get("title", "Untitled Todo").strip()
-                notes = todo.get("notes", "")
+                title = todo.title.strip() or "Untitled Todo"
                 
                 response_lines.append(f"\n# {title}")
-                if notes:
-                    response_lines.append(f"{notes}")
+                if todo.id:
+                    response_lines.append(f"id: {todo.id}")
+                if todo.notes:
+                    response_lines.append(f"{todo.notes}")
                 response_lines.append("")  # Add spacing between todos
             
             return [types.TextContent(type="text", text="\n".join(response_lines))]
             
+        except UnavailableError as e:
+            return self._unavailable(e)
         except Exception as e:
             message = f"Error retrieving selected todos: {str(e)}"
             logger.error(message)
@@ -0,0 +1,156 @@
+"""Bulk edits of todos by ID, through AppleScript or the Things URL scheme.
+
+AppleScript reports success for every change but costs an Apple Event per
+change and cannot schedule or move todos by date or list name. A Things
+JSON ``update`` command applies any number of edits in one URL, without a
+result per todo, and needs the auth token from Things' settings. Small
+batches of the changes AppleScript supports therefore go through
+AppleScript; larger batches, and any batch that schedules or moves todos,
+go through the URL scheme when a token is configured.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Fields an update may set, in the order they are applied
+UPDATE_FIELDS = ("title", "notes", "when", "deadline", "tags", "list", "completed")
+
+# Fields apply_changes can set by ID, with the name it uses for each
+APPLESCRIPT_FIELDS: Dict[str, str] = {
+    "title": "name",
+    "notes": "notes",
+    "tags": "tags",
+    "completed": "completed",
+}
+
+VIA_APPLESCRIPT = "applescript"
+VIA_URL = "url"
+
+# Things accepts at most this many items per JSON command
+URL_CHUNK_SIZE = 250
+
+
+@dataclass
+class TodoUpdate:
+    """Changes to one todo, addressed by Things ID."""
+
+    task_id: str
+    changes: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_arguments(cls, value: Dict[str, Any], where: str = "update") -> "TodoUpdate":
+        """Build an update from tool arguments.
+
+        Args:
+            value: Mapping with ``id`` and the fields to change
+            where: Name used in error messages
+
+        Returns:
+            The update
+
+        Raises:
+            ValueError: If the ID is missing, a field is unknown or has the
+                wrong type, or nothing would change
+        """
+        if not isinstance(value, dict) or not value.get("id"):
+            raise ValueError(f"{where} needs an 'id'")
+        unknown = set(value) - {"id", *UPDATE_FIELDS}
+        if unknown:
+            raise ValueError(f"{where} has unknown fields: {', '.join(sorted(unknown))}")
+
+        changes = {key: value[key] for key in UPDATE_FIELDS if key in value}
+        if not changes:
+            raise ValueError(f"{where} changes nothing")
+        if "tags" in changes and not (
+            isinstance(changes["tags"], list) and all(isinstance(tag, str) for tag in changes["tags"])
+        ):
+            raise ValueError(f"{where}.tags must be a list of strings")
+        if "completed" in changes and not isinstance(changes["completed"], bool):
+            raise ValueError(f"{where}.completed must be true or false")
+        for key in ("title", "notes", "when", "deadline", "list"):
+            if key in changes and not isinstance(changes[key], str):
+                raise ValueError(f"{where}.{key} must be a string")
+        return cls(str(value["id"]), changes)
+
+    @property
+    def applescript_supported(self) -> bool:
+        """Whether AppleScript can apply every change in this update."""
+        return all(key in APPLESCRIPT_FIELDS for key in self.changes)
+
+    def describe(self) -> str:
+        """Human-readable summary used in tool responses and logs."""
+        return f"{self.task_id} ({', '.join(self.changes)})"
+
+
+def choose_path(
+    updates: List[TodoUpdate],
+    auth_token: Optional[str],
+    url_batch_size: int,
+    via: Optional[str] = None
+) -> str:
+    """Pick the write path for a batch of updates.
+
+    Args:
+        updates: Updates to apply
+        auth_token: Things URL scheme auth token, if configured
+        url_batch_size: Batches at least this large go through the URL scheme
+        via: ``applescript`` or ``url`` to force a path
+
+    Returns:
+        ``applescript`` or ``url``
+
+    Raises:
+        ValueError: If no path can apply the batch
+    """
+    unsupported = [update.task_id for update in updates if not update.applescript_supported]
+    if via == VIA_APPLESCRIPT and unsupported:
+        raise ValueError(
+            f"AppleScript cannot set when, deadline or list (todos {', '.join(unsupported)})"
+        )
+    if via == VIA_URL or (via is None and (unsupported or len(updates) >= url_batch_size)):
+        if auth_token:
+            return VIA_URL
+        if via == VIA_URL or unsupported:
+            raise ValueError(
+                "Updating through the Things URL scheme needs an auth token "
+                "(set THINGS3_MCP_AUTH_TOKEN)"
+            )
+    return VIA_APPLESCRIPT
+
+
+def to_changes(updates: List[TodoUpdate]) -> Tuple[List[Tuple[str, str, str]], List[int]]:
+    """Turn updates into ``apply_changes`` triples.
+
+    Args:
+        updates: Updates AppleScript can apply
+
+    Returns:
+        Tuple of the (task ID, field, value) triples, grouped by todo, and for
+        each triple the index of the update it belongs to
+    """
+    changes: List[Tuple[str, str, str]] = []
+    owners: List[int] = []
+    for index, update in enumerate(updates):
+        for key, value in update.changes.items():
+            if key == "tags":
+                value = ",".join(value)
+            elif key == "completed":
+                value = "true" if value else "false"
+            changes.append((update.task_id, APPLESCRIPT_FIELDS[key], value))
+            owners.append(index)
+    return changes, owners
+
+
+def to_things_json(updates: List[TodoUpdate]) -> List[Dict[str, Any]]:
+    """Build Things JSON ``update`` operations.
+
+    Args:
+        updates: Updates to apply
+
+    Returns:
+        Value of the ``data`` parameter of ``things:///json``
+    """
+    return [
+        {"type": "to-do", "operation": "update", "id": update.task_id, "attributes": dict(update.changes)}
+        for update in updates
+    ]
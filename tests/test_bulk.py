@@ -0,0 +1,86 @@
+"""Tests for bulk completion and rescheduling scripts."""
+
+from datetime import date
+
+import pytest
+
+from things3_mcp.bulk import BulkChange, bulk_script
+from things3_mcp.handlers.simulated import SimulatedAppleScriptHandler, SimulatedLibrary
+from things3_mcp.query import TodoQuery
+
+TODAY = date(2026, 10, 19)
+
+
+class TestBulkChange:
+    """Test cases for BulkChange."""
+
+    def test_reschedule(self):
+        """Test parsing of when and deadline values."""
+        change = BulkChange.reschedule("tomorrow", "+7d", today=TODAY)
+
+        assert change.when == date(2026, 10, 20)
+        assert change.deadline == date(2026, 10, 26)
+        assert change.describe() == "scheduled for 2026-10-20 and due 2026-10-26"
+        assert BulkChange.reschedule("Someday").when_list == "Someday"
+
+    def test_reschedule_needs_a_change(self):
+        """Test that rescheduling without when or deadline is rejected."""
+        with pytest.raises(ValueError, match="Either 'when' or 'deadline'"):
+            BulkChange.reschedule()
+
+
+class TestBulkScript:
+    """Test cases for bulk_script."""
+
+    def test_filter_uses_one_whose_clause(self):
+        """Test that a filtered completion is set on the whole whose reference."""
+        query = TodoQuery.from_arguments({"list": "Today", "overdue": True, "tag": "errand"}, today=TODAY)
+
+        script, args = bulk_script(BulkChange(complete=True), query=query)
+
+        assert "set matches to a reference to (to dos of list arg3 whose status is open" in script
+        assert "tag names starts with (arg4 & \", \")" in script
+        assert "due date < arg5" in script
+        assert "set status of matches to completed" in script
+        assert "repeat with todoId in matchIds" not in script
+        assert args == ["500", "false", "Today", "errand", "2026-10-19"]
+
+    def test_values_are_passed_as_arguments(self):
+        """Test that scripts depend only on the shape of the request."""
+        first, first_args = bulk_script(BulkChange.reschedule("tomorrow", today=TODAY), ids=["A"])
+        second, second_args = bulk_script(BulkChange.reschedule("+3d", today=TODAY), ids=["B", "C"])
+
+        assert first == second
+        assert "schedule t for arg3" in first
+        assert "repeat with i from 4 to count of argv" in first
+        assert second_args == ["500", "false", "2026-10-22", "B", "C"]
+
+    @pytest.mark.parametrize("kwargs, error", [
+        ({}, "either by IDs or by filter"),
+        ({"ids": ["A"], "query": TodoQuery(tag="x")}, "either by IDs or by filter"),
+        ({"query": TodoQuery(list="Today", area="Work")}, "only one of list, project and area"),
+        ({"query": TodoQuery(tag="x", status="completed")}, "Only open todos"),
+    ])
+    def test_rejects_selection(self, kwargs, error):
+        """Test selections that cannot be applied exactly."""
+        with pytest.raises(ValueError, match=error):
+            bulk_script(BulkChange(complete=True), **kwargs)
+
+
+class TestSimulatedBulkChange:
+    """Test cases for bulk changes against the simulated backend."""
+
+    def test_complete_and_reschedule(self):
+        """Test that a bulk change reaches every matching todo in one run."""
+        library = SimulatedLibrary(todo_count=100)
+        handler = SimulatedAppleScriptHandler(library, latency=0)
+        errands = [t["id"] for t in library.open_todos() if "errand" in t["tags"].split(",")]
+
+        dry = handler.bulk_change(BulkChange(complete=True), query=TodoQuery(tag="errand"), dry_run=True)
+        done = handler.bulk_change(BulkChange(complete=True), query=TodoQuery(tag="errand"))
+        moved = handler.bulk_change(BulkChange.reschedule("someday"), ids=[errands[0], library.open_todos()[0]["id"]])
+
+        assert dry["ids"] == done["ids"] == errands
+        assert all(library.todos[todo_id]["status"] == "completed" for todo_id in errands)
+        assert moved["skipped"] == [errands[0]] and len(moved["ids"]) == 1
+        assert library.todos[moved["ids"][0]]["list"] == "Someday"
@@ -0,0 +1,128 @@
+"""Tests for Things3 caches and indexes."""
+
+from datetime import date
+from unittest.mock import patch
+
+from things3_mcp.cache import DateIndex, NameIndex
+from things3_mcp.models import Task
+
+
+class TestNameIndex:
+    """Test cases for NameIndex."""
+    
+    def test_new_index_is_stale(self):
+        """Test that an index that was never rebuilt is stale."""
+        assert NameIndex().is_stale
+    
+    def test_replace_marks_fresh(self):
+        """Test that a full rebuild makes the index fresh."""
+        index = NameIndex()
+        index.replace([Task("A", "Task")])
+        
+        assert not index.is_stale
+        assert index.lookup("Task") == ["A"]
+    
+    def test_stale_after_ttl(self):
+        """Test that the index goes stale once the TTL has passed."""
+        index = NameIndex(ttl=10)
+        with patch("things3_mcp.cache.time.monotonic", return_value=100.0):
+            index.replace([])
+        with patch("things3_mcp.cache.time.monotonic", return_value=111.0):
+            assert index.is_stale
+    
+    def test_duplicate_names(self):
+        """Test that duplicate names resolve to every matching ID."""
+        index = NameIndex()
+        index.update([
+            Task("B", "Same"),
+            Task("A", "Same"),
+            Task("C", "Other"),
+        ])
+        
+        assert index.lookup("Same") == ["A", "B"]
+        assert index.lookup("Missing") == []
+    
+    def test_update_moves_renamed_items(self):
+        """Test that an update with a new title drops the old name."""
+        index = NameIndex()
+        index.update([Task("A", "Old")])
+        index.update([Task("A", "New")])
+        
+        assert index.lookup("Old") == []
+        assert index.lookup("New") == ["A"]
+        assert len(index) == 1
+    
+    def test_discard(self):
+        """Test removing a todo from the index."""
+        index = NameIndex()
+        index.update([Task("A", "Task"), Task("B", "Task")])
+        index.discard("A")
+        
+        assert index.lookup("Task") == ["B"]
+    
+    def test_items_without_id_are_ignored(self):
+        """Test that items lacking an ID are not indexed."""
+        index = NameIndex()
+        index.update([Task("", "No ID")])
+        
+        assert len(index) == 0
+
+
+
+class TestDateIndex:
+    """Test cases for DateIndex."""
+    
+    def _index(self):
+        index = DateIndex()
+        index.replace([
+            Task("A", "a", due_date=date(2026, 10, 17)),
+            Task("B", "b", due_date=date(2026, 10, 19), when=date(2026, 10, 18)),
+            Task("C", "c", due_date=date(2026, 10, 25)),
+            Task("D", "d", when=date(2026, 10, 21)),
+            Task("E", "e", due_date="Monday"),
+        ])
+        return index
+    
+    def test_between_is_inclusive(self):
+        """Test inclusive range lookups."""
+        index = self._index()
+        
+        assert [t.id for t in index.between("due_date", date(2026, 10, 19), date(2026, 10, 25))] == ["B", "C"]
+        assert [t.id for t in index.between("due_date", end=date(2026, 10, 19))] == ["A", "B"]
+        assert [t.id for t in index.between("when", start=date(2026, 10, 19))] == ["D"]
+        assert index.between("due_date", date(2026, 11, 1)) == []
+    
+    def test_overdue(self):
+        """Test todos due before today."""
+        assert [t.id for t in self._index().overdue(date(2026, 10, 19))] == ["A"]
+    
+    def test_unparsed_dates_are_not_indexed(self):
+        """Test that todos without ISO dates stay out of the ranges."""
+        index = self._index()
+        
+        assert "E" not in [t.id for t in index.between("due_date")]
+    
+    def test_update_moves_rescheduled_todo(self):
+        """Test that an update re-positions a todo whose date changed."""
+        index = self._index()
+        index.update([Task("A", "a", due_date=date(2026, 10, 30)), Task("D", "d")])
+        
+        assert [t.id for t in index.between("due_date")] == ["B", "C", "A"]
+        assert index.between("when", start=date(2026, 10, 20)) == []
+    
+    def test_discard(self):
+        """Test removing a todo among others with the same date."""
+        index = DateIndex()
+        index.replace([Task(task_id, task_id, due_date=date(2026, 1, 1)) for task_id in "XYZ"])
+        index.discard("Y")
+        
+        assert [t.id for t in index.between("due_date")] == ["X", "Z"]
+    
+    def test_staleness(self):
+        """Test that only a full rebuild makes the index fresh."""
+        index = DateIndex()
+        index.update([Task("A", "a", due_date=date(2026, 1, 1))])
+        assert index.is_stale
+        
+        index.replace([])
+        assert not index.is_stale
@@ -0,0 +1,113 @@
+"""Tests for the Unix socket daemon and its stdio shim."""
+
+import tempfile
+from pathlib import Path
+
+import anyio
+import pytest
+from mcp import ClientSession
+
+from things3_mcp.config import Settings
+from things3_mcp.daemon import connect_daemon, serve_daemon, socket_transport
+from things3_mcp.server import Things3Server, parse_args
+
+
+@pytest.fixture
+def socket_path():
+    """Short socket path (Unix socket paths are limited to ~100 bytes)."""
+    with tempfile.TemporaryDirectory(dir="/tmp") as directory:
+        yield Path(directory) / "daemon.sock"
+
+
+async def _list_tool_names(path):
+    stream = await anyio.connect_unix(path)
+    async with stream, socket_transport(stream) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            result = await session.list_tools()
+            return [tool.name for tool in result.tools]
+
+
+async def _wait_for_socket(path):
+    with anyio.fail_after(5):
+        while not path.exists():
+            await anyio.sleep(0.01)
+
+
+class TestDaemon:
+    """Test cases for the daemon."""
+    
+    async def test_sessions_share_one_server(self, socket_path):
+        """Test that several socket sessions are served by one server."""
+        server = Things3Server(Settings(socket_path=socket_path))
+        
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(serve_daemon, server, socket_path)
+            await _wait_for_socket(socket_path)
+            
+            results = []
+            async with anyio.create_task_group() as clients:
+                for _ in range(3):
+                    clients.start_soon(lambda: _append(results, _list_tool_names(socket_path)))
+            tg.cancel_scope.cancel()
+        
+        assert len(results) == 3
+        assert "view-inbox" in results[0]
+        assert results[0] == results[1] == results[2]
+        assert not socket_path.exists()
+    
+    async def test_second_daemon_refuses_socket(self, socket_path):
+        """Test that only one daemon can own a socket path."""
+        server = Things3Server(Settings(socket_path=socket_path))
+        
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(serve_daemon, server, socket_path)
+            await _wait_for_socket(socket_path)
+            
+            with pytest.raises(RuntimeError, match="already serving"):
+                await serve_daemon(server, socket_path)
+            tg.cancel_scope.cancel()
+    
+    async def test_stale_socket_is_replaced(self, socket_path):
+        """Test that a socket file left by a crashed daemon is reused."""
+        socket_path.touch()
+        server = Things3Server(Settings(socket_path=socket_path))
+        
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(serve_daemon, server, socket_path)
+            with anyio.fail_after(5):
+                while True:
+                    try:
+                        names = await _list_tool_names(socket_path)
+                        break
+                    except OSError:
+                        await anyio.sleep(0.01)
+            tg.cancel_scope.cancel()
+        
+        assert "view-inbox" in names
+
+
+class TestShim:
+    """Test cases for the shim side."""
+    
+    async def test_connect_without_autostart(self, socket_path):
+        """Test that connecting fails fast when autostart is off."""
+        with pytest.raises(OSError):
+            await connect_daemon(socket_path, autostart=False)
+    
+    def test_parse_args_commands(self):
+        """Test the daemon and shim commands."""
+        assert parse_args([]).command == "serve"
+        assert parse_args(["daemon"]).command == "daemon"
+        assert parse_args(["shim"]).command == "shim"
+    
+    def test_use_daemon_setting(self):
+        """Test that the shim can be enabled from the environment."""
+        settings = Settings.from_env({"THINGS3_MCP_USE_DAEMON": "1", "THINGS3_MCP_SOCKET": "/tmp/t.sock"})
+        
+        assert settings.use_daemon is True
+        assert settings.socket_path == Path("/tmp/t.sock")
+
+
+async def _append(results, coroutine):
+    results.append(await coroutine)
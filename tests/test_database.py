@@ -0,0 +1,178 @@
+"""Tests for the Things3 database reader and hierarchy assembly."""
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+from things3_mcp.handlers import ThingsDatabase
+from things3_mcp.handlers.database import things_date
+from things3_mcp.hierarchy import build_hierarchy
+
+# The subset of the Things3 schema the reader uses
+SCHEMA = """
+CREATE TABLE TMArea (uuid TEXT PRIMARY KEY, title TEXT, "index" INTEGER);
+CREATE TABLE TMTask (
+    uuid TEXT PRIMARY KEY, type INTEGER, status INTEGER, trashed INTEGER, title TEXT, notes TEXT,
+    area TEXT, project TEXT, heading TEXT, deadline INTEGER, startDate INTEGER, "index" INTEGER,
+    creationDate REAL
+);
+CREATE TABLE TMTag (uuid TEXT PRIMARY KEY, title TEXT);
+CREATE TABLE TMTaskTag (tasks TEXT, tags TEXT);
+CREATE TABLE TMChecklistItem (uuid TEXT PRIMARY KEY, title TEXT, status INTEGER, task TEXT, "index" INTEGER);
+"""
+
+# 2026-10-19 in the packed format
+PACKED_DATE = 2026 << 16 | 10 << 12 | 19 << 7
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    """A small Things3 database with one area, two projects and a heading."""
+    path = tmp_path / "main.sqlite"
+    with sqlite3.connect(path) as connection:
+        connection.executescript(SCHEMA)
+        connection.executemany(
+            'INSERT INTO TMArea (uuid, title, "index") VALUES (?, ?, ?)',
+            [("AREA-1", "Work", 0)],
+        )
+        connection.executemany(
+            'INSERT INTO TMTask (uuid, type, status, trashed, title, area, project, heading, "index") '
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                ("PROJ-1", 1, 0, 0, "Launch", "AREA-1", None, None, 0),
+                ("PROJ-2", 1, 0, 0, "Side project", None, None, None, 1),
+                ("HEAD-1", 2, 0, 0, "Design", None, "PROJ-1", None, 0),
+                ("TODO-1", 0, 0, 0, "Draft spec", None, None, "HEAD-1", 0),
+                ("TODO-2", 0, 0, 0, "Book venue", None, "PROJ-1", None, 1),
+                ("TODO-3", 0, 3, 0, "Done already", None, "PROJ-1", None, 2),
+                ("TODO-4", 0, 0, 1, "Trashed", None, "PROJ-1", None, 3),
+            ],
+        )
+        connection.execute("UPDATE TMTask SET deadline = ? WHERE uuid = 'TODO-1'", (PACKED_DATE,))
+        connection.execute("INSERT INTO TMTag VALUES ('TAG-1', 'urgent')")
+        connection.execute("INSERT INTO TMTaskTag VALUES ('TODO-1', 'TAG-1')")
+        connection.executemany(
+            'INSERT INTO TMChecklistItem (uuid, title, status, task, "index") VALUES (?, ?, ?, ?, ?)',
+            [("CHECK-1", "Outline", 3, "TODO-1", 0), ("CHECK-2", "Review", 0, "TODO-1", 1)],
+        )
+    return path
+
+
+class TestBuildHierarchy:
+    """Test cases for build_hierarchy."""
+
+    def test_counts_todos_under_headings(self):
+        """Test that todos under a heading count towards the heading and its project."""
+        rows = [
+            {"type": "area", "id": "A", "title": "Work", "parent": ""},
+            {"type": "project", "id": "P", "title": "Launch", "parent": "A"},
+            {"type": "heading", "id": "H", "title": "Design", "parent": "P"},
+            {"type": "todo", "id": "T1", "title": "Spec", "parent": "H"},
+            {"type": "todo", "id": "T2", "title": "Venue", "parent": "P"},
+        ]
+
+        [area] = build_hierarchy(rows)
+        project = area["projects"][0]
+
+        assert project["open_count"] == 2
+        assert project["headings"][0]["open_count"] == 1
+        assert project["todos"] == []
+
+    def test_explicit_counts_and_no_area(self):
+        """Test AppleScript-style rows: counts on projects, no headings."""
+        rows = [
+            {"type": "project", "id": "P", "title": "Loose", "parent": "", "open_count": 3},
+            {"type": "todo", "id": "T1", "title": "One", "parent": "P"},
+        ]
+
+        [area] = build_hierarchy(rows, include_todos=True)
+
+        assert area["id"] == ""
+        assert area["projects"][0]["open_count"] == 3
+        assert [todo.id for todo in area["projects"][0]["todos"]] == ["T1"]
+
+
+class TestThingsDatabase:
+    """Test cases for ThingsDatabase."""
+
+    def test_missing_database(self, tmp_path):
+        """Test that a missing database is reported as unavailable."""
+        database = ThingsDatabase(tmp_path / "missing.sqlite")
+
+        assert not database.available
+        assert database.get_hierarchy() is None
+
+    def test_get_hierarchy(self, database_path):
+        """Test that the tree is read in one query, without closed or trashed todos."""
+        areas = ThingsDatabase(database_path).get_hierarchy(include_todos=True)
+
+        assert [area["title"] for area in areas] == ["Work", ""]
+        launch = areas[0]["projects"][0]
+        assert launch["open_count"] == 2
+        assert [todo.title for todo in launch["todos"]] == ["Book venue"]
+        assert launch["headings"][0]["title"] == "Design"
+        assert [todo.title for todo in launch["headings"][0]["todos"]] == ["Draft spec"]
+        assert areas[1]["projects"][0]["title"] == "Side project"
+
+    def test_opened_read_only(self, database_path):
+        """Test that the reader cannot modify the database."""
+        database = ThingsDatabase(database_path)
+
+        with pytest.raises(sqlite3.OperationalError):
+            database._query("DELETE FROM TMTask")
+
+    def test_unreadable_database(self, tmp_path):
+        """Test that a database in an unexpected format falls back to None."""
+        path = tmp_path / "main.sqlite"
+        sqlite3.connect(path).close()
+
+        assert ThingsDatabase(path).get_hierarchy() is None
+
+    def test_things_date(self):
+        """Test both date encodings used by Things3."""
+        assert things_date(PACKED_DATE) == date(2026, 10, 19)
+        assert things_date(None) is None
+        assert things_date(1_700_000_000) == date.fromtimestamp(1_700_000_000)
+
+    def test_get_project(self, database_path):
+        """Test a project page with headings, tags and checklist items."""
+        page = ThingsDatabase(database_path).get_project("Launch", checklists=True)
+
+        assert page["id"] == "PROJ-1"
+        assert page["total"] == 2
+        assert [todo.title for todo in page["todos"]] == ["Book venue", "Draft spec"]
+        draft = page["todos"][1]
+        assert draft.due_date == date(2026, 10, 19)
+        assert draft.tags == ("urgent",)
+        assert page["headings"][page["todo_headings"]["TODO-1"]] == "Design"
+        assert page["checklists"]["TODO-1"] == [("Outline", True), ("Review", False)]
+
+    def test_get_project_pages(self, database_path):
+        """Test that offset and limit select a page and keep the total."""
+        page = ThingsDatabase(database_path).get_project("PROJ-1", offset=1, limit=1)
+
+        assert [todo.id for todo in page["todos"]] == ["TODO-1"]
+        assert page["total"] == 2
+        assert page["checklists"] == {}
+
+    def test_get_missing_project(self, database_path):
+        """Test that an unknown project is reported as an empty result."""
+        assert ThingsDatabase(database_path).get_project("Nope") == {}
+
+    def test_find_created(self, database_path):
+        """Test finding an item created since a time that is not excluded."""
+        with sqlite3.connect(database_path) as connection:
+            connection.executemany(
+                "INSERT INTO TMTask (uuid, type, status, trashed, title, creationDate) VALUES (?, 0, 0, 0, ?, ?)",
+                [("OLD", "Milk", 100.0), ("NEW", "Milk", 200.0)],
+            )
+        database = ThingsDatabase(database_path)
+
+        assert database.find_created("Milk", since=150.0) == "NEW"
+        assert database.find_created("Milk", since=250.0) is None
+        assert database.find_created("Milk", project=True) is None
+        assert database.find_created("Milk", exclude={"OLD"}) == "NEW"
+        assert database.find_created("Milk", exclude={"OLD", "NEW"}) is None
+        assert database.item_ids("Milk") == {"OLD", "NEW"}
+        assert database.item_ids("Milk", project=True) == set()
@@ -1,13 +1,23 @@
 """Tests for Things3 handlers."""
 
 import json
+from datetime import date, datetime
 import subprocess
+import urllib.parse
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
-from things3_mcp.handlers import AppleScriptHandler, XCallbackHandler
+from things3_mcp.handlers import (
+    AppleScriptHandler,
+    CircuitBreaker,
+    CircuitOpenError,
+    UnavailableError,
+    XCallbackHandler,
+)
+from things3_mcp.models import Task
+from things3_mcp.query import LogbookCursor
 
 
 class TestAppleScriptHandler:
@@ -62,15 +72,233 @@ class TestAppleScriptHandler:
         with pytest.raises(RuntimeError, match="AppleScript execution timed out"):
             handler.run_script("test script")
     
+    @patch('subprocess.run')
+    def test_probe_does_not_launch_things3(self, mock_run):
+        """Test that the probe only talks to Things3 when it is already running."""
+        mock_run.return_value = Mock(stdout="false\n", stderr="")
+        handler = AppleScriptHandler()
+
+        assert handler.probe() is False
+        mock_run.assert_called_once()
+        assert "is running" in mock_run.call_args[0][0][2]
+
+        mock_run.reset_mock()
+        mock_run.side_effect = [Mock(stdout="true\n", stderr=""), Mock(stdout="3.20\n", stderr="")]
+        assert handler.probe() is True
+        assert mock_run.call_count == 2
+
+    @patch('subprocess.run')
+    def test_timeout_opens_circuit(self, mock_run):
+        """Test that after a timeout further calls fail fast without running osascript."""
+        mock_run.side_effect = subprocess.TimeoutExpired('osascript', 30)
+        
+        handler = AppleScriptHandler()
+        with pytest.raises(UnavailableError):
+            handler.run_script("test script")
+        with pytest.raises(CircuitOpenError):
+            handler.run_script("test script")
+        
+        assert handler.breaker.state == "open"
+        mock_run.assert_called_once()
+
+    def test_reads_raise_when_circuit_is_open(self):
+        """Test that an outage is not reported as an empty result."""
+        handler = AppleScriptHandler(breaker=CircuitBreaker("Things3"))
+        handler.breaker.record_failure(timed_out=True)
+
+        with patch('shutil.which', return_value=None):
+            with pytest.raises(CircuitOpenError):
+                handler.get_list_tasks("Today")
+            with pytest.raises(CircuitOpenError):
+                handler.get_projects()
+
+    @patch('subprocess.run')
+    def test_script_errors_do_not_open_circuit(self, mock_run):
+        """Test that errors reported by a running Things3 keep the circuit closed."""
+        mock_run.side_effect = subprocess.CalledProcessError(1, 'osascript', stderr="Can't get project (-1728)")
+        
+        handler = AppleScriptHandler()
+        for _ in range(5):
+            with pytest.raises(RuntimeError):
+                handler.run_script("test script")
+        
+        assert handler.breaker.state == "closed"
+    
+    @patch('time.sleep')
+    @patch('subprocess.run')
+    def test_reads_are_retried(self, mock_run, mock_sleep, tmp_path):
+        """Test that read-only scripts are retried with growing, jittered delays."""
+        (tmp_path / "get_things.applescript").write_text("return 1")
+        (tmp_path / "set_things.applescript").write_text("return 1")
+        unavailable = subprocess.CalledProcessError(1, 'osascript', stderr="Connection is invalid. (-609)")
+        mock_run.side_effect = [unavailable, unavailable, Mock(stdout="ok", stderr="")]
+        
+        handler = AppleScriptHandler(
+            scripts_path=tmp_path,
+            compile_cache_path=tmp_path / "cache",
+            breaker=CircuitBreaker("Things3", failure_threshold=5),
+        )
+        with patch('shutil.which', return_value=None):
+            assert handler.run_script_file("get_things") == "ok"
+            assert mock_sleep.call_count == 2
+            assert mock_sleep.call_args_list[0][0][0] <= 0.2
+            assert mock_sleep.call_args_list[1][0][0] <= 0.4
+            
+            # Writes are never retried
+            mock_run.side_effect = [unavailable, Mock(stdout="ok", stderr="")]
+            with pytest.raises(UnavailableError):
+                handler.run_script_file("set_things")
+    
+    @patch('subprocess.run')
+    def test_run_script_passes_arguments(self, mock_run):
+        """Test that arguments follow the script on the osascript command line."""
+        mock_run.return_value = Mock(stdout="ok\n", stderr="")
+        
+        handler = AppleScriptHandler()
+        handler.run_script("on run argv\nend run", ["one", "two"])
+        
+        assert mock_run.call_args[0][0] == ['osascript', '-e', 'on run argv\nend run', 'one', 'two']
+    
+    @patch('shutil.which', return_value=None)
+    @patch('subprocess.run')
+    def test_run_script_file_without_osacompile(self, mock_run, mock_which, tmp_path):
+        """Test that scripts run from source when they cannot be compiled."""
+        (tmp_path / "op.applescript").write_text("on run argv\nend run")
+        mock_run.return_value = Mock(stdout="", stderr="")
+        
+        handler = AppleScriptHandler(scripts_path=tmp_path, compile_cache_path=tmp_path / "cache")
+        handler.run_script_file("op", ["x"])
+        
+        assert mock_run.call_args[0][0] == ['osascript', str(tmp_path / "op.applescript"), 'x']
+        assert not (tmp_path / "cache").exists()
+    
+    @patch('shutil.which', return_value="/usr/bin/osacompile")
+    @patch('subprocess.run')
+    def test_run_script_file_compiles_once(self, mock_run, mock_which, tmp_path):
+        """Test that a script file is compiled once and then run compiled."""
+        (tmp_path / "op.applescript").write_text("on run argv\nend run")
+        cache_path = tmp_path / "cache"
+        
+        def fake_run(command, **kwargs):
+            if command[0] == 'osacompile':
+                Path(command[2]).write_text("compiled")
+            return Mock(stdout="", stderr="")
+        mock_run.side_effect = fake_run
+        
+        handler = AppleScriptHandler(scripts_path=tmp_path, compile_cache_path=cache_path)
+        handler.run_script_file("op", ["x"])
+        handler.run_script_file("op", ["y"])
+        
+        commands = [c[0][0] for c in mock_run.call_args_list]
+        assert [c[0] for c in commands] == ['osacompile', 'osascript', 'osascript']
+        compiled = list(cache_path.glob("op-*.scpt"))
+        assert len(compiled) == 1
+        assert commands[2] == ['osascript', str(compiled[0]), 'y']
+        
+        # A new handler (e.g. another server process) reuses the compiled copy
+        mock_run.reset_mock()
+        AppleScriptHandler(scripts_path=tmp_path, compile_cache_path=cache_path).run_script_file("op")
+        assert [c[0][0][0] for c in mock_run.call_args_list] == ['osascript']
+    
+    @patch('shutil.which', return_value=None)
+    @patch('subprocess.run')
+    def test_run_script_source_writes_once(self, mock_run, mock_which, tmp_path):
+        """Test that generated source is stored in the cache and reused."""
+        mock_run.return_value = Mock(stdout="[]", stderr="")
+        handler = AppleScriptHandler(compile_cache_path=tmp_path)
+        
+        handler.run_script_source("query", "on run argv\nend run", ["a"])
+        handler.run_script_source("query", "on run argv\nend run", ["b"])
+        
+        sources = list(tmp_path.glob("query-*.applescript"))
+        assert len(sources) == 1
+        assert mock_run.call_args[0][0] == ['osascript', str(sources[0]), 'b']
+    
+    @patch.object(AppleScriptHandler, 'run_script_source')
+    def test_query_todos_filters_and_indexes(self, mock_run_source):
+        """Test that query results are post-filtered and fed to the name index."""
+        from things3_mcp.query import TodoQuery
+        
+        mock_run_source.return_value = json.dumps([
+            {"id": "A", "title": "Call Bob", "tags": "waiting", "project": ""},
+            {"id": "B", "title": "Wait", "tags": "waiting room", "project": ""},
+        ])
+        handler = AppleScriptHandler()
+        
+        tasks = handler.query_todos(TodoQuery(list="Today", tag="waiting"))
+        
+        assert [task.id for task in tasks] == ["A"]
+        name, source, args = mock_run_source.call_args[0]
+        assert name == "query_todos"
+        assert "on isoDate(isoText)" in source
+        assert args == ["Today", "waiting", "100"]
+        assert handler.name_index.lookup("Call Bob") == ["A"]
+    
+    @patch.object(AppleScriptHandler, 'run_script_source')
+    def test_bulk_change_updates_date_index(self, mock_run_source):
+        """Test that completed todos leave the date index after a bulk change."""
+        from things3_mcp.bulk import BulkChange
+        from things3_mcp.query import TodoQuery
+        
+        mock_run_source.return_value = json.dumps(
+            {"ids": ["A"], "skipped": [], "matched": 1, "aborted": False}
+        )
+        handler = AppleScriptHandler()
+        handler.date_index.replace([Task("A", "a", due_date=date(2026, 10, 17))])
+        handler.name_index.update([Task("A", "a")])
+        
+        result = handler.bulk_change(BulkChange(complete=True), query=TodoQuery(list="Today"))
+        
+        assert result == {"success": True, "ids": ["A"], "skipped": [], "matched": 1, "aborted": False}
+        assert mock_run_source.call_args[0][0] == "bulk_change"
+        assert len(handler.date_index) == 0
+        assert handler.name_index.lookup("a") == []
+    
+    @patch.object(AppleScriptHandler, 'run_script_source')
+    def test_bulk_change_failure(self, mock_run_source):
+        """Test that a failed bulk change is reported, not raised."""
+        from things3_mcp.bulk import BulkChange
+        
+        mock_run_source.side_effect = RuntimeError("AppleScript execution failed")
+        
+        result = AppleScriptHandler().bulk_change(BulkChange(complete=True), ids=["A"])
+        
+        assert result == {"success": False, "error": "AppleScript execution failed"}
+    
+    @patch.object(AppleScriptHandler, 'run_script_source')
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_date_only_query_uses_date_index(self, mock_run_script_file, mock_run_source):
+        """Test that date-only queries are answered from the date index."""
+        from things3_mcp.query import TodoQuery
+        
+        mock_run_script_file.return_value = json.dumps([
+            {"id": "A", "title": "a", "due_date": "2026-10-17", "when": ""},
+            {"id": "B", "title": "b", "due_date": "2026-10-30", "when": ""},
+        ])
+        handler = AppleScriptHandler()
+        
+        first = handler.query_todos(TodoQuery(due_to=date(2026, 10, 18)))
+        second = handler.query_todos(TodoQuery(due_from=date(2026, 10, 18)))
+        
+        assert [task.id for task in first] == ["A"]
+        assert [task.id for task in second] == ["B"]
+        mock_run_script_file.assert_called_once_with("get_dated_todos")
+        mock_run_source.assert_not_called()
+    
     @patch.object(AppleScriptHandler, 'run_script_file')
     def test_get_inbox_tasks_success(self, mock_run_script_file):
         """Test successful inbox tasks retrieval."""
-        mock_run_script_file.return_value = '[{"title": "Test Task", "notes": "Test notes"}]'
+        mock_run_script_file.return_value = (
+            '[{"id": "TASK-1", "title": "Test Task", "notes": "Test notes", '
+            '"due_date": "2024-01-05", "when": "", "tags": "home, errands"}]'
+        )
         
         handler = AppleScriptHandler()
         result = handler.get_inbox_tasks()
         
-        assert result == [{"title": "Test Task", "notes": "Test notes"}]
+        assert result == [Task(
+            "TASK-1", "Test Task", notes="Test notes", due_date=date(2024, 1, 5), tags=("home", "errands")
+        )]
         mock_run_script_file.assert_called_once_with("get_inbox")
     
     @patch.object(AppleScriptHandler, 'run_script_file')
@@ -93,26 +321,208 @@ class TestAppleScriptHandler:
         
         assert result == []
     
-    @patch.object(AppleScriptHandler, 'run_script')
-    def test_assign_project_success(self, mock_run_script):
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_get_list_tasks_feeds_name_index(self, mock_run_script_file):
+        """Test that list views populate the name-to-ID index."""
+        mock_run_script_file.return_value = '[{"id": "TASK-1", "title": "Test Task"}]'
+        
+        handler = AppleScriptHandler()
+        handler.get_today_tasks()
+        
+        assert handler.name_index.lookup("Test Task") == ["TASK-1"]
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_resolve_task_ids_uses_fresh_index(self, mock_run_script_file):
+        """Test that a fresh index resolves names without running a script."""
+        handler = AppleScriptHandler()
+        handler.name_index.replace([Task("TASK-1", "Test Task")])
+        
+        assert handler.resolve_task_ids("Test Task") == ["TASK-1"]
+        mock_run_script_file.assert_not_called()
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_resolve_task_ids_refreshes_on_miss(self, mock_run_script_file):
+        """Test that an unknown name triggers a single index rebuild."""
+        mock_run_script_file.return_value = (
+            '[{"id": "TASK-1", "title": "Dup"}, {"id": "TASK-2", "title": "Dup"}]'
+        )
+        
+        handler = AppleScriptHandler()
+        handler.name_index.replace([])
+        
+        assert handler.resolve_task_ids("Dup") == ["TASK-1", "TASK-2"]
+        mock_run_script_file.assert_called_once_with("get_task_index")
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_get_selected_ids(self, mock_run_script_file):
+        """Test that the selection poll returns IDs only, or None on failure."""
+        mock_run_script_file.return_value = "TASK-1,TASK-2"
+        handler = AppleScriptHandler()
+        
+        assert handler.get_selected_ids() == ["TASK-1", "TASK-2"]
+        mock_run_script_file.return_value = ""
+        assert handler.get_selected_ids() == []
+        mock_run_script_file.side_effect = RuntimeError("Things3 is not running")
+        assert handler.get_selected_ids() is None
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_get_hierarchy(self, mock_run_script_file):
+        """Test that the hierarchy comes from a single script run."""
+        mock_run_script_file.return_value = (
+            '[{"type": "area", "id": "AREA-1", "title": "Work", "parent": ""},'
+            ' {"type": "project", "id": "PROJ-1", "title": "Launch", "parent": "AREA-1", "open_count": 4}]'
+        )
+        
+        handler = AppleScriptHandler()
+        areas = handler.get_hierarchy()
+        
+        mock_run_script_file.assert_called_once_with("get_hierarchy", ["0"])
+        assert areas[0]["projects"][0]["open_count"] == 4
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_get_logbook_skips_seen_todos(self, mock_run_script_file):
+        """Test that todos at the cursor second that were already returned are skipped."""
+        mock_run_script_file.return_value = (
+            '[{"id": "A", "title": "a", "completed_at": "2026-10-19T09:00:00"},'
+            ' {"id": "B", "title": "b", "completed_at": "2026-10-19T09:00:00"},'
+            ' {"id": "C", "title": "c", "completed_at": "2026-10-19T09:05:00"}]'
+        )
+        
+        handler = AppleScriptHandler()
+        cursor = LogbookCursor(datetime(2026, 10, 19, 9, 0), ["A"])
+        result = handler.get_logbook(cursor, limit=1)
+        
+        assert [task.id for task in result] == ["B"]
+        mock_run_script_file.assert_called_once_with("get_logbook", ["2026-10-19T09:00:00", "2"])
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_get_logbook_failure(self, mock_run_script_file):
+        """Test that a failed Logbook read returns no todos."""
+        mock_run_script_file.side_effect = RuntimeError("Script failed")
+        
+        handler = AppleScriptHandler()
+        
+        assert handler.get_logbook() == []
+        mock_run_script_file.assert_called_once_with("get_logbook", ["", "50"])
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_assign_project_success(self, mock_run_script_file):
         """Test successful project assignment."""
         handler = AppleScriptHandler()
-        result = handler.assign_project("Test Task", "Test Project")
+        result = handler.assign_project("TASK-1", "Test Project")
         
         assert result is True
-        mock_run_script.assert_called_once()
+        mock_run_script_file.assert_called_once_with("assign_project", ["TASK-1", "Test Project"])
     
-    @patch.object(AppleScriptHandler, 'run_script')
-    def test_assign_project_failure(self, mock_run_script):
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_set_tags_passes_values_as_arguments(self, mock_run_script_file):
+        """Test that user strings are passed via argv, never spliced into source."""
+        handler = AppleScriptHandler()
+        handler.set_tags("TASK-1", ['a" & (do shell script "x") & "', "b"])
+        
+        mock_run_script_file.assert_called_once_with(
+            "set_tags", ["TASK-1", 'a" & (do shell script "x") & ",b']
+        )
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_apply_changes(self, mock_run_script_file):
+        """Test that changes are flattened into one script run."""
+        mock_run_script_file.return_value = "[true,false]"
+        
+        handler = AppleScriptHandler()
+        handler.name_index.update([Task("TASK-1", "Old")])
+        result = handler.apply_changes([("TASK-1", "name", "New"), ("TASK-2", "area", "Work")])
+        
+        assert result == [True, False]
+        mock_run_script_file.assert_called_once_with(
+            "apply_changes", ["TASK-1", "name", "New", "TASK-2", "area", "Work"]
+        )
+        assert handler.name_index.lookup("New") == ["TASK-1"]
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_apply_changes_discards_completed(self, mock_run_script_file):
+        """Test that completed todos leave the name index."""
+        mock_run_script_file.return_value = "[true,false]"
+        
+        handler = AppleScriptHandler()
+        handler.name_index.update([Task("TASK-1", "Done"), Task("TASK-2", "Open")])
+        handler.apply_changes([("TASK-1", "completed", "true"), ("TASK-2", "completed", "true")])
+        
+        assert handler.name_index.lookup("Done") == []
+        assert handler.name_index.lookup("Open") == ["TASK-2"]
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_rename_task_updates_name_index(self, mock_run_script_file):
+        """Test that a successful rename is reflected in the name index."""
+        mock_run_script_file.return_value = "true"
+        
+        handler = AppleScriptHandler()
+        handler.name_index.update([Task("TASK-1", "Old")])
+        
+        assert handler.rename_task("TASK-1", "New") is True
+        assert handler.name_index.lookup("Old") == []
+        assert handler.name_index.lookup("New") == ["TASK-1"]
+    
+    @patch.object(AppleScriptHandler, 'run_script_file')
+    def test_assign_project_failure(self, mock_run_script_file):
         """Test project assignment failure."""
-        mock_run_script.side_effect = RuntimeError("Script failed")
+        mock_run_script_file.side_effect = RuntimeError("Script failed")
         
         handler = AppleScriptHandler()
-        result = handler.assign_project("Test Task", "Test Project")
+        result = handler.assign_project("TASK-1", "Test Project")
         
         assert result is False
 
 
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that only consecutive failures open the circuit."""
+        breaker = CircuitBreaker("Things3", failure_threshold=2)
+        
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "open"
+    
+    def test_probe_closes_circuit(self):
+        """Test that the circuit closes once the probe succeeds after the reset timeout."""
+        now = [0.0]
+        probe = Mock(side_effect=[False, True])
+        breaker = CircuitBreaker("Things3", reset_timeout=10, probe=probe, clock=lambda: now[0])
+        breaker.record_failure(timed_out=True)
+        
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        probe.assert_not_called()
+        
+        now[0] = 11
+        with pytest.raises(CircuitOpenError, match="still unavailable"):
+            breaker.before_call()
+        assert breaker.snapshot() == {"state": "open", "failures": 1, "retry_in": 10.0}
+        
+        now[0] = 22
+        breaker.before_call()
+        assert breaker.state == "closed"
+    
+    def test_trial_call_without_probe(self):
+        """Test that without a probe one trial call decides the state."""
+        now = [0.0]
+        breaker = CircuitBreaker("Things3", reset_timeout=10, clock=lambda: now[0])
+        breaker.record_failure(timed_out=True)
+        now[0] = 11
+        
+        breaker.before_call()
+        assert breaker.state == "half-open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+
 class TestXCallbackHandler:
     """Test cases for XCallbackHandler."""
     
@@ -148,6 +558,18 @@ class TestXCallbackHandler:
         with pytest.raises(RuntimeError, match="X-callback-url execution failed"):
             XCallbackHandler.call_url("things:///add?title=Test")
     
+    @patch.object(XCallbackHandler, 'call_url')
+    def test_create_fails_fast_while_open(self, mock_call_url):
+        """Test that creations stop opening URLs once the circuit opens."""
+        mock_call_url.side_effect = RuntimeError("X-callback-url execution timed out")
+        
+        handler = XCallbackHandler()
+        assert handler.create_todo("One") is False
+        with pytest.raises(CircuitOpenError):
+            handler.create_todo("Two")
+        
+        mock_call_url.assert_called_once()
+    
     @patch.object(XCallbackHandler, 'call_url')
     def test_create_project_success(self, mock_call_url):
         """Test successful project creation."""
@@ -165,6 +587,31 @@ class TestXCallbackHandler:
         assert "title=Test%20Project" in call_args
         assert "notes=Test%20notes" in call_args
     
+    @patch.object(XCallbackHandler, 'call_url')
+    def test_run_json(self, mock_call_url):
+        """Test that Things JSON is sent as the data parameter of one URL."""
+        mock_call_url.return_value = True
+        
+        handler = XCallbackHandler()
+        result = handler.run_json([{"type": "to-do", "attributes": {"title": "A & B"}}])
+        
+        assert result is True
+        url = mock_call_url.call_args[0][0]
+        assert url.startswith("things:///json?data=")
+        assert json.loads(urllib.parse.unquote(url.split("data=", 1)[1])) == [
+            {"type": "to-do", "attributes": {"title": "A & B"}}
+        ]
+        assert "auth-token" not in url
+    
+    @patch.object(XCallbackHandler, 'call_url')
+    def test_run_json_with_auth_token(self, mock_call_url):
+        """Test that the auth token is passed for update commands."""
+        mock_call_url.return_value = True
+        
+        XCallbackHandler().run_json([], auth_token="secret")
+        
+        assert "auth-token=secret&data=" in mock_call_url.call_args[0][0]
+    
     @patch.object(XCallbackHandler, 'call_url')
     def test_create_todo_success(self, mock_call_url):
         """Test successful todo creation."""
@@ -0,0 +1,86 @@
+"""Tests for the health tool."""
+
+import json
+from unittest.mock import Mock, patch
+
+from things3_mcp.handlers import AppleScriptHandler, CircuitBreaker, ThingsDatabase
+from things3_mcp.tools import HealthTools
+
+
+def make_tools(**kwargs) -> HealthTools:
+    applescript = AppleScriptHandler(breaker=CircuitBreaker("Things3", failure_threshold=1))
+    kwargs.setdefault("load", lambda: {"running": 1, "waiting": 0, "limit": 8})
+    return HealthTools(applescript, **kwargs)
+
+
+@patch.object(AppleScriptHandler, "probe", return_value=True)
+@patch.object(AppleScriptHandler, "ping", return_value=True)
+class TestHealthTools:
+    """Test cases for HealthTools."""
+
+    async def test_healthy_report(self, mock_ping, mock_probe):
+        """Test a text report for a reachable bridge."""
+        tools = make_tools()
+
+        result = await tools.handle_health({})
+
+        text = result[0].text
+        assert text.startswith("🩺 Things3 bridge: healthy")
+        assert "Latency: osascript" in text
+        assert "Circuit breaker: closed (0 failures)" in text
+        assert "Tool calls: 1 running, 0 waiting (limit 8)" in text
+
+    async def test_json_report_uses_database(self, mock_ping, mock_probe):
+        """Test that the database is probed as the data source when available."""
+        database = Mock(spec=ThingsDatabase, available=True)
+        database.ping.return_value = True
+        tools = make_tools(database=database)
+
+        result = await tools.handle_health({"format": "json"})
+
+        report = json.loads(result[0].text)
+        assert report["status"] == "healthy"
+        assert report["latency"]["data_source"]["type"] == "database"
+        assert report["latency"]["data_source"]["ok"] is True
+        database.ping.assert_called_once()
+
+    async def test_open_circuit_skips_things3(self, mock_ping, mock_probe):
+        """Test that an open circuit is reported without probing Things3."""
+        tools = make_tools()
+        tools.applescript.breaker.record_failure()
+
+        report = json.loads((await tools.handle_health({"format": "json"}))[0].text)
+
+        assert report["status"] == "unavailable"
+        assert report["latency"]["things3"] == {"ok": None, "ms": None}
+        mock_probe.assert_not_called()
+
+    async def test_probes_are_reused(self, mock_ping, mock_probe):
+        """Test that frequent health calls share one measurement."""
+        tools = make_tools()
+
+        await tools.handle_health({})
+        await tools.handle_health({})
+
+        mock_ping.assert_called_once()
+        mock_probe.assert_called_once()
+
+    async def test_state_only(self, mock_ping, mock_probe):
+        """Test that probe=false runs no process."""
+        tools = make_tools()
+
+        result = await tools.handle_health({"probe": False})
+
+        assert "Latency" not in result[0].text
+        mock_ping.assert_not_called()
+        mock_probe.assert_not_called()
+
+    async def test_failed_probe(self, mock_ping, mock_probe):
+        """Test that Things3 not answering is reported as unavailable."""
+        mock_probe.return_value = False
+        tools = make_tools()
+
+        result = await tools.handle_health({})
+
+        assert result[0].text.startswith("🩺 Things3 bridge: unavailable")
+        assert "Things3 failed after" in result[0].text
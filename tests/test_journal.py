@@ -0,0 +1,209 @@
+"""Tests for the write-behind mutation journal."""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from things3_mcp.config import Settings
+from things3_mcp.journal import (
+    STATUS_APPLIED,
+    STATUS_FAILED,
+    STATUS_PENDING,
+    MutationJournal,
+    WriteBehindQueue,
+)
+from things3_mcp.mutations import (
+    Mutation,
+    MutationBatcher,
+    apply_mutation,
+    apply_mutations,
+    coalesce,
+)
+from things3_mcp.server import Things3Server
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = MutationJournal(tmp_path / "journal.sqlite3")
+    yield journal
+    journal.close()
+
+
+class TestMutation:
+    """Test cases for Mutation."""
+    
+    def test_unknown_kind(self):
+        """Test that unknown mutation kinds are rejected."""
+        with pytest.raises(ValueError, match="Unknown mutation kind"):
+            Mutation("delete_everything", "TASK-1", None)
+    
+    def test_coalesce_last_write_wins(self):
+        """Test that repeated writes to the same slot collapse to the last one."""
+        mutations = [
+            Mutation("set_tags", "A", ["x"]),
+            Mutation("assign_project", "A", "Home"),
+            Mutation("rename_task", "B", "Other"),
+            Mutation("set_tags", "A", ["y"]),
+            Mutation("assign_area", "A", "Work"),
+        ]
+        
+        survivors, owners = coalesce(mutations)
+        
+        assert survivors == [
+            Mutation("set_tags", "A", ["y"]),
+            Mutation("assign_area", "A", "Work"),
+            Mutation("rename_task", "B", "Other"),
+        ]
+        assert owners == [0, 1, 2, 0, 1]
+    
+    def test_apply_mutations_single_round_trip(self):
+        """Test that a batch becomes one apply_changes call with shared results."""
+        handler = Mock()
+        handler.apply_changes.return_value = [True, False]
+        
+        results = apply_mutations(handler, [
+            Mutation("set_tags", "A", ["x"]),
+            Mutation("rename_task", "A", "New"),
+            Mutation("set_tags", "A", ["y", "z"]),
+        ])
+        
+        handler.apply_changes.assert_called_once_with([("A", "name", "New"), ("A", "tags", "y,z")])
+        assert results == [False, True, False]
+    
+    async def test_batcher_gathers_within_window(self):
+        """Test that mutations submitted within the window share one batch."""
+        batches = []
+        batcher = MutationBatcher(lambda ms: batches.append(list(ms)) or [True] * len(ms), window=0.01)
+        
+        results = await asyncio.gather(
+            batcher.submit(Mutation("set_tags", "A", ["x"])),
+            batcher.submit(Mutation("assign_project", "A", "Home")),
+        )
+        
+        assert results == [True, True]
+        assert len(batches) == 1 and len(batches[0]) == 2
+    
+    def test_coalescing_on_by_default(self):
+        """Test the default coalesce window and that 0 disables the batcher."""
+        assert Settings.from_env({}).coalesce_window == 0.05
+        assert Things3Server(Settings()).batcher is not None
+        
+        settings = Settings.from_env({"THINGS3_MCP_COALESCE_WINDOW_MS": "0"})
+        assert Things3Server(settings).batcher is None
+    
+    def test_apply_mutation_dispatches_to_handler(self):
+        """Test that a mutation is applied through the matching handler method."""
+        handler = Mock()
+        handler.assign_area.return_value = True
+        
+        assert apply_mutation(handler, Mutation("assign_area", "TASK-1", "Work")) is True
+        handler.assign_area.assert_called_once_with("TASK-1", "Work")
+
+
+class TestMutationJournal:
+    """Test cases for MutationJournal."""
+    
+    def test_append_and_next_pending_in_order(self, journal):
+        """Test that pending entries come back oldest first."""
+        first = journal.append(Mutation("set_tags", "TASK-1", ["a"]))
+        journal.append(Mutation("rename_task", "TASK-2", "New"))
+        
+        entry = journal.next_pending()
+        assert entry.op_id == first
+        assert entry.mutation == Mutation("set_tags", "TASK-1", ["a"])
+        assert entry.status == STATUS_PENDING
+    
+    def test_survives_reopen(self, tmp_path):
+        """Test that pending entries are still there after a restart."""
+        path = tmp_path / "journal.sqlite3"
+        journal = MutationJournal(path)
+        journal.append(Mutation("assign_project", "TASK-1", "Home"))
+        journal.close()
+        
+        reopened = MutationJournal(path)
+        entry = reopened.next_pending()
+        reopened.close()
+        
+        assert entry.mutation == Mutation("assign_project", "TASK-1", "Home")
+    
+    def test_counts(self, journal):
+        """Test per-status counts."""
+        applied = journal.append(Mutation("set_tags", "TASK-1", []))
+        failed = journal.append(Mutation("set_tags", "TASK-2", []))
+        journal.append(Mutation("set_tags", "TASK-3", []))
+        journal.mark_applied(applied)
+        journal.mark_failed(failed, "boom")
+        
+        assert journal.counts() == {STATUS_PENDING: 1, STATUS_APPLIED: 1, STATUS_FAILED: 1}
+        assert [e.op_id for e in journal.entries([STATUS_FAILED])] == [failed]
+
+
+class TestWriteBehindQueue:
+    """Test cases for WriteBehindQueue."""
+    
+    async def test_applies_in_order(self, journal):
+        """Test that queued mutations are applied in submission order."""
+        batches = []
+        queue = WriteBehindQueue(journal, lambda ms: batches.append([m.task_id for m in ms]) or [True] * len(ms))
+        queue.submit(Mutation("set_tags", "TASK-1", ["a"]))
+        queue.submit(Mutation("set_tags", "TASK-2", ["b"]))
+        
+        while await queue.process_next() is not None:
+            pass
+        
+        assert batches == [["TASK-1", "TASK-2"]]
+        assert journal.counts()[STATUS_APPLIED] == 2
+    
+    async def test_retries_with_backoff_then_fails(self, journal):
+        """Test that failed attempts are retried and eventually marked failed."""
+        apply = Mock(side_effect=RuntimeError("Things3 busy"))
+        queue = WriteBehindQueue(journal, apply, max_attempts=2, base_delay=10)
+        op_id = queue.submit(Mutation("rename_task", "TASK-1", "New"))
+        
+        assert await queue.process_next() == 0
+        entry = journal.get(op_id)
+        assert entry.status == STATUS_PENDING
+        assert entry.attempts == 1
+        assert entry.last_error == "Things3 busy"
+        
+        # The retry is not due yet, and it holds back later entries
+        queue.submit(Mutation("set_tags", "TASK-2", []))
+        wait = await queue.process_next()
+        assert 0 < wait <= 10
+        assert apply.call_count == 1
+        
+        journal._update(op_id, "next_attempt_at = ?", (time.time(),))
+        assert await queue.process_next() == 0
+        
+        assert journal.get(op_id).status == STATUS_FAILED
+        assert apply.call_count == 2
+        assert len(apply.call_args[0][0]) == 2
+    
+    async def test_failed_entry_does_not_block_later_ones(self, journal):
+        """Test that an exhausted entry no longer holds up the queue."""
+        queue = WriteBehindQueue(journal, lambda ms: [m.task_id != "BAD" for m in ms], max_attempts=1)
+        queue.submit(Mutation("set_tags", "BAD", []))
+        good = queue.submit(Mutation("set_tags", "GOOD", []))
+        
+        while await queue.process_next() is not None:
+            pass
+        
+        assert journal.get(good).status == STATUS_APPLIED
+    
+    async def test_worker_drains_on_submit(self, journal):
+        """Test that the background worker wakes up for new submissions."""
+        applied = []
+        queue = WriteBehindQueue(journal, lambda ms: [applied.append(m.task_id) or True for m in ms])
+        queue.start()
+        try:
+            queue.submit(Mutation("set_tags", "TASK-1", []))
+            for _ in range(100):
+                if applied:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await queue.stop()
+        
+        assert applied == ["TASK-1"]
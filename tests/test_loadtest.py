@@ -0,0 +1,127 @@
+"""Tests for the load test and the simulated backend."""
+
+import json
+
+import pytest
+
+from things3_mcp.config import Settings
+from things3_mcp.handlers.simulated import SimulatedAppleScriptHandler, SimulatedLibrary
+from things3_mcp.loadtest import (
+    SAMPLE_SESSION,
+    LoadReport,
+    load_session,
+    percentile,
+    run_load,
+)
+from things3_mcp.query import TodoQuery
+from things3_mcp.server import Things3Server
+
+
+class TestSessions:
+    """Test cases for reading recorded sessions."""
+
+    def test_load_session_skips_handshake(self, tmp_path):
+        """Test that initialize, notifications and responses are not replayed."""
+        path = tmp_path / "session.jsonl"
+        path.write_text("\n".join(json.dumps(message) for message in [
+            {"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}},
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            {"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+            {"jsonrpc": "2.0", "id": 1, "result": {"tools": []}},
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "view-today"}},
+        ]))
+
+        assert load_session(path) == [
+            {"method": "tools/list", "params": None},
+            {"method": "tools/call", "params": {"name": "view-today"}},
+        ]
+
+    def test_load_session_rejects_unknown_methods(self, tmp_path):
+        """Test that a method the harness cannot replay is reported."""
+        path = tmp_path / "session.json"
+        path.write_text(json.dumps([{"jsonrpc": "2.0", "id": 1, "method": "sampling/createMessage"}]))
+
+        with pytest.raises(ValueError):
+            load_session(path)
+
+    def test_sample_session(self):
+        """Test that the bundled sample session can be read."""
+        assert len(load_session(SAMPLE_SESSION)) > 5
+
+
+class TestLoadReport:
+    """Test cases for the load report."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(value) for value in range(1, 101)]
+
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile([], 0.5) == 0.0
+
+    def test_summary(self):
+        """Test throughput and per-request statistics."""
+        report = LoadReport(duration=2.0)
+        report.record("view-today", 0.010, False)
+        report.record("view-today", 0.030, True)
+        report.record("tools/list", 0.002, False)
+
+        summary = report.summary()
+
+        assert summary["requests"] == 3
+        assert summary["errors"] == 1
+        assert summary["throughput_rps"] == 1.5
+        assert summary["by_request"]["view-today"] == {
+            "requests": 2, "errors": 1, "p50_ms": 10.0, "p99_ms": 30.0
+        }
+
+
+class TestSimulatedBackend:
+    """Test cases for the simulated backend."""
+
+    def test_lists_and_mutations(self):
+        """Test that views are served from the library and mutations change it."""
+        handler = SimulatedAppleScriptHandler(SimulatedLibrary(todo_count=50), latency=0)
+        todo = handler.get_today_tasks()[0]
+
+        assert handler.rename_task(todo.id, "Renamed") is True
+        assert handler.get_today_tasks()[0].title == "Renamed"
+        assert handler.rename_task("missing", "x") is False
+
+    def test_query_is_evaluated(self):
+        """Test that queries only return matching todos."""
+        handler = SimulatedAppleScriptHandler(latency=0)
+
+        todos = handler.query_todos(TodoQuery(tag="errand", limit=5))
+
+        assert 0 < len(todos) <= 5
+        assert all("errand" in todo.tags for todo in todos)
+
+    def test_server_backend(self):
+        """Test that the server builds the simulated backend from the settings."""
+        server = Things3Server(Settings(backend="simulated"))
+
+        assert isinstance(server.applescript, SimulatedAppleScriptHandler)
+        assert server.database.available is False
+        assert server.create_tools.xcallback.library is server.applescript.library
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected."""
+        with pytest.raises(ValueError):
+            Things3Server(Settings(backend="nope")).applescript
+
+
+class TestRunLoad:
+    """End-to-end load test against a simulated server."""
+
+    async def test_http(self):
+        """Test replaying the sample session from two clients over HTTP."""
+        sessions = [load_session(SAMPLE_SESSION)]
+
+        report = await run_load(sessions, transport="http", concurrency=2, latency_ms=0)
+
+        summary = report.summary()
+        assert summary["requests"] == 2 * len(sessions[0])
+        assert summary["errors"] == 0
+        assert summary["by_request"]["view-today"]["requests"] == 4
@@ -0,0 +1,98 @@
+"""Tests for the task model."""
+
+import json
+import tracemalloc
+from datetime import date
+
+from things3_mcp.models import Task, format_date, intern_tags, parse_date
+
+BENCHMARK_TASKS = 50_000
+
+
+def _payload(count):
+    """Script output for ``count`` todos with realistic repetition."""
+    return json.dumps([
+        {
+            "id": f"TASK-{i}",
+            "title": f"Todo number {i}",
+            "notes": "",
+            "due_date": f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}" if i % 3 == 0 else "",
+            "when": "",
+            "tags": ["home, errands", "work", "waiting, work", ""][i % 4],
+            "project": f"Project {i % 40}",
+            "area": f"Area {i % 5}",
+            "status": "open",
+        }
+        for i in range(count)
+    ])
+
+
+def _retained_bytes(build):
+    tracemalloc.start()
+    try:
+        value = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del value
+    return current
+
+
+class TestTask:
+    """Test cases for Task."""
+    
+    def test_from_dict_parses_and_interns(self):
+        """Test decoding of a script result."""
+        task = Task.from_dict({
+            "id": "A", "title": "Buy milk", "due_date": "2026-10-20", "when": "",
+            "tags": "home, errands", "project": "Chores",
+        })
+        
+        assert task.due_date == date(2026, 10, 20)
+        assert task.when is None
+        assert task.tags == ("home", "errands")
+        assert task.project == "Chores"
+        assert task.area == ""
+    
+    def test_repeated_values_are_shared(self):
+        """Test that equal tag lists and names are stored once."""
+        first = Task.from_dict({"id": "A", "title": "a", "tags": "home, work", "project": "P" * 20})
+        second = Task.from_dict({"id": "B", "title": "b", "tags": "home, work", "project": "P" * 20})
+        
+        assert first.tags is second.tags
+        assert first.project is second.project
+    
+    def test_unparsed_dates_are_kept_as_text(self):
+        """Test that non-ISO dates survive decoding."""
+        task = Task.from_dict({"id": "A", "title": "a", "due_date": "Monday, 20 October 2026"})
+        
+        assert task.due_date == "Monday, 20 October 2026"
+        assert format_date(task.due_date) == "Monday, 20 October 2026"
+    
+    def test_to_dict_round_trip(self):
+        """Test serializing a task back to a dictionary."""
+        data = {
+            "id": "A", "title": "a", "notes": "n", "due_date": "2026-10-20", "when": "",
+            "tags": ["home"], "project": "P", "area": "", "status": "open",
+            "completed_at": "2026-10-20T09:30:00",
+        }
+        
+        assert Task.from_dict(data).to_dict() == data
+    
+    def test_helpers(self):
+        """Test the parsing helpers on edge cases."""
+        assert intern_tags("") == ()
+        assert intern_tags(" a , ,b ") == ("a", "b")
+        assert parse_date(None) is None
+        assert parse_date("2026-10-20 09:30:00") == date(2026, 10, 20)
+    
+    def test_memory_benchmark(self):
+        """Benchmark: 50k tasks must use far less memory than plain dicts."""
+        payload = _payload(BENCHMARK_TASKS)
+        
+        dict_bytes = _retained_bytes(lambda: json.loads(payload))
+        task_bytes = _retained_bytes(lambda: [Task.from_dict(item) for item in json.loads(payload)])
+        
+        assert task_bytes < dict_bytes * 0.6, (
+            f"{BENCHMARK_TASKS} tasks: dicts {dict_bytes / 1e6:.1f} MB, Task {task_bytes / 1e6:.1f} MB"
+        )
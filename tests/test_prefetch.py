@@ -0,0 +1,130 @@
+"""Tests for warmup and predictive prefetch."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from things3_mcp.config import Settings
+from things3_mcp.prefetch import PREFETCHABLE_TOOLS, WRITE_TOOLS, Prefetcher
+from things3_mcp.server import Things3Server
+
+
+def make_prefetcher(**kwargs) -> Prefetcher:
+    fetch = AsyncMock(side_effect=lambda name, arguments: [name, arguments])
+    return Prefetcher(fetch, **kwargs)
+
+
+class TestPrefetcher:
+    """Test cases for Prefetcher."""
+
+    async def test_warmup_is_served_once(self):
+        """Test that a warmed-up tool is answered from the prefetch, then fetched again."""
+        prefetcher = make_prefetcher()
+        prefetcher.warm(["view-today", "create-todo"])
+        await asyncio.sleep(0)
+
+        assert await prefetcher.call("view-today", {}) == ["view-today", {}]
+        await prefetcher.call("view-today", {})
+
+        # create-todo is never prefetched
+        assert prefetcher.fetch.await_count == 2
+        assert prefetcher.stats()["hits"] == 1
+        await prefetcher.stop()
+
+    async def test_learned_sequence_is_prefetched(self):
+        """Test that the usual next call is fetched before it is made."""
+        prefetcher = make_prefetcher()
+        for _ in range(2):
+            await prefetcher.call("view-projects", {})
+            await prefetcher.call("view-project", {"project": "Home"})
+            await prefetcher.call("view-areas", {})
+
+        await prefetcher.call("view-projects", {})
+        await asyncio.sleep(0)
+        before = prefetcher.fetch.await_count
+        await prefetcher.call("view-project", {"project": "Home"})
+
+        assert prefetcher.fetch.await_count == before
+        assert prefetcher.hits == 1
+        await prefetcher.stop()
+
+    async def test_mutation_discards_prefetches(self):
+        """Test that a mutating tool call drops every prefetched result."""
+        prefetcher = make_prefetcher()
+        prefetcher.warm(["view-today"])
+        await asyncio.sleep(0)
+
+        await prefetcher.call("create-todo", {"title": "Milk"})
+        await prefetcher.call("view-today", {})
+
+        assert prefetcher.hits == 0
+        await prefetcher.stop()
+
+    async def test_reads_keep_prefetches(self):
+        """Test that read-only tools outside the prefetchable set keep prefetched results."""
+        prefetcher = make_prefetcher()
+        prefetcher.warm(["view-today"])
+        await asyncio.sleep(0)
+
+        for name in ("view-logbook", "get-selected-todos", "health", "mutation-status"):
+            await prefetcher.call(name, {})
+        await prefetcher.call("view-today", {})
+
+        assert prefetcher.hits == 1
+        await prefetcher.stop()
+
+    def test_write_tools_match_tool_definitions(self):
+        """Test that every tool is classified as a write or a read."""
+        server = Things3Server(Settings(backend="simulated"))
+        names = {
+            tool.name
+            for group in (server.create_tools, server.view_tools, server.manage_tools)
+            for tool in group.get_tool_definitions()
+        }
+        reads = {"view-logbook", "get-selected-todos", "mutation-status"}
+
+        assert names == WRITE_TOOLS | PREFETCHABLE_TOOLS | reads
+
+    async def test_stale_prefetch_is_not_served(self):
+        """Test that a prefetch older than the TTL is fetched again."""
+        prefetcher = make_prefetcher(ttl=0.01)
+        prefetcher.warm(["view-today"])
+        await asyncio.sleep(0.05)
+
+        await prefetcher.call("view-today", {})
+
+        assert prefetcher.hits == 0
+        await prefetcher.stop()
+
+    async def test_waiting_prefetch_does_not_deadlock(self):
+        """Test that a call holding the only slot does not wait for a queued prefetch."""
+        slots = asyncio.Semaphore(1)
+        prefetcher = make_prefetcher(slots=slots)
+
+        async with slots:
+            prefetcher.warm(["view-today"])
+            result = await asyncio.wait_for(prefetcher.call("view-today", {}), 1)
+
+        assert result == ["view-today", {}]
+        await prefetcher.stop()
+
+    async def test_disabled(self):
+        """Test that a TTL of 0 turns prefetching off."""
+        prefetcher = make_prefetcher(ttl=0)
+        prefetcher.warm(["view-today"])
+
+        assert prefetcher.stats()["pending"] == 0
+
+
+class TestPrefetchSettings:
+    """Test cases for the prefetch settings."""
+
+    def test_warmup_from_env(self):
+        """Test that the warmup list is read as a comma-separated list."""
+        settings = Settings.from_env({"THINGS3_MCP_WARMUP": "view-inbox, view-areas"})
+
+        assert settings.warmup_tools == ["view-inbox", "view-areas"]
+
+    def test_empty_warmup_disables(self):
+        """Test that an empty warmup list disables the warmup."""
+        assert Settings.from_env({"THINGS3_MCP_WARMUP": ""}).warmup_tools == []
+        assert Settings.from_env({}).warmup_tools == ["view-today", "view-projects"]
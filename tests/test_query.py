@@ -0,0 +1,170 @@
+"""Tests for todo queries."""
+
+from datetime import date, datetime
+
+import pytest
+
+from things3_mcp.models import Task
+from things3_mcp.query import LogbookCursor, TodoQuery, parse_date, parse_timestamp
+
+TODAY = date(2026, 10, 19)
+
+
+class TestParseDate:
+    """Test cases for date filter values."""
+    
+    def test_iso_date(self):
+        """Test an absolute date."""
+        assert parse_date("2026-12-24", TODAY) == date(2026, 12, 24)
+    
+    def test_named_and_relative_dates(self):
+        """Test dates relative to today."""
+        assert parse_date("today", TODAY) == TODAY
+        assert parse_date("Tomorrow", TODAY) == date(2026, 10, 20)
+        assert parse_date("yesterday", TODAY) == date(2026, 10, 18)
+        assert parse_date("+7d", TODAY) == date(2026, 10, 26)
+        assert parse_date("-3d", TODAY) == date(2026, 10, 16)
+    
+    def test_invalid_date(self):
+        """Test that unsupported formats are rejected."""
+        with pytest.raises(ValueError, match="Invalid date"):
+            parse_date("next week", TODAY)
+
+
+class TestTodoQuery:
+    """Test cases for TodoQuery."""
+    
+    def test_from_arguments(self):
+        """Test building a query from tool arguments."""
+        query = TodoQuery.from_arguments(
+            {"tag": "waiting", "due_from": "today", "due_to": "+6d", "limit": 10}, today=TODAY
+        )
+        
+        assert query.tag == "waiting"
+        assert query.due_from == TODAY
+        assert query.due_to == date(2026, 10, 25)
+        assert query.status == "open"
+        assert query.limit == 10
+    
+    def test_rejects_unknown_list_and_status(self):
+        """Test validation of enumerated filters."""
+        with pytest.raises(ValueError, match="Unknown list"):
+            TodoQuery(list="Trash")
+        with pytest.raises(ValueError, match="Unknown status"):
+            TodoQuery(status="done")
+    
+    def test_values_are_passed_as_arguments(self):
+        """Test that filter values never appear in the script source."""
+        query = TodoQuery(project='Launch "v2"', text="review", due_to=date(2026, 10, 25))
+        
+        script, args = query.to_applescript()
+        
+        assert 'Launch "v2"' not in script
+        assert "review" not in script
+        assert args == ['Launch "v2"', "2026-10-26", "review", "100"]
+        assert "to dos of project arg1 whose status is open" in script
+        assert "due date < arg2" in script
+        assert "set arg2 to my isoDate(item 2 of argv)" in script
+        assert "(name contains arg3 or notes contains arg3)" in script
+    
+    def test_every_container_filter_is_pushed_down(self):
+        """Test that filters besides the source are predicates, not post-filters."""
+        query = TodoQuery(list="Today", project="Launch", area="Work", tag="waiting", limit=5)
+
+        script, args = query.to_applescript()
+
+        assert args == ["Today", "Launch", "Work", "waiting", "5"]
+        assert (
+            "(to dos of list arg1 whose status is open"
+            " and (project is not missing value and name of project is arg2)"
+            " and (area is not missing value and name of area is arg3)"
+            " and (tag names is arg4 or tag names starts with (arg4 & \", \")"
+        ) in script
+        assert "tag names contains arg4 " not in script
+        assert "set maxCount to arg5 as integer" in script
+
+    def test_script_depends_only_on_filter_shape(self):
+        """Test that queries with the same filters share one script."""
+        first, _ = TodoQuery(tag="waiting", text="a").to_applescript()
+        second, _ = TodoQuery(tag="errands", text="b").to_applescript()
+        
+        assert first == second
+    
+    def test_source_prefers_list_then_project(self):
+        """Test which container is used to fetch todos."""
+        assert TodoQuery().source is None
+        assert TodoQuery(tag="x", area="A").source == "area"
+        assert TodoQuery(list="Today", project="P").source == "list"
+        
+        script, _ = TodoQuery().to_applescript()
+        assert "(to dos whose status is open)" in script
+    
+    def test_matches_checks_remaining_containers(self):
+        """Test the exact checks for filters used as predicates."""
+        query = TodoQuery(list="Today", project="Launch", tag="waiting")
+        
+        assert query.matches(Task("A", "a", project="Launch", tags=("home", "waiting")))
+        assert not query.matches(Task("B", "b", project="Other", tags=("waiting",)))
+        assert not query.matches(Task("C", "c", project="Launch", tags=("waiting room",)))
+
+    
+    def test_overdue(self):
+        """Test that overdue caps the due range at yesterday."""
+        query = TodoQuery.from_arguments({"overdue": True}, today=TODAY)
+        
+        assert query.due_from is None
+        assert query.due_to == date(2026, 10, 18)
+        assert query.date_only
+    
+    def test_date_only(self):
+        """Test which queries can be answered from the date index."""
+        assert TodoQuery(due_to=TODAY).date_only
+        assert not TodoQuery().date_only
+        assert not TodoQuery(due_to=TODAY, tag="waiting").date_only
+        assert not TodoQuery(due_to=TODAY, status="completed").date_only
+    
+    def test_matches_dates(self):
+        """Test date range checks against parsed dates."""
+        query = TodoQuery(due_from=TODAY, when_to=TODAY)
+        
+        assert query.matches_dates(Task("A", "a", due_date=TODAY, when=date(2026, 10, 1)))
+        assert not query.matches_dates(Task("B", "b", due_date=TODAY))
+        assert not query.matches_dates(Task("C", "c", due_date=date(2026, 10, 18), when=TODAY))
+
+
+class TestLogbookCursor:
+    """Test cases for Logbook cursors."""
+    
+    def test_parse_timestamp(self):
+        """Test timestamps and plain dates as ``since`` values."""
+        assert parse_timestamp("2026-10-19T08:30:15") == datetime(2026, 10, 19, 8, 30, 15)
+        assert parse_timestamp("yesterday", TODAY) == datetime(2026, 10, 18)
+        with pytest.raises(ValueError):
+            parse_timestamp("2026-10-19Tnoon")
+    
+    def test_round_trip(self):
+        """Test that a cursor survives encoding as an opaque token."""
+        cursor = LogbookCursor(datetime(2026, 10, 19, 8, 30), ["A", "B"])
+        token = cursor.encode()
+        
+        assert "=" not in token
+        assert LogbookCursor.decode(token) == cursor
+    
+    def test_invalid_token(self):
+        """Test that malformed tokens are rejected."""
+        with pytest.raises(ValueError):
+            LogbookCursor.decode("not a cursor")
+        with pytest.raises(ValueError):
+            LogbookCursor.decode(LogbookCursor(datetime(2026, 10, 19)).encode()[:-4])
+    
+    def test_after_keeps_ids_at_last_timestamp(self):
+        """Test that the cursor remembers every todo completed at its second."""
+        last = datetime(2026, 10, 19, 9, 0)
+        tasks = [
+            Task("A", "a", completed_at=datetime(2026, 10, 19, 8, 0)),
+            Task("B", "b", completed_at=last),
+            Task("C", "c", completed_at=last),
+        ]
+        
+        assert LogbookCursor.after(tasks) == LogbookCursor(last, ["B", "C"])
+        assert LogbookCursor.after([]) is None
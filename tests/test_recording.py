@@ -0,0 +1,156 @@
+"""Tests for the record-and-replay backend."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from things3_mcp.config import Settings
+from things3_mcp.handlers import AppleScriptHandler, XCallbackHandler
+from things3_mcp.handlers.recording import (
+    Recording,
+    RecordingAppleScriptHandler,
+    RecordingWriter,
+    RecordingXCallbackHandler,
+    ReplayAppleScriptHandler,
+    ReplayXCallbackHandler,
+)
+from things3_mcp.query import TodoQuery
+from things3_mcp.server import Things3Server
+
+TODAY = json.dumps([{"id": "TASK-1", "title": "Today task", "due_date": "2026-10-20"}])
+
+
+def record(path, outputs):
+    """Run a few calls through a recording handler whose scripts return ``outputs``."""
+    writer = RecordingWriter(path)
+    handler = RecordingAppleScriptHandler(writer)
+    with patch.object(AppleScriptHandler, "_execute", side_effect=outputs):
+        tasks = handler.get_today_tasks()
+        renamed = handler.rename_task("TASK-1", "Renamed")
+        queried = handler.query_todos(TodoQuery(tag="errand"))
+    writer.close()
+    return tasks, renamed, queried
+
+
+class TestRecordAndReplay:
+    """Test cases for recording and replaying script runs."""
+
+    @pytest.mark.parametrize("name", ["calls.jsonl", "calls.jsonl.gz"])
+    def test_replay_reproduces_results(self, tmp_path, name):
+        """Test that replayed calls return exactly what was recorded."""
+        path = tmp_path / name
+        recorded = record(path, [TODAY, RuntimeError("AppleScript execution failed: gone"), TODAY])
+
+        handler = ReplayAppleScriptHandler(Recording.load(path))
+        replayed = (
+            handler.get_today_tasks(),
+            handler.rename_task("TASK-1", "Renamed"),
+            handler.query_todos(TodoQuery(tag="errand")),
+        )
+
+        assert replayed == recorded
+        assert recorded[1] is False
+
+    def test_generated_source_is_stored_once(self, tmp_path):
+        """Test that the archive keeps each generated script's source with its first call."""
+        path = tmp_path / "calls.jsonl"
+        record(path, [TODAY, "true", "[]"])
+        writer = RecordingWriter(tmp_path / "twice.jsonl")
+        handler = RecordingAppleScriptHandler(writer)
+        with patch.object(AppleScriptHandler, "_execute", return_value="[]"):
+            handler.query_todos(TodoQuery(tag="errand"))
+            handler.query_todos(TodoQuery(tag="home"))
+        writer.close()
+
+        source, = Recording.load(path).sources.values()
+        lines = [json.loads(line) for line in writer.path.read_text().splitlines()[1:]]
+
+        assert TodoQuery(tag="errand").to_applescript()[0] in source
+        assert [("source" in line) for line in lines] == [True, False]
+
+    def test_repeated_calls_replay_in_order(self, tmp_path):
+        """Test that a call recorded twice answers in order, then repeats the last answer."""
+        path = tmp_path / "calls.jsonl"
+        writer = RecordingWriter(path)
+        for output in ("first", "second"):
+            writer.record("script_file", "get_inbox", [], 0.01, output=output)
+        writer.close()
+
+        recording = Recording.load(path)
+
+        assert [recording.next("script_file", "get_inbox", [])["output"] for _ in range(3)] == [
+            "first", "second", "second"
+        ]
+        assert recording.next("script_file", "get_today", []) is None
+
+    @patch("things3_mcp.handlers.recording.time.sleep")
+    def test_keep_latency(self, mock_sleep, tmp_path):
+        """Test that replay can wait as long as the recorded call took."""
+        path = tmp_path / "calls.jsonl"
+        writer = RecordingWriter(path)
+        writer.record("script_file", "get_inbox", [], 0.25, output="[]")
+        writer.close()
+
+        ReplayAppleScriptHandler(Recording.load(path), keep_latency=True).get_inbox_tasks()
+
+        mock_sleep.assert_called_once_with(0.25)
+
+    def test_unrecorded_call_fails(self, tmp_path):
+        """Test that a call missing from the recording fails like a script error."""
+        path = tmp_path / "calls.jsonl"
+        RecordingWriter(path).close()
+
+        assert ReplayAppleScriptHandler(Recording.load(path)).get_projects() == []
+
+    @patch.object(XCallbackHandler, "call_url", return_value=True)
+    def test_urls(self, mock_call_url, tmp_path):
+        """Test recording and replaying x-callback-url calls."""
+        path = tmp_path / "calls.jsonl"
+        writer = RecordingWriter(path)
+        assert RecordingXCallbackHandler(writer).create_todo("Milk") is True
+        writer.close()
+
+        replay = ReplayXCallbackHandler(Recording.load(path))
+
+        assert replay.create_todo("Milk") is True
+        assert replay.create_todo("Bread") is False
+        mock_call_url.assert_called_once()
+
+    @patch.object(XCallbackHandler, "call_url", return_value=True)
+    def test_auth_token_not_recorded(self, mock_call_url, tmp_path):
+        """Test that the URL scheme auth token is not written to the archive."""
+        path = tmp_path / "calls.jsonl"
+        writer = RecordingWriter(path)
+        RecordingXCallbackHandler(writer).run_json([], auth_token="secret")
+        writer.close()
+
+        assert "secret" not in path.read_text()
+        assert ReplayXCallbackHandler(Recording.load(path)).run_json([], auth_token="other") is True
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that a file that is not a recording is rejected."""
+        path = tmp_path / "session.jsonl"
+        path.write_text('{"jsonrpc": "2.0", "id": 1, "method": "tools/list"}\n')
+
+        with pytest.raises(ValueError):
+            Recording.load(path)
+
+
+class TestServerBackends:
+    """Test cases for choosing the record and replay backends."""
+
+    def test_replay_backend(self, tmp_path):
+        """Test that the replay backend serves scripts and URLs from the archive."""
+        path = tmp_path / "calls.jsonl"
+        RecordingWriter(path).close()
+        server = Things3Server(Settings(backend="replay", recording_path=path))
+
+        assert isinstance(server.applescript, ReplayAppleScriptHandler)
+        assert isinstance(server.create_tools.xcallback, ReplayXCallbackHandler)
+        assert server.database.available is False
+
+    def test_recording_path_required(self):
+        """Test that record mode needs an archive path."""
+        with pytest.raises(ValueError):
+            Things3Server(Settings(backend="record")).applescript
@@ -0,0 +1,108 @@
+"""Tests for MCP resources and change subscriptions."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from pydantic import AnyUrl
+
+from things3_mcp.models import Task
+from things3_mcp.resources import RESOURCES, ResourceHub
+from things3_mcp.server import Things3Server
+
+TODAY = AnyUrl("things://list/today")
+PROJECTS = AnyUrl("things://projects")
+
+
+def make_hub() -> ResourceHub:
+    return ResourceHub(Mock(), interval=0.01)
+
+
+class TestResourceHub:
+    """Test cases for ResourceHub."""
+
+    def test_definitions(self):
+        """Test that every resource is listed as JSON."""
+        definitions = ResourceHub.definitions()
+
+        assert [str(resource.uri) for resource in definitions] == list(RESOURCES)
+        assert all(resource.mimeType == "application/json" for resource in definitions)
+
+    async def test_read_list(self):
+        """Test reading a list resource."""
+        hub = make_hub()
+        hub.applescript.get_list_tasks.return_value = [Task("TASK-1", "Today task")]
+
+        [contents] = await hub.read(TODAY)
+
+        hub.applescript.get_list_tasks.assert_called_once_with("Today")
+        assert json.loads(contents.content)[0]["title"] == "Today task"
+
+    async def test_read_unknown(self):
+        """Test that unknown URIs are rejected."""
+        with pytest.raises(ValueError):
+            await make_hub().read(AnyUrl("things://list/nope"))
+
+    @patch.object(ResourceHub, "start")
+    async def test_check_notifies_on_change_only(self, mock_start):
+        """Test that subscribers hear about changes, not about the first check."""
+        hub = make_hub()
+        session = Mock(send_resource_updated=AsyncMock())
+        hub.subscribe(PROJECTS, session)
+        hub.subscribe(TODAY, session)
+        hub.applescript.run_script_file.side_effect = [
+            "t1\x1ep1",
+            "t1\x1ep1",
+            "t2\x1ep1",
+        ]
+
+        assert await hub.check() == []
+        assert await hub.check() == []
+        assert await hub.check() == ["things://list/today"]
+
+        hub.applescript.run_script_file.assert_called_with(
+            "get_fingerprints", ["Today", "projects"]
+        )
+        session.send_resource_updated.assert_awaited_once_with(TODAY)
+
+    @patch.object(ResourceHub, "start")
+    async def test_closed_session_is_dropped(self, mock_start):
+        """Test that a session that cannot be notified is unsubscribed."""
+        hub = make_hub()
+        session = Mock(send_resource_updated=AsyncMock(side_effect=RuntimeError("closed")))
+        hub.subscribe(TODAY, session)
+        hub.applescript.run_script_file.side_effect = ["a", "b"]
+
+        await hub.check()
+        await hub.check()
+
+        assert await hub.check() == []
+        assert hub.applescript.run_script_file.call_count == 2
+
+    async def test_detector_runs_while_subscribed(self):
+        """Test that subscribing starts the detector and it stops without subscribers."""
+        hub = make_hub()
+        hub.applescript.run_script_file.return_value = "same"
+        session = Mock(send_resource_updated=AsyncMock())
+
+        hub.subscribe(TODAY, session)
+        assert hub.running
+        await asyncio.sleep(0.05)
+        hub.unsubscribe(TODAY, session)
+        await asyncio.sleep(0.05)
+
+        assert not hub.running
+        assert hub.applescript.run_script_file.call_count >= 1
+        await hub.stop()
+
+
+class TestServerResources:
+    """Test cases for the resource capabilities of the server."""
+
+    def test_subscribe_capability(self):
+        """Test that the server advertises resource subscriptions."""
+        capabilities = Things3Server().initialization_options().capabilities
+
+        assert capabilities.resources is not None
+        assert capabilities.resources.subscribe is True
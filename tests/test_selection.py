@@ -0,0 +1,113 @@
+"""Tests for the selection watcher."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from pydantic import AnyUrl
+
+from things3_mcp.models import Task
+from things3_mcp.resources import SELECTION_URI, ResourceHub
+from things3_mcp.selection import SelectionWatcher
+
+
+def make_watcher(**kwargs) -> SelectionWatcher:
+    kwargs.setdefault("debounce", 0)
+    return SelectionWatcher(Mock(), **kwargs)
+
+
+@patch.object(SelectionWatcher, "start")
+class TestSelectionWatcher:
+    """Test cases for SelectionWatcher."""
+
+    async def test_change_is_debounced(self, mock_start):
+        """Test that a selection is reported only once two polls agree on it."""
+        watcher = make_watcher()
+        watcher.applescript.get_selected_ids.side_effect = [["A"], ["A"], ["B"], ["B"]]
+        watcher.applescript.get_selected_todos.side_effect = [[Task("A", "a")], [Task("B", "b")]]
+        listener = AsyncMock()
+        watcher.add_listener(listener)
+
+        # The first settled selection is the baseline, not a change
+        assert await watcher.poll() is False
+        assert await watcher.poll() is False
+        assert await watcher.poll() is False
+        assert await watcher.poll() is True
+
+        listener.assert_awaited_once_with([Task("B", "b")])
+        assert watcher.applescript.get_selected_todos.call_count == 2
+
+    async def test_debounce_window(self, mock_start):
+        """Test that a selection still inside the debounce window is not fetched."""
+        watcher = make_watcher(debounce=60)
+        watcher.applescript.get_selected_ids.return_value = ["A"]
+
+        await watcher.poll()
+        await watcher.poll()
+
+        watcher.applescript.get_selected_todos.assert_not_called()
+
+    async def test_backs_off_while_stable(self, mock_start):
+        """Test that the poll interval grows while nothing changes."""
+        watcher = make_watcher(min_interval=0.25, max_interval=1.0)
+        watcher.applescript.get_selected_ids.return_value = ["A"]
+        watcher.applescript.get_selected_todos.return_value = [Task("A", "a")]
+
+        for _ in range(6):
+            await watcher.poll()
+
+        assert watcher._interval == 1.0
+
+    async def test_selected_todos_served_from_cache(self, mock_start):
+        """Test that repeated reads of an unchanged selection run no script."""
+        watcher = make_watcher()
+        watcher.applescript.get_selected_todos.return_value = [Task("A", "a")]
+
+        assert await watcher.selected_todos() == [Task("A", "a")]
+        assert await watcher.selected_todos() == [Task("A", "a")]
+
+        watcher.applescript.get_selected_todos.assert_called_once()
+
+    async def test_stale_cache_is_refetched(self, mock_start):
+        """Test that cached todos older than max_age are fetched again."""
+        watcher = make_watcher(max_age=0)
+        watcher.applescript.get_selected_todos.return_value = []
+
+        await watcher.selected_todos()
+        await watcher.selected_todos()
+
+        assert watcher.applescript.get_selected_todos.call_count == 2
+
+
+class TestSelectionWatcherLifecycle:
+    """Test cases for starting and stopping the watcher."""
+
+    async def test_stops_when_idle(self):
+        """Test that the watcher stops by itself once nothing uses it."""
+        watcher = make_watcher(min_interval=0.01, idle_timeout=0.05)
+        watcher.applescript.get_selected_ids.return_value = []
+
+        watcher.touch()
+        assert watcher.running
+        await asyncio.sleep(0.2)
+
+        assert not watcher.running
+        await watcher.stop()
+
+    @patch.object(SelectionWatcher, "start")
+    @patch.object(ResourceHub, "start")
+    async def test_selection_resource_is_pushed(self, mock_hub_start, mock_watcher_start):
+        """Test that selection changes notify subscribers of things://selection."""
+        watcher = make_watcher()
+        hub = ResourceHub(watcher.applescript, selection=watcher)
+        session = Mock(send_resource_updated=AsyncMock())
+        hub.subscribe(AnyUrl(SELECTION_URI), session)
+        watcher.applescript.get_selected_ids.side_effect = [["A"], ["A"], ["B"], ["B"]]
+        watcher.applescript.get_selected_todos.return_value = []
+
+        for _ in range(4):
+            await watcher.poll()
+
+        session.send_resource_updated.assert_awaited_once_with(AnyUrl(SELECTION_URI))
+        # Pushed resources are not fingerprinted
+        assert await hub.check() == []
+        watcher.applescript.run_script_file.assert_not_called()
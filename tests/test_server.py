@@ -1,11 +1,14 @@
 """Tests for the main server."""
 
+import asyncio
+import socket
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 import mcp.types as types
 
-from things3_mcp.server import Things3Server
+from things3_mcp.config import Settings
+from things3_mcp.server import Things3Server, parse_args
 
 
 class TestThings3Server:
@@ -25,11 +28,20 @@ class TestThings3Server:
         """Test that initialization calls setup handlers."""
         Things3Server()
         mock_setup.assert_called_once()
-    
-    @patch('things3_mcp.server.CreateTools')
-    @patch('things3_mcp.server.ViewTools')
-    @patch('things3_mcp.server.ManageTools')
-    def test_setup_handlers_integration(self, mock_manage, mock_view, mock_create):
+
+    def test_breakers_use_settings(self):
+        """Test that both write paths honor the breaker settings."""
+        server = Things3Server(Settings(breaker_threshold=7, breaker_reset=12.0))
+
+        for breaker in (server.applescript.breaker, server.xcallback.breaker):
+            assert breaker.failure_threshold == 7
+            assert breaker.reset_timeout == 12.0
+
+    @patch('things3_mcp.tools.CreateTools')
+    @patch('things3_mcp.tools.ViewTools')
+    @patch('things3_mcp.tools.ManageTools')
+    @patch('things3_mcp.tools.HealthTools')
+    async def test_setup_handlers_integration(self, mock_health, mock_manage, mock_view, mock_create):
         """Test handler setup integration."""
         # Mock tool definitions
         mock_create.return_value.get_tool_definitions.return_value = [
@@ -41,10 +53,125 @@ class TestThings3Server:
         mock_manage.return_value.get_tool_definitions.return_value = [
             types.Tool(name="assign-project", description="Assign project", inputSchema={"type": "object"})
         ]
+        mock_health.return_value.get_tool_definitions.return_value = [
+            types.Tool(name="health", description="Health", inputSchema={"type": "object"})
+        ]
         
         server = Things3Server()
         
-        # Test that tools are initialized
+        # Tools are built lazily, not at construction time
+        assert not mock_create.called
+        assert not mock_view.called
+        assert not mock_manage.called
+        
+        handler = server.server.request_handlers[types.ListToolsRequest]
+        result = await handler(types.ListToolsRequest(method="tools/list"))
+        
         assert mock_create.called
         assert mock_view.called
-        assert mock_manage.called
\ No newline at end of file
+        assert mock_manage.called
+        tool_names = [tool.name for tool in result.root.tools]
+        assert tool_names == ["create-project", "view-inbox", "assign-project", "health"]
+
+class TestConcurrencyLimit:
+    """Test cases for the shared tool-call limit."""
+    
+    async def test_tool_calls_are_bounded(self):
+        """Test that no more than max_concurrency tools run at once."""
+        server = Things3Server(Settings(max_concurrency=2))
+        running = 0
+        peak = 0
+        
+        async def slow_view(arguments):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [types.TextContent(type="text", text="ok")]
+        
+        server.view_tools.handle_view_inbox = slow_view
+        handler = server.server.request_handlers[types.CallToolRequest]
+        request = types.CallToolRequest(
+            method="tools/call", params=types.CallToolRequestParams(name="view-inbox", arguments={})
+        )
+        
+        await asyncio.gather(*(handler(request) for _ in range(6)))
+        
+        assert peak == 2
+    
+    async def test_health_does_not_wait_for_a_slot(self):
+        """Test that the health tool answers while every slot is taken."""
+        server = Things3Server(Settings(max_concurrency=1))
+        server.health_tools.handle_health = AsyncMock(
+            return_value=[types.TextContent(type="text", text="healthy")]
+        )
+        handler = server.server.request_handlers[types.CallToolRequest]
+        request = types.CallToolRequest(
+            method="tools/call", params=types.CallToolRequestParams(name="health", arguments={})
+        )
+        
+        async with server.tool_slot():
+            assert server.load() == {"running": 1, "waiting": 0, "limit": 1}
+            await asyncio.wait_for(handler(request), 1)
+        
+        assert server.load()["running"] == 0
+
+
+class TestHttpTransport:
+    """Test cases for the Streamable HTTP transport."""
+    
+    def test_parse_args(self):
+        """Test the transport command line options."""
+        args = parse_args(["--transport", "http", "--host", "0.0.0.0", "--port", "9000", "--max-concurrency", "4"])
+        
+        assert args.transport == "http"
+        assert args.host == "0.0.0.0"
+        assert args.port == 9000
+        assert args.max_concurrency == 4
+    
+    def test_parse_args_defaults_to_stdio(self):
+        """Test that stdio stays the default transport."""
+        args = parse_args([])
+        
+        assert args.transport == "stdio"
+        assert args.host is None
+        assert args.port is None
+    
+    async def test_clients_share_one_server(self):
+        """Test that several HTTP clients list tools from the same server."""
+        from mcp import ClientSession
+        from mcp.client.streamable_http import streamablehttp_client
+        
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        
+        server = Things3Server(Settings(http_port=port))
+        serve_task = asyncio.create_task(server._run_http("127.0.0.1", port))
+        
+        async def list_tool_names():
+            async with streamablehttp_client(f"http://127.0.0.1:{port}/mcp/") as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    result = await session.list_tools()
+                    return [tool.name for tool in result.tools]
+        
+        try:
+            for _ in range(100):
+                try:
+                    with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                        break
+                except OSError:
+                    await asyncio.sleep(0.05)
+            
+            first, second = await asyncio.gather(list_tool_names(), list_tool_names())
+        finally:
+            serve_task.cancel()
+            try:
+                await serve_task
+            except (asyncio.CancelledError, SystemExit):
+                pass
+        
+        assert "view-inbox" in first
+        assert first == second
@@ -0,0 +1,67 @@
+"""Startup time benchmarks for the server."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from loguru import logger
+
+from things3_mcp.server import Things3Server, configure_logging
+
+# Budget for a cold import, server construction and the first tools/list: about
+# twice the ~400ms measured locally, so a regression to eager imports or eager
+# backend setup fails. Slow CI machines can raise it through the environment.
+STARTUP_BUDGET_MS = float(os.environ.get("THINGS3_MCP_STARTUP_BUDGET_MS", "800"))
+
+
+class TestStartup:
+    """Test cases for lazy initialization and startup time."""
+    
+    def test_import_has_no_logging_side_effects(self, tmp_path):
+        """Test that importing the server does not create the log file."""
+        code = "import things3_mcp.server"
+        env = dict(os.environ, HOME=str(tmp_path))
+        subprocess.run([sys.executable, "-c", code], check=True, env=env, timeout=60)
+        
+        assert not (tmp_path / "things3-mcp.log").exists()
+    
+    def test_configure_logging_opens_log_file_lazily(self, tmp_path):
+        """Test that the file sink is not opened until the first message."""
+        with patch.object(Path, "home", return_value=tmp_path):
+            configure_logging()
+        
+        try:
+            assert not (tmp_path / "things3-mcp.log").exists()
+        finally:
+            logger.remove()
+    
+    @patch('things3_mcp.tools.CreateTools')
+    @patch('things3_mcp.tools.ViewTools')
+    @patch('things3_mcp.tools.ManageTools')
+    def test_tools_built_on_first_use(self, mock_manage, mock_view, mock_create):
+        """Test that tool groups are constructed once, on first access."""
+        server = Things3Server()
+        assert not mock_view.called
+        
+        assert server.view_tools is server.view_tools
+        mock_view.assert_called_once()
+        assert not mock_create.called
+        assert not mock_manage.called
+    
+    def test_startup_within_budget(self):
+        """Benchmark: cold import and init must stay within the startup budget."""
+        result = subprocess.run(
+            [sys.executable, "-m", "things3_mcp.server", "--profile-startup"],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=120
+        )
+        timings = json.loads(result.stdout)
+        
+        assert set(timings) == {"import_ms", "init_ms", "first_list_tools_ms"}
+        total = timings["import_ms"] + timings["init_ms"] + timings["first_list_tools_ms"]
+        assert total < STARTUP_BUDGET_MS, f"Startup took {total:.0f}ms: {timings}"
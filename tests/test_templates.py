@@ -0,0 +1,104 @@
+"""Tests for project structures and templates."""
+
+import pytest
+
+from things3_mcp.templates import MAX_ITEMS, TemplateStore, merge, to_things_json, validate_structure
+
+
+class TestValidateStructure:
+    """Test cases for validate_structure."""
+
+    def test_normalizes_titles(self):
+        """Test that todos given as titles become objects."""
+        structure = validate_structure({
+            "todos": ["Buy", {"title": "Pack", "checklist": ["Tent"]}],
+            "headings": [{"title": "Day 1"}],
+            "area": "Home",
+        })
+
+        assert structure == {
+            "todos": [{"title": "Buy"}, {"title": "Pack", "checklist": ["Tent"]}],
+            "headings": [{"title": "Day 1", "todos": []}],
+            "area": "Home",
+        }
+
+    @pytest.mark.parametrize("value, error", [
+        ({"todos": [{"notes": "x"}]}, "project.todos[0].title must be a non-empty string"),
+        ({"headings": [{"title": "A", "todos": [{"title": "B", "tags": "x"}]}]},
+         "project.headings[0].todos[0].tags must be a list of strings"),
+        ({"todos": [{"title": "A", "repeat": "daily"}]}, "project.todos[0] has unknown fields: repeat"),
+        ({"items": []}, "project has unknown fields: items"),
+    ])
+    def test_rejects_malformed(self, value, error):
+        """Test that errors name the offending field."""
+        with pytest.raises(ValueError, match=error.replace("[", r"\[").replace("]", r"\]")):
+            validate_structure(value)
+
+    def test_rejects_too_many_items(self):
+        """Test that a project larger than one Things JSON command is rejected."""
+        with pytest.raises(ValueError, match="at most"):
+            validate_structure({"todos": [f"Todo {i}" for i in range(MAX_ITEMS)]})
+
+
+class TestThingsJson:
+    """Test cases for to_things_json and merge."""
+
+    def test_headings_follow_loose_todos(self):
+        """Test that todos come before the headings they do not belong to."""
+        structure = validate_structure({
+            "headings": [{"title": "Later", "todos": [{"title": "B", "when": "tomorrow"}]}],
+            "todos": [{"title": "A", "checklist": ["one"]}],
+            "tags": ["work"],
+        })
+
+        data = to_things_json("Plan", structure)
+
+        assert data == [{
+            "type": "project",
+            "attributes": {
+                "title": "Plan",
+                "tags": ["work"],
+                "items": [
+                    {"type": "to-do", "attributes": {
+                        "title": "A",
+                        "checklist-items": [{"type": "checklist-item", "attributes": {"title": "one"}}],
+                    }},
+                    {"type": "heading", "attributes": {"title": "Later"}},
+                    {"type": "to-do", "attributes": {"title": "B", "when": "tomorrow"}},
+                ],
+            },
+        }]
+
+    def test_merge_overrides_attributes_and_appends_items(self):
+        """Test that arguments replace template attributes and add items."""
+        template = validate_structure({"area": "Work", "notes": "Template", "todos": ["A"]})
+        overrides = validate_structure({"notes": "Mine", "todos": ["B"]})
+
+        combined = merge(template, overrides)
+
+        assert combined["area"] == "Work"
+        assert combined["notes"] == "Mine"
+        assert [todo["title"] for todo in combined["todos"]] == ["A", "B"]
+
+
+class TestTemplateStore:
+    """Test cases for TemplateStore."""
+
+    def test_loads_valid_templates_and_skips_invalid(self, tmp_path):
+        """Test that invalid templates are skipped at load time."""
+        (tmp_path / "trip.json").write_text('{"todos": ["Pack"]}')
+        (tmp_path / "broken.json").write_text('{"todos": [{}]}')
+        (tmp_path / "garbage.json").write_text("not json")
+
+        store = TemplateStore(tmp_path)
+
+        assert store.names() == ["trip"]
+        assert store.get("trip")["todos"] == [{"title": "Pack"}]
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing directory gives an empty store."""
+        store = TemplateStore(tmp_path / "missing")
+
+        assert store.names() == []
+        with pytest.raises(ValueError, match="Unknown project template 'trip'"):
+            store.get("trip")
@@ -1,10 +1,17 @@
 """Tests for Things3 tools."""
 
+import asyncio
+from datetime import date, datetime
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 import mcp.types as types
 
+from things3_mcp.handlers import CircuitBreaker, CircuitOpenError, UnavailableError, XCallbackHandler
+from things3_mcp.journal import MutationJournal, WriteBehindQueue
+from things3_mcp.models import Task
+from things3_mcp.query import LogbookCursor
+from things3_mcp.templates import TemplateStore
 from things3_mcp.tools import CreateTools, ManageTools, ViewTools
 
 
@@ -93,6 +100,105 @@ class TestCreateTools:
             heading=None
         )
 
+    
+    async def test_create_reports_open_circuit(self):
+        """Test that an open URL breaker is reported as an outage, not a failed create."""
+        breaker = CircuitBreaker("Things3 URL scheme", reset_timeout=30, clock=lambda: 0.0)
+        breaker.record_failure(timed_out=True)
+        tools = CreateTools(XCallbackHandler(breaker=breaker))
+
+        result = await tools.handle_create_todo({"title": "Milk"})
+
+        assert result[0].text == "Things3 unavailable (circuit open, retry in 30.0s)"
+
+    async def test_handle_create_todo_returns_id(self):
+        """Test that the new todo's ID is returned and added to the name index."""
+        database = Mock(available=True)
+        database.item_ids.return_value = {"TODO-OLD"}
+        database.find_created.side_effect = [None, "TODO-NEW"]
+        applescript = Mock()
+        tools = CreateTools(Mock(), database=database, applescript=applescript)
+        tools.xcallback.create_todo.return_value = True
+        
+        result = await tools.handle_create_todo({"title": "Milk"})
+        
+        assert result[0].text == "Successfully created todo 'Milk' in Things3 [id: TODO-NEW]"
+        assert database.find_created.call_args.args[:2] == ("Milk", False)
+        assert database.find_created.call_args.args[3] == {"TODO-OLD"}
+        applescript.name_index.update.assert_called_once_with([Task("TODO-NEW", "Milk")])
+    
+    async def test_same_title_creates_get_distinct_ids(self):
+        """Test that concurrent creates with one title never share or steal an ID."""
+        created = []
+        database = Mock(available=True)
+        database.item_ids.return_value = {"TODO-OLD"}
+        
+        def find_created(title, project, since, exclude):
+            # Both new todos are in the database before either lookup runs
+            return next((item_id for item_id in created if item_id not in exclude), None)
+        
+        def create_todo(**kwargs):
+            created.append(f"TODO-{len(created) + 1}")
+            return True
+        
+        database.find_created.side_effect = find_created
+        tools = CreateTools(Mock(), database=database)
+        tools.xcallback.create_todo.side_effect = create_todo
+        
+        first, second = await asyncio.gather(
+            tools.handle_create_todo({"title": "Milk"}),
+            tools.handle_create_todo({"title": "Milk"}),
+        )
+        
+        ids = {first[0].text.split("[id: ")[1], second[0].text.split("[id: ")[1]}
+        assert ids == {"TODO-1]", "TODO-2]"}
+        assert tools._claimed_ids == set()
+    
+    @patch("things3_mcp.tools.create.CREATED_LOOKUP_ATTEMPTS", 2)
+    async def test_handle_create_project_id_not_found(self):
+        """Test that creation still succeeds when the ID does not show up."""
+        database = Mock(available=True)
+        database.item_ids.return_value = set()
+        database.find_created.return_value = None
+        tools = CreateTools(Mock(), database=database)
+        tools.xcallback.create_project.return_value = True
+        
+        result = await tools.handle_create_project({"title": "Launch"})
+        
+        assert result[0].text == "Successfully created project 'Launch' in Things3"
+        assert database.find_created.call_count == 2
+    
+    async def test_handle_create_project_from_template(self, tmp_path):
+        """Test that a templated project is created with a single JSON command."""
+        (tmp_path / "launch.json").write_text(
+            '{"area": "Work", "headings": [{"title": "Prepare", "todos": ["Draft", "Review"]}]}'
+        )
+        tools = CreateTools(Mock(), templates=TemplateStore(tmp_path))
+        tools.xcallback.run_json.return_value = True
+        
+        result = await tools.handle_create_project({
+            "title": "Launch",
+            "todos": [{"title": "Kickoff", "checklist": ["Invite team"]}],
+            "template": "launch",
+        })
+        
+        assert result[0].text == "Successfully created project 'Launch' with 1 headings and 3 todos in Things3"
+        tools.xcallback.create_project.assert_not_called()
+        data = tools.xcallback.run_json.call_args.args[0]
+        assert data[0]["attributes"]["area"] == "Work"
+        assert [item["attributes"]["title"] for item in data[0]["attributes"]["items"]] == [
+            "Kickoff", "Prepare", "Draft", "Review"
+        ]
+    
+    async def test_handle_create_project_unknown_template(self):
+        """Test that an unknown template is reported without creating anything."""
+        tools = CreateTools(Mock(), templates=TemplateStore(None))
+        
+        result = await tools.handle_create_project({"title": "Launch", "template": "missing"})
+        
+        assert result[0].text == "Invalid project 'Launch': Unknown project template 'missing' (available: none)"
+        tools.xcallback.run_json.assert_not_called()
+
 
 class TestViewTools:
     """Test cases for ViewTools."""
@@ -102,15 +208,19 @@ class TestViewTools:
         tools = ViewTools()
         definitions = tools.get_tool_definitions()
         
-        assert len(definitions) == 7
+        assert len(definitions) == 11
         
         tool_names = [tool.name for tool in definitions]
         assert "view-inbox" in tool_names
+        assert "query-todos" in tool_names
         assert "view-today" in tool_names
         assert "view-anytime" in tool_names
         assert "view-someday" in tool_names
         assert "view-projects" in tool_names
         assert "view-areas" in tool_names
+        assert "view-logbook" in tool_names
+        assert "view-hierarchy" in tool_names
+        assert "view-project" in tool_names
         assert "get-selected-todos" in tool_names
     
     @patch.object(ViewTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
@@ -118,8 +228,8 @@ class TestViewTools:
         """Test inbox viewing with tasks."""
         tools = ViewTools()
         tools.applescript.get_list_tasks.return_value = [
-            {"title": "Task 1", "due_date": "2024-01-01", "when": "2024-01-01", "notes": "Notes 1"},
-            {"title": "Task 2", "due_date": "", "when": "", "notes": ""}
+            Task("TASK-1", "Task 1", notes="Notes 1", due_date=date(2024, 1, 1), when=date(2024, 1, 1)),
+            Task("", "Task 2")
         ]
         
         result = await tools.handle_view_inbox({})
@@ -128,8 +238,150 @@ class TestViewTools:
         assert isinstance(result[0], types.TextContent)
         assert "📥 Todos in Things3 inbox:" in result[0].text
         assert "Task 1" in result[0].text
+        assert "(Due: 2024-01-01)" in result[0].text
+        assert "[id: TASK-1]" in result[0].text
         assert "Task 2" in result[0].text
     
+    @patch.object(ViewTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
+    async def test_handle_query_todos(self):
+        """Test a filtered query."""
+        tools = ViewTools()
+        tools.applescript.query_todos.return_value = [
+            Task("TASK-1", "Call Bob", tags=("waiting",), project="Launch")
+        ]
+        
+        result = await tools.handle_query_todos({"tag": "waiting", "due_to": "+7d"})
+        
+        query = tools.applescript.query_todos.call_args[0][0]
+        assert query.tag == "waiting"
+        assert query.due_to is not None
+        assert "1 matching todos" in result[0].text
+        assert "Call Bob" in result[0].text
+        assert "{Launch; tags: waiting}" in result[0].text
+    
+    async def test_view_reports_open_circuit(self):
+        """Test that an outage is reported instead of an empty list."""
+        tools = ViewTools(applescript=Mock())
+        tools.applescript.get_list_tasks.side_effect = CircuitOpenError("Things3 is unavailable", retry_in=17.46)
+        tools.applescript.query_todos.side_effect = UnavailableError("AppleScript execution timed out")
+
+        result = await tools.handle_view_today({})
+
+        assert result[0].text == "Things3 unavailable (circuit open, retry in 17.5s)"
+
+        result = await tools.handle_query_todos({"tag": "waiting"})
+
+        assert result[0].text == "Things3 unavailable (AppleScript execution timed out)"
+
+    @patch.object(ViewTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
+    async def test_handle_query_todos_invalid(self):
+        """Test that invalid filters are reported without running a script."""
+        tools = ViewTools()
+        
+        result = await tools.handle_query_todos({"due_from": "soon"})
+        
+        assert "Invalid query" in result[0].text
+        tools.applescript.query_todos.assert_not_called()
+    
+    async def test_handle_view_hierarchy_falls_back_to_applescript(self):
+        """Test that the hierarchy is read through AppleScript without a database."""
+        tools = ViewTools(applescript=Mock(), database=Mock())
+        tools.database.get_hierarchy.return_value = None
+        tools.applescript.get_hierarchy.return_value = [{
+            "id": "AREA-1",
+            "title": "Work",
+            "projects": [{
+                "id": "PROJ-1",
+                "title": "Launch",
+                "open_count": 1,
+                "headings": [],
+                "todos": [Task("TODO-1", "Book venue")],
+            }],
+        }]
+        
+        result = await tools.handle_view_hierarchy({"include_todos": True})
+        
+        tools.applescript.get_hierarchy.assert_called_once_with(True)
+        assert "▸ Work [id: AREA-1]" in result[0].text
+        assert "• Launch (1 open) [id: PROJ-1]" in result[0].text
+        assert "- Book venue [id: TODO-1]" in result[0].text
+    
+    async def test_handle_view_project(self):
+        """Test a project page grouped by heading with projected fields."""
+        tools = ViewTools(applescript=Mock(), database=Mock())
+        tools.database.get_project.return_value = {
+            "id": "PROJ-1",
+            "title": "Launch",
+            "notes": "",
+            "total": 3,
+            "headings": {"HEAD-1": "Design"},
+            "todos": [
+                Task("TODO-1", "Book venue", notes="Call first"),
+                Task("TODO-2", "Draft spec", due_date=date(2026, 10, 19)),
+            ],
+            "todo_headings": {"TODO-2": "HEAD-1"},
+            "checklists": {"TODO-2": [("Outline", True)]},
+        }
+        
+        result = await tools.handle_view_project({"project": "Launch", "fields": ["due_date", "checklist"], "limit": 2})
+        
+        tools.database.get_project.assert_called_once_with("Launch", 0, 2, True)
+        text = result[0].text
+        assert "Todos 1-2 of 3:" in text
+        assert "◦ Design\n  • Draft spec (Due: 2026-10-19) [id: TODO-2]" in text
+        assert "☑ Outline" in text
+        assert "Call first" not in text
+        assert "call again with offset 2" in text
+    
+    async def test_handle_view_project_falls_back_to_query(self):
+        """Test that without a database the project is read with a project query."""
+        tools = ViewTools(applescript=Mock(), database=Mock())
+        tools.database.get_project.return_value = None
+        tools.applescript.query_todos.return_value = [Task("TODO-1", "a"), Task("TODO-2", "b")]
+        
+        result = await tools.handle_view_project({"project": "Launch", "offset": 1, "limit": 1})
+        
+        query = tools.applescript.query_todos.call_args[0][0]
+        assert (query.project, query.limit) == ("Launch", 2)
+        assert "• b [id: TODO-2]" in result[0].text
+        assert "• a" not in result[0].text
+    
+    async def test_handle_view_project_invalid_field(self):
+        """Test that unknown fields are rejected."""
+        tools = ViewTools(applescript=Mock(), database=Mock())
+        
+        result = await tools.handle_view_project({"project": "Launch", "fields": ["color"]})
+        
+        assert "Unknown fields: color" in result[0].text
+        tools.database.get_project.assert_not_called()
+    
+    @patch.object(ViewTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
+    async def test_handle_view_logbook_returns_cursor(self):
+        """Test that a Logbook page ends with a cursor that resumes after it."""
+        tools = ViewTools()
+        done = datetime(2026, 10, 19, 9, 30)
+        tools.applescript.get_logbook.return_value = [Task("TASK-1", "Ship it", completed_at=done)]
+        
+        result = await tools.handle_view_logbook({"since": "2026-10-19", "limit": 1})
+        
+        since, limit = tools.applescript.get_logbook.call_args[0]
+        assert since.completed_at == datetime(2026, 10, 19)
+        assert limit == 1
+        assert "(Completed: 2026-10-19 09:30:00)" in result[0].text
+        assert "call again with the cursor" in result[0].text
+        token = result[0].text.rsplit("Next cursor: ", 1)[1]
+        assert LogbookCursor.decode(token) == LogbookCursor(done, ["TASK-1"])
+    
+    @patch.object(ViewTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
+    async def test_handle_view_logbook_invalid_cursor(self):
+        """Test that a malformed cursor is reported without running a script."""
+        tools = ViewTools()
+        
+        result = await tools.handle_view_logbook({"cursor": "bogus"})
+        
+        assert "Invalid logbook request" in result[0].text
+        tools.applescript.get_logbook.assert_not_called()
+    
     @patch.object(ViewTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
     async def test_handle_view_inbox_empty(self):
         """Test inbox viewing with no tasks."""
@@ -159,12 +411,22 @@ class TestViewTools:
         assert "Project 1" in result[0].text
         assert "Project 2" in result[0].text
     
+    async def test_handle_get_selected_todos_uses_watcher(self):
+        """Test that selected todos come from the selection watcher when there is one."""
+        selection = Mock(selected_todos=AsyncMock(return_value=[Task("TASK-1", "Cached")]))
+        tools = ViewTools(applescript=Mock(), selection=selection)
+        
+        result = await tools.handle_get_selected_todos({})
+        
+        assert "# Cached" in result[0].text
+        tools.applescript.get_selected_todos.assert_not_called()
+    
     @patch.object(ViewTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
     async def test_handle_get_selected_todos(self):
         """Test selected todos retrieval."""
         tools = ViewTools()
         tools.applescript.get_selected_todos.return_value = [
-            {"title": "Selected Task", "notes": "Task content"}
+            Task("TASK-1", "Selected Task", notes="Task content")
         ]
         
         result = await tools.handle_get_selected_todos({})
@@ -184,19 +446,24 @@ class TestManageTools:
         tools = ManageTools()
         definitions = tools.get_tool_definitions()
         
-        assert len(definitions) == 5
+        assert len(definitions) == 9
         
         tool_names = [tool.name for tool in definitions]
         assert "assign-project" in tool_names
         assert "assign-area" in tool_names
         assert "set-tags" in tool_names
         assert "complete-selected" in tool_names
+        assert "mutation-status" in tool_names
         assert "rename-task" in tool_names
+        assert "update-todos" in tool_names
+        assert "complete-todos" in tool_names
+        assert "reschedule-todos" in tool_names
     
     @patch.object(ManageTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
     async def test_handle_assign_project_success(self):
         """Test successful project assignment."""
         tools = ManageTools()
+        tools.applescript.resolve_task_ids.return_value = ["TASK-1"]
         tools.applescript.assign_project.return_value = True
         
         arguments = {"task": "Test Task", "project": "Test Project"}
@@ -206,12 +473,63 @@ class TestManageTools:
         assert isinstance(result[0], types.TextContent)
         assert "Successfully assigned project 'Test Project' to task 'Test Task'" in result[0].text
         
-        tools.applescript.assign_project.assert_called_once_with("Test Task", "Test Project")
+        tools.applescript.resolve_task_ids.assert_called_once_with("Test Task")
+        tools.applescript.assign_project.assert_called_once_with("TASK-1", "Test Project")
+    
+    @patch.object(ManageTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
+    async def test_handle_assign_project_by_id(self):
+        """Test project assignment addressed by ID skips name resolution."""
+        tools = ManageTools()
+        tools.applescript.assign_project.return_value = True
+        
+        arguments = {"id": "TASK-1", "project": "Test Project"}
+        result = await tools.handle_assign_project(arguments)
+        
+        assert "Successfully assigned project 'Test Project' to task 'TASK-1'" in result[0].text
+        tools.applescript.resolve_task_ids.assert_not_called()
+        tools.applescript.assign_project.assert_called_once_with("TASK-1", "Test Project")
+    
+    @patch.object(ManageTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
+    async def test_handle_assign_project_ambiguous_name(self):
+        """Test that an ambiguous name is rejected instead of changing every match."""
+        tools = ManageTools()
+        tools.applescript.resolve_task_ids.return_value = ["TASK-1", "TASK-2"]
+        
+        arguments = {"task": "Duplicate", "project": "Test Project"}
+        result = await tools.handle_assign_project(arguments)
+        
+        assert "matches 2 tasks (TASK-1, TASK-2)" in result[0].text
+        tools.applescript.assign_project.assert_not_called()
+    
+    async def test_handle_set_tags_write_behind(self, tmp_path):
+        """Test that write-behind mode journals the mutation instead of applying it."""
+        applescript = Mock()
+        applescript.resolve_task_ids.return_value = ["TASK-1"]
+        queue = WriteBehindQueue(MutationJournal(tmp_path / "journal.sqlite3"), Mock())
+        tools = ManageTools(applescript, write_queue=queue)
+        
+        result = await tools.handle_set_tags({"task": "Test Task", "tags": ["a", "b"]})
+        
+        assert result[0].text == "Queued operation 1: set tags [a, b] on task TASK-1"
+        applescript.set_tags.assert_not_called()
+        
+        status = await tools.handle_mutation_status({})
+        assert "1 pending, 0 failed, 0 applied" in status[0].text
+        assert "#1 [pending] set tags [a, b] on task TASK-1" in status[0].text
+    
+    async def test_handle_mutation_status_disabled(self):
+        """Test mutation status when write-behind mode is off."""
+        tools = ManageTools(Mock())
+        
+        result = await tools.handle_mutation_status({})
+        
+        assert "Write-behind mode is disabled" in result[0].text
     
     @patch.object(ManageTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
     async def test_handle_assign_area_success(self):
         """Test successful area assignment."""
         tools = ManageTools()
+        tools.applescript.resolve_task_ids.return_value = ["TASK-1"]
         tools.applescript.assign_area.return_value = True
         
         arguments = {"task": "Test Task", "area": "Test Area"}
@@ -221,12 +539,13 @@ class TestManageTools:
         assert isinstance(result[0], types.TextContent)
         assert "Successfully assigned area 'Test Area' to task 'Test Task'" in result[0].text
         
-        tools.applescript.assign_area.assert_called_once_with("Test Task", "Test Area")
+        tools.applescript.assign_area.assert_called_once_with("TASK-1", "Test Area")
     
     @patch.object(ManageTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
     async def test_handle_set_tags_success(self):
         """Test successful tag setting."""
         tools = ManageTools()
+        tools.applescript.resolve_task_ids.return_value = ["TASK-1"]
         tools.applescript.set_tags.return_value = True
         
         arguments = {"task": "Test Task", "tags": ["tag1", "tag2"]}
@@ -236,7 +555,7 @@ class TestManageTools:
         assert isinstance(result[0], types.TextContent)
         assert "Successfully set tags [tag1, tag2] for task 'Test Task'" in result[0].text
         
-        tools.applescript.set_tags.assert_called_once_with("Test Task", ["tag1", "tag2"])
+        tools.applescript.set_tags.assert_called_once_with("TASK-1", ["tag1", "tag2"])
     
     @patch.object(ManageTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
     async def test_handle_complete_selected_success(self):
@@ -289,6 +608,7 @@ class TestManageTools:
     async def test_handle_rename_task_success(self):
         """Test successful task renaming."""
         tools = ManageTools()
+        tools.applescript.resolve_task_ids.return_value = ["TASK-1"]
         tools.applescript.rename_task.return_value = True
         
         arguments = {"old_name": "Old Task Name", "new_name": "New Task Name"}
@@ -298,27 +618,28 @@ class TestManageTools:
         assert isinstance(result[0], types.TextContent)
         assert "Successfully renamed task from 'Old Task Name' to 'New Task Name'" in result[0].text
         
-        tools.applescript.rename_task.assert_called_once_with("Old Task Name", "New Task Name")
+        tools.applescript.rename_task.assert_called_once_with("TASK-1", "New Task Name")
     
     @patch.object(ManageTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
     async def test_handle_rename_task_not_found(self):
         """Test renaming when task is not found."""
         tools = ManageTools()
-        tools.applescript.rename_task.return_value = False
+        tools.applescript.resolve_task_ids.return_value = []
         
         arguments = {"old_name": "Nonexistent Task", "new_name": "New Name"}
         result = await tools.handle_rename_task(arguments)
         
         assert len(result) == 1
         assert isinstance(result[0], types.TextContent)
-        assert "Failed to rename task: Task 'Nonexistent Task' not found" in result[0].text
+        assert "Task 'Nonexistent Task' not found" in result[0].text
         
-        tools.applescript.rename_task.assert_called_once_with("Nonexistent Task", "New Name")
+        tools.applescript.rename_task.assert_not_called()
     
     @patch.object(ManageTools, '__init__', lambda x: setattr(x, 'applescript', Mock()))
     async def test_handle_rename_task_error(self):
         """Test error handling in task renaming."""
         tools = ManageTools()
+        tools.applescript.resolve_task_ids.return_value = ["TASK-1"]
         tools.applescript.rename_task.side_effect = Exception("AppleScript error")
         
         arguments = {"old_name": "Task Name", "new_name": "New Name"}
@@ -326,4 +647,122 @@ class TestManageTools:
         
         assert len(result) == 1
         assert isinstance(result[0], types.TextContent)
-        assert "Error renaming task: AppleScript error" in result[0].text
\ No newline at end of file
+        assert "Error renaming task: AppleScript error" in result[0].text
+    
+    async def test_handle_update_todos_small_batch_uses_applescript(self):
+        """Test that a few supported edits are applied in one AppleScript run."""
+        applescript = Mock()
+        applescript.apply_changes.return_value = [True, True, False]
+        tools = ManageTools(applescript, xcallback=Mock(), auth_token="token")
+        
+        result = await tools.handle_update_todos({"updates": [
+            {"id": "T1", "title": "Renamed", "completed": True},
+            {"id": "T2", "tags": ["home"]},
+        ]})
+        
+        assert result[0].text == "Updated 1 of 2 todos via AppleScript\nFailed: T2 (tags)"
+        applescript.apply_changes.assert_called_once_with([
+            ("T1", "name", "Renamed"), ("T1", "completed", "true"), ("T2", "tags", "home"),
+        ])
+        tools.xcallback.run_json.assert_not_called()
+        applescript.name_index.rename.assert_called_once_with("T1", "Renamed")
+        applescript.name_index.discard.assert_called_once_with("T1")
+        applescript.date_index.invalidate.assert_called_once()
+    
+    async def test_handle_update_todos_scheduling_uses_url(self):
+        """Test that scheduling edits are sent as one Things JSON update."""
+        tools = ManageTools(Mock(), xcallback=Mock(), auth_token="token")
+        tools.xcallback.run_json.return_value = True
+        
+        result = await tools.handle_update_todos({"updates": [{"id": "T1", "when": "tomorrow"}]})
+        
+        assert result[0].text == "Updated 1 of 1 todos via the Things URL scheme (1 URL)"
+        data, _, token = tools.xcallback.run_json.call_args.args
+        assert data == [{"type": "to-do", "operation": "update", "id": "T1", "attributes": {"when": "tomorrow"}}]
+        assert token == "token"
+        tools.applescript.apply_changes.assert_not_called()
+    
+    async def test_handle_update_todos_large_batch_is_chunked(self):
+        """Test that a large batch goes through the URL scheme in chunks."""
+        tools = ManageTools(Mock(), xcallback=Mock(), auth_token="token", url_batch_size=10)
+        tools.xcallback.run_json.side_effect = [True, False]
+        
+        result = await tools.handle_update_todos({
+            "updates": [{"id": f"T{i}", "notes": "x"} for i in range(300)]
+        })
+        
+        assert result[0].text.startswith("Updated 250 of 300 todos via the Things URL scheme (2 URLs)")
+        assert [len(call.args[0]) for call in tools.xcallback.run_json.call_args_list] == [250, 50]
+    
+    async def test_handle_update_todos_reports_open_circuit(self):
+        """Test that an open URL breaker is reported as an outage, not as failed updates."""
+        tools = ManageTools(Mock(), xcallback=Mock(), auth_token="token")
+        tools.xcallback.run_json.side_effect = CircuitOpenError("Things3 URL scheme is unavailable", retry_in=8)
+
+        result = await tools.handle_update_todos({"updates": [{"id": "T1", "when": "tomorrow"}]})
+
+        assert result[0].text == "Things3 unavailable (circuit open, retry in 8s)"
+
+    async def test_handle_update_todos_needs_token_for_scheduling(self):
+        """Test that URL-only edits are refused without an auth token."""
+        tools = ManageTools(Mock(), xcallback=Mock())
+        
+        result = await tools.handle_update_todos({"updates": [{"id": "T1", "deadline": "2025-01-31"}]})
+        
+        assert "needs an auth token" in result[0].text
+        tools.xcallback.run_json.assert_not_called()
+        tools.applescript.apply_changes.assert_not_called()
+    
+    async def test_handle_complete_todos_by_filter(self):
+        """Test that completion by filter reports the count and affected IDs."""
+        applescript = Mock()
+        applescript.bulk_change.return_value = {
+            "success": True, "ids": ["T1", "T2"], "skipped": [], "matched": 2, "aborted": False
+        }
+        tools = ManageTools(applescript)
+        
+        result = await tools.handle_complete_todos({"list": "Today", "overdue": True, "tag": "errand"})
+        
+        assert result[0].text == "2 todos completed\nIDs: T1, T2"
+        change = applescript.bulk_change.call_args.args[0]
+        kwargs = applescript.bulk_change.call_args.kwargs
+        assert change.complete
+        assert kwargs["query"].list == "Today" and kwargs["query"].tag == "errand"
+        assert kwargs["query"].due_to is not None
+        assert kwargs["ids"] is None
+    
+    async def test_handle_reschedule_todos_by_ids(self):
+        """Test rescheduling by ID reports skipped IDs."""
+        applescript = Mock()
+        applescript.bulk_change.return_value = {
+            "success": True, "ids": ["T1"], "skipped": ["T9"], "matched": 1, "aborted": False
+        }
+        tools = ManageTools(applescript)
+        
+        result = await tools.handle_reschedule_todos({"ids": ["T1", "T9"], "when": "someday"})
+        
+        assert result[0].text == "1 todos moved to Someday\nIDs: T1\nSkipped (not found or not open): T9"
+        assert applescript.bulk_change.call_args.args[0].when_list == "Someday"
+        assert applescript.bulk_change.call_args.kwargs["ids"] == ["T1", "T9"]
+    
+    async def test_handle_complete_todos_aborted(self):
+        """Test that a selection larger than max_count changes nothing."""
+        applescript = Mock()
+        applescript.bulk_change.return_value = {
+            "success": True, "ids": [], "skipped": [], "matched": 320, "aborted": True
+        }
+        tools = ManageTools(applescript)
+        
+        result = await tools.handle_complete_todos({"tag": "errand", "max_count": 300})
+        
+        assert result[0].text.startswith("320 todos match, more than max_count allows; nothing was changed.")
+        assert applescript.bulk_change.call_args.kwargs["max_count"] == 300
+    
+    async def test_handle_complete_todos_needs_selection(self):
+        """Test that completing every open todo by accident is refused."""
+        tools = ManageTools(Mock())
+        
+        result = await tools.handle_complete_todos({"dry_run": True})
+        
+        assert result[0].text == "Error completing todos: Pass 'ids' or at least one filter"
+        tools.applescript.bulk_change.assert_not_called()
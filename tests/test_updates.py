@@ -0,0 +1,87 @@
+"""Tests for bulk todo updates."""
+
+import pytest
+
+from things3_mcp.updates import TodoUpdate, choose_path, to_changes, to_things_json
+
+
+class TestTodoUpdate:
+    """Test cases for TodoUpdate."""
+
+    def test_from_arguments(self):
+        """Test that fields are kept in a fixed order."""
+        update = TodoUpdate.from_arguments({"completed": False, "id": "T1", "title": "A"})
+
+        assert update.task_id == "T1"
+        assert list(update.changes) == ["title", "completed"]
+        assert update.applescript_supported
+
+    @pytest.mark.parametrize("value, error", [
+        ({"title": "A"}, "needs an 'id'"),
+        ({"id": "T1"}, "changes nothing"),
+        ({"id": "T1", "status": "done"}, "unknown fields: status"),
+        ({"id": "T1", "tags": "home"}, "tags must be a list of strings"),
+        ({"id": "T1", "completed": "yes"}, "completed must be true or false"),
+        ({"id": "T1", "when": 3}, "when must be a string"),
+    ])
+    def test_rejects_malformed(self, value, error):
+        """Test that malformed updates are rejected."""
+        with pytest.raises(ValueError, match=error):
+            TodoUpdate.from_arguments(value)
+
+
+class TestChoosePath:
+    """Test cases for choose_path."""
+
+    def test_small_batch_uses_applescript(self):
+        """Test that a few supported edits go through AppleScript."""
+        updates = [TodoUpdate("T1", {"title": "A"})]
+
+        assert choose_path(updates, "token", 10) == "applescript"
+
+    def test_large_batch_uses_url(self):
+        """Test that a large batch goes through the URL scheme."""
+        updates = [TodoUpdate(f"T{i}", {"notes": "x"}) for i in range(10)]
+
+        assert choose_path(updates, "token", 10) == "url"
+        assert choose_path(updates, None, 10) == "applescript"
+
+    def test_scheduling_uses_url(self):
+        """Test that edits AppleScript cannot apply need the URL scheme."""
+        updates = [TodoUpdate("T1", {"when": "today"})]
+
+        assert choose_path(updates, "token", 10) == "url"
+        with pytest.raises(ValueError, match="auth token"):
+            choose_path(updates, None, 10)
+        with pytest.raises(ValueError, match="AppleScript cannot set"):
+            choose_path(updates, "token", 10, via="applescript")
+
+    def test_forced_url_needs_token(self):
+        """Test that forcing the URL scheme without a token is refused."""
+        with pytest.raises(ValueError, match="auth token"):
+            choose_path([TodoUpdate("T1", {"title": "A"})], None, 10, via="url")
+
+
+class TestConversions:
+    """Test cases for to_changes and to_things_json."""
+
+    def test_to_changes(self):
+        """Test that updates become apply_changes triples with owners."""
+        changes, owners = to_changes([
+            TodoUpdate("T1", {"tags": ["a", "b"], "completed": True}),
+            TodoUpdate("T2", {"notes": "n"}),
+        ])
+
+        assert changes == [("T1", "tags", "a,b"), ("T1", "completed", "true"), ("T2", "notes", "n")]
+        assert owners == [0, 0, 1]
+
+    def test_to_things_json(self):
+        """Test that updates become Things JSON update operations."""
+        data = to_things_json([TodoUpdate("T1", {"list": "Errands", "tags": ["home"]})])
+
+        assert data == [{
+            "type": "to-do",
+            "operation": "update",
+            "id": "T1",
+            "attributes": {"list": "Errands", "tags": ["home"]},
+        }]